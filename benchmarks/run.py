@@ -0,0 +1,185 @@
+"""Time every stage of the save pipeline at several batch sizes and compare against stored baselines.
+
+    python3 benchmarks/run.py                      # compare with baselines.json
+    python3 benchmarks/run.py --save-baseline      # record this machine's numbers
+    python3 benchmarks/run.py --sizes 1 100 --stages validate derived
+
+Times are the best of ``--repeats`` runs, reported per save so sizes compare.
+A stage regresses when it is more than ``--threshold`` times its baseline
+(and slower by more than ``MIN_DELTA``). Baselines are per machine, re-record
+them with ``--save-baseline`` before comparing on another one.
+"""
+import argparse
+import base64
+import gc
+import io
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from rich.console import Console  # noqa: E402
+from rich.table import Table  # noqa: E402
+from rich import box  # noqa: E402
+
+import shop_data  # noqa: E402
+from save_decoder import decode_save  # noqa: E402
+from save_frame import SaveFrame  # noqa: E402
+from save_layout import ShopBuys, SynergismGame, derived  # noqa: E402
+from synergisa import DATA_PATH, build_game, dashboard, load_config, load_shop_data  # noqa: E402
+
+from synthetic import make_saves  # noqa: E402
+
+BASELINES = Path(__file__).parent / "baselines.json"
+SIZES = (1, 100, 10000)
+DERIVED = [name for name, value in vars(SynergismGame).items() if isinstance(value, derived)]
+
+# Rendering is the slow stage; it is timed on at most this many saves and reported per save.
+RENDER_LIMIT = 100
+
+MIN_TIME = 0.2
+MAX_REPEATS = 1000
+
+# Slowdowns smaller than this per save are timer noise, not regressions.
+MIN_DELTA = 5e-6
+
+
+def best_of(repeats: int, run: Callable[[], None], setup: Optional[Callable[[], None]] = None) -> float:
+    """Best time of at least ``repeats`` runs, repeating fast stages until ``MIN_TIME`` has been spent."""
+    times: List[float] = []
+    gc.collect()
+    while len(times) < repeats or (sum(times) < MIN_TIME and len(times) < MAX_REPEATS):
+        if setup is not None:
+            setup()
+        # Like timeit, keep collections out of the timed run.
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - started)
+        finally:
+            gc.enable()
+    return min(times)
+
+
+def bench_once(repeats: int) -> Dict[str, float]:
+    """Stages that do not depend on the number of saves."""
+    cache = DATA_PATH / "Data.shop.npz"
+    return {
+        "shop_compile": best_of(repeats, lambda: shop_data.ShopData.from_xlsx(DATA_PATH / "Data.xlsx")),
+        "shop_load": best_of(repeats, lambda: shop_data.load_shop_data(DATA_PATH, cache)),
+        "config_load": best_of(repeats, load_config),
+    }
+
+
+def bench_saves(saves: List[bytes], repeats: int, stages: Optional[List[str]] = None) -> Dict[str, float]:
+    """Seconds per save for every per-save stage."""
+    conf = load_config()
+    sd = load_shop_data()
+
+    raw = [base64.b64decode(save) for save in saves]
+    data = [decode_save(io.BytesIO(save)) for save in saves]
+    built = [build_game(d, conf, sd) for d in data]
+    games = [game for game, _ in built]
+
+    def clear() -> None:
+        for game in games:
+            for name in DERIVED:
+                game.__dict__.pop(name, None)
+
+    def derive(name: str) -> Callable[[], None]:
+        return lambda: [getattr(game, name) for game in games]
+
+    def render() -> None:
+        console = Console(file=io.StringIO(), width=160, force_terminal=True)
+        for game, buys in built[:RENDER_LIMIT]:
+            console.print(dashboard(game, buys))
+
+    def frame() -> None:
+        sf = SaveFrame.from_games(games)
+        sf.multiplier, sf.hept_per_day, sf.powder_goal
+
+    timed: Dict[str, tuple] = {
+        "base64_decode": (lambda: [base64.b64decode(save) for save in saves], None, len(saves)),
+        "json_parse": (lambda: [json.loads(r) for r in raw], None, len(saves)),
+        "stream_decode": (lambda: [decode_save(io.BytesIO(save)) for save in saves], None, len(saves)),
+        "validate": (lambda: [SynergismGame(**d) for d in data], None, len(saves)),
+        "validate_trusted": (lambda: [SynergismGame.from_trusted(d) for d in data], None, len(saves)),
+        "shop_buys": (lambda: [ShopBuys(sd, game.total_quarks) for game in games], None, len(saves)),
+        "shop_buys_batch": (lambda: ShopBuys.batch(sd, [game.total_quarks for game in games]), None, len(saves)),
+        **{f"derived.{name}": (derive(name), clear, len(saves)) for name in DERIVED},
+        "derived.all": (lambda: [getattr(game, name) for game in games for name in DERIVED], clear, len(saves)),
+        "frame": (frame, None, len(saves)),
+        "render": (render, None, min(len(saves), RENDER_LIMIT)),
+    }
+
+    results = {}
+    for stage, (run, setup, count) in timed.items():
+        if stages and not any(stage == s or stage.startswith(s + ".") for s in stages):
+            continue
+        results[stage] = best_of(repeats, run, setup) / count
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the save pipeline stage by stage.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="numbers of saves per batch")
+    parser.add_argument("--stages", nargs="+", help="only these stages (a prefix like 'derived' selects the group)")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--padding", type=int, default=200, help="filler floats per save")
+    parser.add_argument("--baseline", type=Path, default=BASELINES)
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=1.25, help="slowdown factor counted as a regression")
+    args = parser.parse_args()
+
+    results: Dict[str, Dict[str, float]] = {}
+    if not args.stages or any(s in ("shop_compile", "shop_load", "config_load") for s in args.stages):
+        results["once"] = bench_once(args.repeats)
+    for size in args.sizes:
+        results[str(size)] = bench_saves(make_saves(size, padding=args.padding), args.repeats, args.stages)
+
+    baseline: Dict[str, Dict[str, float]] = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+
+    table = Table(box=box.MINIMAL_DOUBLE_HEAD, title="Benchmarks (per save)", title_style="bold")
+    table.add_column("Saves")
+    table.add_column("Stage")
+    table.add_column("Time", justify="right")
+    table.add_column("Baseline", justify="right")
+    table.add_column("Ratio", justify="right")
+
+    regressions = 0
+    for size, stages in results.items():
+        for stage, seconds in stages.items():
+            base = baseline.get(size, {}).get(stage)
+            ratio = seconds / base if base else None
+            style = ""
+            if ratio is not None and ratio > args.threshold and seconds - base > MIN_DELTA:
+                regressions += 1
+                style = "bold red"
+            table.add_row(
+                size,
+                stage,
+                f"{seconds * 1e6:,.1f} µs",
+                f"{base * 1e6:,.1f} µs" if base else "-",
+                f"{ratio:.2f}" if ratio is not None else "-",
+                style=style,
+            )
+
+    console = Console()
+    console.print(table)
+
+    if args.save_baseline:
+        for size, stages in results.items():
+            baseline.setdefault(size, {}).update(stages)
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        console.print(f"Baseline written to {args.baseline}")
+    elif regressions:
+        console.print(f"[bold red]{regressions} stage(s) slower than {args.threshold}x baseline")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
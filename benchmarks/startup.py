@@ -0,0 +1,111 @@
+"""Check the import cost of the lean ``synergisa --json/--csv`` path against a budget.
+
+    python3 benchmarks/startup.py
+    python3 benchmarks/startup.py --budget-ms 250 --top 15
+
+Runs ``python -X importtime src/synergisa.py SAVE --json`` on a synthetic save
+a few times, each run next to one of a bare ``python -c pass``, and takes the
+fastest of each. Every import of the run counts, the lazy ones made while
+building the report included, less the bare interpreter's own. Fails when that
+is over budget or when a module that only the rich dashboard needs got
+imported anyway. The runs use a temporary save cache (``SYNERGISA_CACHE``),
+not data/cache.
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+SRC = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(Path(__file__).parent))
+
+from synthetic import make_save  # noqa: E402
+
+# About 1.7x the usual cost, single runs on a loaded machine are often 30% slower than the best one.
+BUDGET_MS = 500
+
+# Only the dashboard, the watcher, profiling and shop compilation may pull these in.
+FORBIDDEN = ("rich", "loguru", "pandas", "openpyxl", "asyncio", "tracemalloc", "watcher")
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_times(*args: str, env: Optional[Dict[str, str]] = None) -> Tuple[List[Tuple[str, int, int, int]], float]:
+    """``(module, self us, cumulative us, depth)`` for every import made by ``python args``, and its wall time in ms."""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=SRC,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    imports = [
+        (m.group(4), int(m.group(1)), int(m.group(2)), len(m.group(3)) // 2)
+        for m in map(_LINE.match, result.stderr.splitlines())
+        if m
+    ]
+    return imports, wall_ms
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check the lean synergisa import time.")
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=10, help="heaviest top-level imports to list")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        save_path = Path(tmp) / "save.txt"
+        save_path.write_bytes(make_save(0))
+        env = {**os.environ, "SYNERGISA_CACHE": str(Path(tmp) / "cache")}
+        runs, walls, bare = [], [], []
+        for _ in range(args.runs):
+            imports, wall_ms = import_times("synergisa.py", str(save_path), "--json", env=env)
+            runs.append(imports)
+            walls.append(wall_ms)
+            bare.append(import_times("-c", "pass")[0])
+
+    def total(run: List[Tuple[str, int, int, int]]) -> int:
+        return sum(cumulative for _, _, cumulative, depth in run if depth == 0)
+
+    totals = [total(run) for run in runs]
+    best = runs[totals.index(min(totals))]
+    bare_ms = min(map(total, bare)) / 1000
+    total_ms = min(totals) / 1000 - bare_ms
+
+    by_package: Dict[str, int] = {}
+    for name, _, cumulative, depth in best:
+        if depth <= 1:
+            by_package[name] = max(by_package.get(name, 0), cumulative)
+
+    print(f"synergisa --json imports: {total_ms:.1f} ms over python -c pass (budget {args.budget_ms:.0f} ms, best of {args.runs})")
+    print(f"python -c pass imports: {bare_ms:.1f} ms")
+    print(f"synergisa --json wall time: {min(walls):.1f} ms")
+    for name, cumulative in sorted(by_package.items(), key=lambda item: item[1], reverse=True)[: args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    # Any run importing them is a leak, not just the fastest.
+    imported = {name.split(".")[0] for run in runs for name, _, _, _ in run}
+    leaked = [name for name in FORBIDDEN if name in imported]
+
+    failed = False
+    if leaked:
+        print(f"FAIL: lean path imports {', '.join(leaked)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"FAIL: {total_ms:.1f} ms over the {args.budget_ms:.0f} ms budget")
+        failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
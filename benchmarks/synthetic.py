@@ -0,0 +1,116 @@
+"""Synthetic Synergism saves for the benchmarks.
+
+The saves carry every key ``SynergismGame`` reads, with values in the ranges
+real late-game exports have, plus a ``padding`` list standing in for the rest
+of a real export (which the decoder has to skip).
+"""
+import argparse
+import base64
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from save_layout import ShopUpgrades  # noqa: E402
+
+# (base cap, hepteract conversion, other conversions, cap relative to chronos)
+HEPTERACTS: Dict[str, tuple] = {
+    "chronos": (1000, 10000, {"researchPoints": 1e115}, 1),
+    "hyperrealism": (1000, 10000, {"researchPoints": 1e115}, 1 / 2),
+    "quark": (1000, 10000, {"worlds": 100}, None),
+    "challenge": (1000, 50000, {"wowPlatonicCubes": 1e11}, 1 / 4),
+    "abyss": (1, 1e8, {"wowCubes": 69}, None),
+    "accelerator": (1000, 100000, {"researchPoints": 1e120}, 1 / 32),
+    "acceleratorBoost": (1000, 100000, {"prestigePoints": 1e300}, 1 / 64),
+    "multiplier": (1000, 100000, {"researchPoints": 1e140}, 1 / 128),
+}
+
+
+def make_save_data(
+    seed: int,
+    chronos_tier: int = 12,
+    quarks: float = 1e6,
+    achievements: int = 300,
+    platonics: int = 24,
+    padding: int = 5000,
+) -> Dict[str, Any]:
+    """Decoded save dict. Linked hepteract caps keep their ratios to a Chronos cap of ``chronos_tier``."""
+    rng = random.Random(seed)
+    chronos_cap = 1000 * 2 ** (chronos_tier - 1)
+
+    crafts = {}
+    for name, (base_cap, conversion, other, ratio) in HEPTERACTS.items():
+        cap = max(chronos_cap * ratio, base_cap) if ratio is not None else base_cap * 2 ** rng.randint(0, 4)
+        crafts[name] = {
+            "BAL": cap * rng.random(),
+            "CAP": cap,
+            "BASE_CAP": base_cap,
+            "HEPTERACT_CONVERSION": conversion,
+            "OTHER_CONVERSIONS": other,
+            "HTML_STRING": name,
+        }
+
+    return {
+        "wowCubes": rng.uniform(1e29, 1e31),
+        "wowTesseracts": rng.uniform(1e28, 1e30),
+        "wowHypercubes": rng.uniform(1e27, 1e29),
+        "wowPlatonicCubes": rng.uniform(1e26, 1e28),
+        "wowAbyssals": rng.uniform(1e8, 1e10),
+        "singularityCount": rng.randint(0, 20),
+        "challenge15Exponent": rng.uniform(1e18, 1e22),
+        "worlds": quarks,
+        "overfluxPowder": rng.uniform(1e3, 1e6),
+        "overfluxOrbs": rng.uniform(1e5, 1e9),
+        "shopUpgrades": {name: rng.randint(1, 100) for name in ShopUpgrades.model_fields},
+        "hepteractCrafts": crafts,
+        "platonicUpgrades": [0] + [rng.randint(0, 10) for _ in range(platonics)],
+        "usedCorruptions": [0] + [rng.randint(0, 16) for _ in range(9)],
+        "achievements": [0] + [rng.randint(0, 1) for _ in range(achievements)],
+        "ascensionCount": rng.randint(10**5, 10**9),
+        "ascensionCounter": rng.uniform(0, 1e6),
+        "offlinetick": int(time.time() * 1000) - rng.randint(0, 10**7),
+        "padding": [rng.random() for _ in range(padding)],
+    }
+
+
+def make_save(seed: int, **kwargs: Any) -> bytes:
+    """``make_save_data`` encoded the way the game exports it."""
+    return base64.b64encode(json.dumps(make_save_data(seed, **kwargs)).encode())
+
+
+def make_saves(count: int, seed: int = 0, padding: int = 5000) -> List[bytes]:
+    """``count`` saves spread over Chronos tiers, quark balances and list lengths."""
+    rng = random.Random(seed)
+    return [
+        make_save(
+            seed + i,
+            chronos_tier=rng.randint(8, 20),
+            quarks=10 ** rng.uniform(3, 8),
+            achievements=rng.randint(250, 400),
+            platonics=rng.randint(15, 30),
+            padding=padding,
+        )
+        for i in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write synthetic base64 saves.")
+    parser.add_argument("out_dir")
+    parser.add_argument("-n", "--count", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--padding", type=int, default=5000, help="floats of filler per save, controls the size")
+    args = parser.parse_args()
+
+    out = Path(args.out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    for i, save in enumerate(make_saves(args.count, args.seed, args.padding)):
+        (out / f"save{i:05d}.txt").write_bytes(save)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, TextIO
+
+from loguru import logger
+
+from save_layout import HepteractCrafts, SynergismConfig
+from synergisa import load_config, load_game, load_shop_data
+
+ROW_FIELDS: List[str] = [
+    "save",
+    "total_quarks",
+    "multiplier",
+    "hept_per_day",
+    "powder_goal",
+    "orbs_to_powder_goal",
+    *[f"buyable_{hept_type}" for hept_type in HepteractCrafts.model_fields.keys()],
+    "error",
+]
+
+# Per-process state, filled once by the pool initializer so every save in a
+# worker reuses the same config and shop table.
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(trusted: bool = False) -> None:
+    _worker["config"] = load_config()
+    _worker["shop"] = load_shop_data()
+    _worker["trusted"] = trusted
+
+
+def evaluate_save(file_path: str) -> Dict[str, Any]:
+    """Decode one save and return its summary row. Errors are reported in the row, not raised."""
+    row: Dict[str, Any] = {"save": file_path}
+
+    try:
+        conf: SynergismConfig = _worker["config"]
+        game, _ = load_game(file_path, conf, _worker["shop"], _worker["trusted"])
+
+        row["total_quarks"] = game.total_quarks
+        row["multiplier"] = game.multiplier
+        row["hept_per_day"] = game.hept_per_day
+        row["powder_goal"] = game.powder_goal
+        row["orbs_to_powder_goal"] = game.orbs_to_powder_goal
+
+        hepts = game.hepts_after_ascension
+        quarks = game.total_quarks - conf.quark_keep
+        for hept_type in HepteractCrafts.model_fields.keys():
+            row[f"buyable_{hept_type}"] = getattr(game.hepts, hept_type).buyable(hepts, quarks)
+    except Exception as e:  # noqa: BLE001 - one broken save must not stop the batch
+        row["error"] = f"{type(e).__name__}: {e}"
+
+    return row
+
+
+def find_saves(target: str, pattern: str = "*") -> List[str]:
+    """Expand a directory (matched against ``pattern``) or a glob into a sorted list of files."""
+    if os.path.isdir(target):
+        return sorted(str(p) for p in Path(target).glob(pattern) if p.is_file())
+
+    return sorted(p for p in glob.glob(target, recursive=True) if os.path.isfile(p))
+
+
+def evaluate_saves(file_paths: Iterable[str], workers: Optional[int] = None, trusted: bool = False) -> Iterator[Dict[str, Any]]:
+    """Evaluate saves over a process pool, yielding rows in input order.
+
+    Only a bounded window of saves is in flight at any time, so memory does not
+    grow with the number of saves. ``trusted`` skips per-field validation (see
+    ``SynergismGame.from_trusted``).
+    """
+    workers = workers or os.cpu_count() or 1
+    window = workers * 4
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(trusted,)) as pool:
+        pending: Deque[Future] = deque()
+
+        for file_path in file_paths:
+            pending.append(pool.submit(evaluate_save, file_path))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+
+class RowWriter:
+    """Streams rows to CSV or JSON Lines."""
+
+    def __init__(self, out: TextIO, fmt: str) -> None:
+        self.out = out
+        self.fmt = fmt
+        self._csv: Optional[csv.DictWriter] = None
+
+        if fmt == "csv":
+            self._csv = csv.DictWriter(out, fieldnames=ROW_FIELDS, extrasaction="ignore")
+            self._csv.writeheader()
+
+    def write(self, row: Dict[str, Any]) -> None:
+        if self._csv is not None:
+            self._csv.writerow(row)
+        else:
+            self.out.write(json.dumps(row) + "\n")
+        self.out.flush()
+
+
+@logger.catch
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Evaluate a directory or glob of base64-encoded saves.")
+    parser.add_argument("target", help="directory of saves or a glob such as 'saves/**/*.txt'")
+    parser.add_argument("--pattern", default="*", help="file pattern when target is a directory")
+    parser.add_argument("-o", "--output", help="output file, defaults to stdout")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="output format, guessed from --output")
+    parser.add_argument("-j", "--workers", type=int, help="worker processes, defaults to CPU count")
+    parser.add_argument("--trusted", action="store_true", help="skip per-field validation, for saves exported by the game")
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.output and args.output.endswith(".csv") else "jsonl")
+    file_paths = find_saves(args.target, args.pattern)
+    logger.info(f"Evaluating {len(file_paths)} saves")
+
+    out = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        writer = RowWriter(out, fmt)
+        failed = 0
+        for row in evaluate_saves(file_paths, args.workers, args.trusted):
+            if "error" in row:
+                failed += 1
+                logger.warning(f"{row['save']}: {row['error']}")
+            writer.write(row)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    logger.info(f"Done, {len(file_paths) - failed} ok, {failed} failed")
+
+
+if __name__ == "__main__":
+    main()
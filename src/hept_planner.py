@@ -0,0 +1,183 @@
+import math
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from save_layout import Hepteract, HepteractCrafts, SynergismGame
+
+# Caps of the crafts that have to stay in ratio, relative to the Chronos cap
+# (Chronos/Accel 32, Chronos/Challenge 4, Hyper/Challenge 2, Accel/Mult 4, Boost/Mult 2).
+LINKED_CAPS: Dict[str, float] = {
+    "chronos": 1,
+    "hyperrealism": 1 / 2,
+    "challenge": 1 / 4,
+    "accelerator": 1 / 32,
+    "acceleratorBoost": 1 / 64,
+    "multiplier": 1 / 128,
+}
+FREE_CRAFTS = [name for name in HepteractCrafts.model_fields.keys() if name not in LINKED_CAPS]
+
+OBJECTIVES = ("multiplier", "hept_per_day", "tiers")
+
+
+class CraftStep(BaseModel):
+    craft: str
+    from_tier: int
+    to_tier: int
+    hepts: int
+    quarks: int
+
+
+class CraftPlan(BaseModel):
+    objective: str
+    baseline: float
+    value: float
+    steps: List[CraftStep]
+    hepts_left: int
+    quarks_left: int
+
+
+def _tier(hept: Hepteract, cap: float) -> int:
+    return int(math.log2(cap / hept.base_cap) + 1)
+
+
+def _max_doublings(hept: Hepteract, hepts: int, quarks: int) -> Optional[int]:
+    """Most doublings of one craft (0 = just fill the current cap) affordable, None if not even that is."""
+    crafts = hepts / hept.hepteract_conversion
+    if hept.quarks_per_craft:
+        crafts = min(crafts, quarks / hept.quarks_per_craft)
+
+    # crafts_to_cap(T) = 2T - cap - balance <= crafts
+    top = (crafts + hept.cap + hept.balance) / 2
+    if top < hept.cap:
+        return None
+
+    doublings = int(math.log2(top / hept.cap))
+    while doublings > 0 and (
+        hept.cost_to_cap(hept.cap_after(doublings)) > hepts or hept.quark_cost_to_cap(hept.cap_after(doublings)) > quarks
+    ):
+        doublings -= 1
+    return doublings
+
+
+def first_linked_doubling(crafts: HepteractCrafts) -> Optional[int]:
+    """Chronos doublings needed before every linked craft can sit at its ratio, None if doublings never get there."""
+    first = 0
+    for name, ratio in LINKED_CAPS.items():
+        steps = math.log2(getattr(crafts, name).cap / (crafts.chronos.cap * ratio))
+        if abs(steps - round(steps)) > 1e-9:
+            return None
+        first = max(first, round(steps))
+    return first
+
+
+def linked_cost(crafts: HepteractCrafts, chronos_cap: float) -> int:
+    """Hepts to fill every linked craft up to ``chronos_cap`` times its ratio."""
+    return sum(getattr(crafts, name).cost_to_cap(chronos_cap * ratio) for name, ratio in LINKED_CAPS.items())
+
+
+def _linked_options(crafts: HepteractCrafts, hepts: int) -> List[Tuple[float, int]]:
+    """Affordable ``(chronos cap, hept cost)`` targets that fill every linked craft at a valid ratio."""
+    chronos = crafts.chronos
+    first = first_linked_doubling(crafts)
+    if first is None:
+        return []
+
+    # cost(T) = 2T * sum(conv * ratio) - sum(conv * (cap + balance)), solved for the largest T.
+    linked = [(getattr(crafts, name), ratio) for name, ratio in LINKED_CAPS.items()]
+    slope = 2 * sum(hept.hepteract_conversion * ratio for hept, ratio in linked)
+    offset = sum(hept.hepteract_conversion * (hept.cap + hept.balance) for hept, _ in linked)
+    top = (hepts + offset) / slope
+    if top < chronos.cap_after(first):
+        return []
+
+    options = []
+    for doublings in range(first, int(math.log2(top / chronos.cap)) + 1):
+        cap = chronos.cap_after(doublings)
+        if (cost := linked_cost(crafts, cap)) <= hepts:
+            options.append((cap, cost))
+    return options
+
+
+def _objective(game: SynergismGame, objective: str, chronos_cap: Optional[float]) -> float:
+    if chronos_cap is None:
+        return getattr(game, objective)
+
+    with game.what_if({"hepts.chronos.balance": chronos_cap, "hepts.chronos.cap": chronos_cap}):
+        return getattr(game, objective)
+
+
+def plan_crafts(game: SynergismGame, objective: str = "multiplier") -> CraftPlan:
+    """Best set of hepteract cap doublings affordable right now.
+
+    The budget is ``hepts_after_ascension`` and the spendable quarks
+    (``total_quarks - quark_keep``). The linked crafts only move together so
+    their cap ratios stay valid, the free ones (quark, abyss) on their own.
+    ``objective`` is a ``SynergismGame`` stat (``multiplier``, ``hept_per_day``)
+    or ``tiers`` for the sum of all craft tiers. Every option is costed in
+    closed form, so even deep tiers are a few hundred evaluations.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective {objective}, expected one of {', '.join(OBJECTIVES)}")
+    if game.config is None:
+        raise ValueError("Config not set")
+
+    crafts = game.hepts
+    hepts = game.hepts_after_ascension
+    quarks = max(game.total_quarks - game.config.quark_keep, 0)
+    by_tiers = objective == "tiers"
+
+    def tiers(caps: Dict[str, float]) -> int:
+        return sum(_tier(getattr(crafts, name), caps.get(name, getattr(crafts, name).cap)) for name in HepteractCrafts.model_fields)
+
+    baseline = tiers({}) if by_tiers else _objective(game, objective, None)
+
+    best: Tuple[Tuple[float, int], Dict[str, float]] = ((baseline, 0), {})
+    for chronos_cap, spent in [(None, 0), *_linked_options(crafts, hepts)]:
+        caps: Dict[str, float] = {}
+        if chronos_cap is not None:
+            caps = {name: chronos_cap * ratio for name, ratio in LINKED_CAPS.items()}
+
+        free_options: List[Dict[str, float]] = [{}]
+        if by_tiers:
+            # Only tiers rewards the free crafts; try every quark target, then the most abyss that fits.
+            quark_hept = crafts.quark
+            most = _max_doublings(quark_hept, hepts - spent, quarks)
+            for doublings in [None, *range((most if most is not None else -1) + 1)]:
+                free = {} if doublings is None else {"quark": quark_hept.cap_after(doublings)}
+                left = hepts - spent - (quark_hept.cost_to_cap(free["quark"]) if free else 0)
+                for name in FREE_CRAFTS:
+                    if name not in free and (most_free := _max_doublings(getattr(crafts, name), left, 0)) is not None:
+                        free[name] = getattr(crafts, name).cap_after(most_free)
+                        left -= getattr(crafts, name).cost_to_cap(free[name])
+                free_options.append(free)
+
+        value = None if by_tiers else _objective(game, objective, chronos_cap)
+        for free in free_options:
+            plan_caps = {**caps, **free}
+            cost = sum(getattr(crafts, name).cost_to_cap(cap) for name, cap in plan_caps.items())
+            score = (tiers(plan_caps) if by_tiers else value, -cost)
+            if score > best[0]:
+                best = (score, plan_caps)
+
+    (value, _), plan_caps = best
+    steps = [
+        CraftStep(
+            craft=name,
+            from_tier=getattr(crafts, name).tier,
+            to_tier=_tier(getattr(crafts, name), cap),
+            hepts=getattr(crafts, name).cost_to_cap(cap),
+            quarks=getattr(crafts, name).quark_cost_to_cap(cap),
+        )
+        for name, cap in plan_caps.items()
+        if getattr(crafts, name).crafts_to_cap(cap) > 0
+    ]
+
+    return CraftPlan(
+        objective=objective,
+        baseline=baseline,
+        value=value,
+        steps=steps,
+        hepts_left=hepts - sum(step.hepts for step in steps),
+        quarks_left=quarks - sum(step.quarks for step in steps),
+    )
@@ -0,0 +1,205 @@
+import argparse
+import sqlite3
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy
+
+from save_layout import HepteractCrafts, SynergismGame
+
+if TYPE_CHECKING:
+    import pandas
+
+DEFAULT_PATH = Path(__file__).parent.parent / "data" / "history.sqlite"
+DEFAULT_PLAYER = "default"
+
+# Fields and derived stats stored per snapshot, followed by the tier of every hepteract.
+STATS = (
+    "wowAbyssals",
+    "quarksLeft",
+    "overfluxPowder",
+    "overfluxOrbs",
+    "challenge15Exponent",
+    "ascensionCount",
+    "total_quarks",
+    "multiplier",
+    "hept_per_day",
+    "shop_benefit_hept",
+    "powder_goal",
+    "orbs_to_powder_goal",
+)
+TIERS = tuple(f"{name}_tier" for name in HepteractCrafts.model_fields)
+COLUMNS = STATS + TIERS
+
+# Keyed by player and save time, so a time range is one contiguous scan of the primary key.
+# A save is unique per player only, two players may store the same file.
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS snapshots (
+    player TEXT NOT NULL,
+    save_time INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    {", ".join(f"{column} REAL" for column in COLUMNS)},
+    PRIMARY KEY (player, save_time),
+    UNIQUE (player, hash)
+) WITHOUT ROWID
+"""
+_INSERT = (
+    f"INSERT OR IGNORE INTO snapshots (player, save_time, hash, {', '.join(COLUMNS)}) "
+    f"VALUES ({', '.join('?' * (len(COLUMNS) + 3))})"
+)
+
+
+def snapshot(game: SynergismGame) -> List[float]:
+    """The ``COLUMNS`` values of a game that has config and shop benefits set."""
+    return [*(getattr(game, name) for name in STATS), *(getattr(game.hepts, name).tier for name in HepteractCrafts.model_fields)]
+
+
+class History:
+    """Append-only store of save snapshots in SQLite, queried by player and ``saveTime`` range.
+
+    A snapshot is skipped when the player already has its save hash stored,
+    or one at the same ``saveTime``.
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_PATH) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        # One small transaction per snapshot, WAL keeps each of them from syncing the whole file.
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.execute("PRAGMA synchronous = NORMAL")
+        self.db.execute(_SCHEMA)
+
+    def __enter__(self) -> "History":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __len__(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0]
+
+    def append(self, game: SynergismGame, save_hash: str, player: str = DEFAULT_PLAYER) -> bool:
+        """Store one snapshot, False if it was a duplicate."""
+        with self.db:
+            cursor = self.db.execute(_INSERT, (player, game.saveTime, save_hash, *snapshot(game)))
+        return cursor.rowcount > 0
+
+    def players(self) -> List[str]:
+        return [row[0] for row in self.db.execute("SELECT DISTINCT player FROM snapshots ORDER BY player")]
+
+    def query(
+        self,
+        player: str = DEFAULT_PLAYER,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Dict[str, numpy.ndarray]:
+        """Snapshots of ``player`` with ``since <= saveTime < until`` (ms since the epoch), one array per column.
+
+        ``save_time`` is always included, as int64, and rows are in time order.
+        """
+        columns = list(columns or COLUMNS)
+        unknown = set(columns) - set(COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(sorted(unknown))}")
+
+        rows = self.db.execute(
+            f"SELECT save_time, {', '.join(columns)} FROM snapshots "
+            "WHERE player = ? AND save_time >= ? AND save_time < ? ORDER BY save_time",
+            # int() as numpy integers would be bound as blobs, which compare unequal to everything.
+            (player, int(since) if since is not None else -(2**63), int(until) if until is not None else 2**63 - 1),
+        ).fetchall()
+
+        # NULLs (a stat that was NaN) come back as None, which float64 turns into NaN.
+        values = numpy.array(rows, dtype=numpy.float64).reshape(len(rows), len(columns) + 1)
+        result = {"save_time": values[:, 0].astype(numpy.int64)}
+        result.update((name, values[:, i + 1]) for i, name in enumerate(columns))
+        return result
+
+    def frame(
+        self,
+        player: str = DEFAULT_PLAYER,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> "pandas.DataFrame":
+        """``query`` as a DataFrame indexed by save time."""
+        import pandas
+
+        data = self.query(player, since, until, columns)
+        index = pandas.to_datetime(data.pop("save_time"), unit="ms", utc=True)
+        return pandas.DataFrame(data, index=index.rename("save_time"))
+
+
+def add_saves(history: History, file_paths: Iterable[str], player: str = DEFAULT_PLAYER, trusted: bool = False) -> int:
+    """Decode and store the saves ``player`` has not stored yet, returning how many were added.
+
+    Saves already decoded come from the cache, so stored ones cost little more than their hash.
+    """
+    from synergisa import load_config, load_hashed_game, load_shop_data
+
+    conf, sd = load_config(), load_shop_data()
+    added = 0
+    for file_path in file_paths:
+        game, _, save_hash = load_hashed_game(file_path, conf, sd, trusted)
+        added += history.append(game, save_hash, player)
+    return added
+
+
+def parse_time(value: str) -> int:
+    """ISO date or datetime (UTC unless it says otherwise) as ms since the epoch."""
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp() * 1000)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Store save snapshots and look at their history.")
+    parser.add_argument("--db", type=Path, default=DEFAULT_PATH, help="history database")
+    parser.add_argument("--player", default=DEFAULT_PLAYER)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="store snapshots of saves")
+    add.add_argument("file_paths", nargs="+", help="paths to base64-encoded saves")
+    add.add_argument("--trusted", action="store_true", help="skip per-field validation, for saves exported by the game")
+
+    show = commands.add_parser("show", help="print the snapshots in a time range")
+    show.add_argument("--since", type=parse_time, help="ISO date, inclusive")
+    show.add_argument("--until", type=parse_time, help="ISO date, exclusive")
+    show.add_argument("--columns", nargs="+", choices=COLUMNS, metavar="COLUMN", help=f"any of {', '.join(COLUMNS)}")
+    show.add_argument("--csv", action="store_true", help="print CSV instead of a table")
+    args = parser.parse_args()
+
+    with History(args.db) as history:
+        if args.command == "add":
+            added = add_saves(history, args.file_paths, args.player, args.trusted)
+            print(f"{added} snapshot(s) added, {len(args.file_paths) - added} already stored", file=sys.stderr)
+            return
+
+        frame = history.frame(args.player, args.since, args.until, args.columns)
+
+    if args.csv:
+        frame.to_csv(sys.stdout)
+        return
+
+    from rich.console import Console
+    from rich.table import Table
+    from rich import box
+
+    table = Table(box=box.MINIMAL_DOUBLE_HEAD, title=f"History of {args.player}", title_style="bold")
+    table.add_column("Save time")
+    for column in frame.columns:
+        table.add_column(column, justify="right")
+    for moment, row in frame.iterrows():
+        table.add_row(f"{moment:%Y-%m-%d %H:%M}", *(f"{value:,.6g}" for value in row))
+    Console().print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import math
+from typing import Union
+
+import numpy
+
+DEFAULT_RTOL = 1e-12
+MAX_ITERATIONS = 100
+
+
+class PowderSolution:
+    """Fixed point ``root`` per element (or of one scalar solve), with the iterations used, the relative
+    residual left and whether the step size got within tolerance."""
+
+    root: Union[float, numpy.ndarray]
+    iterations: Union[int, numpy.ndarray]
+    residual: Union[float, numpy.ndarray]
+    converged: Union[bool, numpy.ndarray]
+
+    def __init__(self, root, iterations, residual, converged) -> None:
+        self.root = root
+        self.iterations = iterations
+        self.residual = residual
+        self.converged = converged
+
+
+def diminishing_exponent(u44) -> numpy.ndarray:
+    """``p44_noname - 1`` computed without cancellation."""
+    return numpy.expm1(((1 / 6) + ((1 / 750) * numpy.asarray(u44, dtype=numpy.float64))) * math.log1p(0.0000001 / 2))
+
+
+def diminishing_exponent_scalar(u44: float) -> float:
+    """``diminishing_exponent`` of one plain float."""
+    return math.expm1(((1 / 6) + ((1 / 750) * u44)) * math.log1p(0.0000001 / 2))
+
+
+def _h(y: numpy.ndarray, exponent: numpy.ndarray, log_inc: numpy.ndarray) -> numpy.ndarray:
+    return y + numpy.log(numpy.expm1(exponent * y)) - log_inc
+
+
+def _dh(y: numpy.ndarray, exponent: numpy.ndarray) -> numpy.ndarray:
+    # d/dy ln(expm1(e*y)) = e * exp(e*y) / expm1(e*y) = -e / expm1(-e*y), which cannot overflow
+    return 1 - exponent / numpy.expm1(-exponent * y)
+
+
+def solve_fixed_point(inc, exponent, start, rtol: float = DEFAULT_RTOL) -> PowderSolution:
+    """Solve ``x = inc / (x ** exponent - 1)`` for ``x > 1``, element-wise over broadcast inputs.
+
+    This is the fixed point the powder goal spreadsheet formula approximates
+    by unrolling the step four times. It is solved as the root of
+    ``h(y) = y + ln(expm1(exponent * y)) - ln(inc)`` with ``y = ln(x)``,
+    which is increasing and concave, using Newton steps kept inside a
+    bisection bracket. ``start`` is only the first guess. Elements without a
+    solution (non-positive ``inc`` or ``exponent``) come back as NaN.
+    """
+    inc, exponent, start = numpy.broadcast_arrays(
+        *(numpy.asarray(a, dtype=numpy.float64) for a in (inc, exponent, start))
+    )
+    valid = (inc > 0) & (exponent > 0)
+    inc = numpy.where(valid, inc, 1.0)
+    exponent = numpy.where(valid, exponent, 1.0)
+    log_inc = numpy.log(inc)
+
+    with numpy.errstate(over="ignore", divide="ignore", invalid="ignore"):
+        y = numpy.where(start > 1, numpy.log(numpy.where(start > 1, start, 2.0)), 1.0)
+
+        # Bracket the root, h -> -inf as y -> 0+ and grows without bound.
+        lo = y.copy()
+        while numpy.any(low := _h(lo, exponent, log_inc) >= 0):
+            lo = numpy.where(low, lo / 2, lo)
+        hi = y.copy()
+        while numpy.any(high := _h(hi, exponent, log_inc) <= 0):
+            hi = numpy.where(high, hi * 2, hi)
+
+        iterations = numpy.zeros(y.shape, dtype=numpy.int64)
+        active = numpy.ones(y.shape, dtype=bool)
+        converged = numpy.zeros(y.shape, dtype=bool)
+        for _ in range(MAX_ITERATIONS):
+            value = _h(y, exponent, log_inc)
+            lo = numpy.where(active & (value < 0), y, lo)
+            hi = numpy.where(active & (value > 0), y, hi)
+
+            step = y - value / _dh(y, exponent)
+            step = numpy.where((step > lo) & (step < hi), step, (lo + hi) / 2)
+
+            done = numpy.abs(step - y) <= rtol * numpy.maximum(numpy.abs(y), 1)
+            y = numpy.where(active, step, y)
+            iterations += active
+            converged |= active & done
+            active &= ~done
+            if not active.any():
+                break
+
+        root = numpy.exp(y)
+        residual = numpy.abs(root - inc / numpy.expm1(exponent * y)) / root
+
+    nan = numpy.full(y.shape, numpy.nan)
+    return PowderSolution(numpy.where(valid, root, nan), iterations, numpy.where(valid, residual, nan), converged & valid)
+
+
+def _h_scalar(y: float, exponent: float, log_inc: float) -> float:
+    z = exponent * y
+    if z > 1:
+        # ln(expm1(z)) without overflowing expm1
+        return y + z + math.log1p(-math.exp(-z)) - log_inc
+    return y + math.log(math.expm1(z)) - log_inc if z > 0 else -math.inf
+
+
+def solve_fixed_point_scalar(inc: float, exponent: float, start: float, rtol: float = DEFAULT_RTOL) -> PowderSolution:
+    """``solve_fixed_point`` for plain floats, the same steps with ``math`` so a single model skips numpy's overhead."""
+    if not (inc > 0 and exponent > 0):
+        return PowderSolution(math.nan, 0, math.nan, False)
+    log_inc = math.log(inc)
+
+    y = math.log(start) if start > 1 else 1.0
+    lo = hi = y
+    while _h_scalar(lo, exponent, log_inc) >= 0:
+        lo /= 2
+    while _h_scalar(hi, exponent, log_inc) <= 0:
+        hi *= 2
+
+    iterations, converged = 0, False
+    for _ in range(MAX_ITERATIONS):
+        value = _h_scalar(y, exponent, log_inc)
+        if value < 0:
+            lo = y
+        elif value > 0:
+            hi = y
+
+        step = y - value / (1 - exponent / math.expm1(-exponent * y))
+        if not lo < step < hi:
+            step = (lo + hi) / 2
+
+        done = abs(step - y) <= rtol * max(abs(y), 1)
+        y = step
+        iterations += 1
+        if done:
+            converged = True
+            break
+
+    root = math.exp(y)
+    # expm1 overflows where numpy's would give inf, the step is then 0
+    z = exponent * y
+    residual = abs(root - (inc / math.expm1(z) if z < 709 else 0.0)) / root
+    return PowderSolution(root, iterations, residual, converged)
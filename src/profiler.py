@@ -0,0 +1,134 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from functools import cached_property, wraps
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_NOOP: ContextManager[None] = nullcontext()
+
+
+class StageStats:
+    """Totals for one stage name: calls, inclusive wall time and net traced allocations."""
+
+    name: str
+    calls: int
+    seconds: float
+    allocated: int
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.calls = 0
+        self.seconds = 0.0
+        self.allocated = 0
+
+
+class Profiler:
+    """Registry of timed stages. Disabled, ``stage`` hands back a shared no-op context."""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.stats: Dict[str, StageStats] = {}
+        self.events: List[Dict[str, Any]] = []
+        self.origin = time.perf_counter()
+
+    def enable(self, trace_allocations: bool = True) -> None:
+        import tracemalloc  # not needed unless profiling, keep it out of startup
+
+        self.enabled = True
+        if trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stage(self, name: str) -> ContextManager[None]:
+        if not self.enabled:
+            return _NOOP
+        return self._timed(name)
+
+    @contextmanager
+    def _timed(self, name: str) -> Iterator[None]:
+        import tracemalloc
+
+        tracing = tracemalloc.is_tracing()
+        before = tracemalloc.get_traced_memory()[0] if tracing else 0
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            ended = time.perf_counter()
+            allocated = tracemalloc.get_traced_memory()[0] - before if tracing else 0
+            self.record(name, started, ended, allocated)
+
+    def record(self, name: str, started: float, ended: float, allocated: int = 0) -> None:
+        """Add a finished span, ``started``/``ended`` from ``time.perf_counter``."""
+        stats = self.stats.setdefault(name, StageStats(name))
+        stats.calls += 1
+        stats.seconds += ended - started
+        stats.allocated += allocated
+
+        self.events.append(
+            {
+                "name": name,
+                "ph": "X",
+                "ts": (started - self.origin) * 1e6,
+                "dur": (ended - started) * 1e6,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": {"allocated": allocated},
+            }
+        )
+
+    def summary(self) -> List[StageStats]:
+        return sorted(self.stats.values(), key=lambda s: s.seconds, reverse=True)
+
+    def write_trace(self, path: str) -> None:
+        """Chrome trace-event JSON, viewable in chrome://tracing or Perfetto."""
+        with open(path, "w") as file:
+            json.dump({"traceEvents": sorted(self.events, key=lambda e: e["ts"]), "displayTimeUnit": "ms"}, file)
+
+
+profiler = Profiler()
+stage = profiler.stage
+
+
+def profiled(name: Optional[str] = None) -> Callable[[F], F]:
+    """Decorator timing every call of a function as the stage ``name`` (default: its qualified name)."""
+
+    def decorate(func: F) -> F:
+        label = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+            with profiler._timed(label):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def instrument(cls: type) -> None:
+    """Time the cached and plain properties of ``cls`` as ``Class.name`` stages.
+
+    Patches the class in place, so it costs nothing until profiling is turned on.
+    """
+    for attr, value in list(vars(cls).items()):
+        label = f"{cls.__name__}.{attr}"
+        if isinstance(value, cached_property) and not getattr(value.func, "__profiled__", False):
+            value.func = _timed_function(label, value.func)
+        elif isinstance(value, property) and value.fget is not None and not getattr(value.fget, "__profiled__", False):
+            setattr(cls, attr, property(_timed_function(label, value.fget), value.fset, value.fdel, value.__doc__))
+
+
+def _timed_function(label: str, func: Callable[..., Any]) -> Callable[..., Any]:
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with profiler.stage(label):
+            return func(*args, **kwargs)
+
+    wrapper.__profiled__ = True  # type: ignore[attr-defined]
+    return wrapper
@@ -0,0 +1,255 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Dict, Optional, Tuple, Union
+
+import numpy
+
+from profiler import stage
+from save_decoder import content_hash, decode_save
+from save_layout import SCHEMA_VERSION, Hepteract, HepteractCrafts, ShopUpgrades, SynergismGame
+
+DEFAULT_PATH = Path(__file__).parent.parent / "data" / "cache"
+DEFAULT_MAX_BYTES = 64 << 20
+# Rescan the directory every this many puts, to catch up with what other processes stored and evicted.
+EVICT_EVERY = 1024
+# Eviction goes down to this share of max_bytes, so the puts right after it do not scan again.
+LOW_WATER = 0.9
+# Running total of the entry sizes, kept next to them so a new process does not have to scan.
+_SIZE_FILE = "size"
+
+# Plain save fields by type, the nested models and arrays are stored separately.
+_NESTED = ("shop", "hepts", "platonicUpgrades", "usedCorruptions", "achievements")
+_PLAIN = {
+    name: field
+    for name, field in SynergismGame.model_fields.items()
+    if name not in _NESTED and not (field.json_schema_extra or {}).get("skip")
+}
+_FLOATS = tuple(name for name, field in _PLAIN.items() if field.annotation is float)
+_INTS = tuple(name for name, field in _PLAIN.items() if field.annotation is int)
+_SHOP = tuple(ShopUpgrades.model_fields)
+_CRAFTS = tuple(HepteractCrafts.model_fields)
+
+
+def _alias(name: str) -> str:
+    return SynergismGame.model_fields[name].alias or name
+
+
+# Stored arrays in file order, 8-byte items first so every one of them stays aligned.
+_SEGMENTS = (
+    ("floats", numpy.float64),
+    ("ints", numpy.int64),
+    ("shop", numpy.int64),
+    ("hepts", numpy.float64),
+    ("conversions", numpy.int64),
+    ("platonicUpgrades", numpy.int32),
+    ("usedCorruptions", numpy.int32),
+    ("achievements", numpy.uint8),
+    ("hept_extra", numpy.uint8),
+)
+_MAGIC = b"SYNSAVE1"
+_HEADER = len(_MAGIC) + 8 * (1 + len(_SEGMENTS))
+
+
+def to_arrays(game: SynergismGame) -> Dict[str, numpy.ndarray]:
+    """The save fields of ``game`` as a few flat typed arrays, what the cache stores."""
+    crafts = [getattr(game.hepts, name) for name in _CRAFTS]
+    extra = json.dumps([(h.other_conversions, h.html_string) for h in crafts]).encode()
+    values = {
+        "floats": [getattr(game, name) for name in _FLOATS],
+        "ints": [getattr(game, name) for name in _INTS],
+        "shop": [getattr(game.shop, name) for name in _SHOP],
+        "hepts": [value for h in crafts for value in (h.balance, h.cap, h.base_cap)],
+        "conversions": [h.hepteract_conversion for h in crafts],
+        "platonicUpgrades": game.platonicUpgrades,
+        "usedCorruptions": game.usedCorruptions,
+        "achievements": game.achievements,
+        "hept_extra": numpy.frombuffer(extra, dtype=numpy.uint8),
+    }
+    return {name: numpy.asarray(values[name], dtype=dtype) for name, dtype in _SEGMENTS}
+
+
+def from_arrays(arrays: Dict[str, numpy.ndarray]) -> SynergismGame:
+    """Rebuild what ``to_arrays`` stored. The values were validated before they were stored, so they are trusted."""
+    extra = json.loads(arrays["hept_extra"].tobytes())
+    hepts = zip(arrays["hepts"].reshape(-1, 3).tolist(), arrays["conversions"].tolist(), extra)
+    data = {
+        **{_alias(name): value for name, value in zip(_FLOATS, arrays["floats"].tolist())},
+        **{_alias(name): value for name, value in zip(_INTS, arrays["ints"].tolist())},
+        _alias("shop"): dict(zip(_SHOP, arrays["shop"].tolist())),
+        _alias("hepts"): {
+            name: dict(zip(Hepteract.SAVE_KEYS, (*values, conversion, *rest)))
+            for name, (values, conversion, rest) in zip(_CRAFTS, hepts)
+        },
+        "platonicUpgrades": arrays["platonicUpgrades"].tolist(),
+        "usedCorruptions": arrays["usedCorruptions"].tolist(),
+        "achievements": arrays["achievements"].tobytes(),
+    }
+    return SynergismGame.from_trusted(data)
+
+
+def dump(arrays: Dict[str, numpy.ndarray], validated: bool) -> bytes:
+    """``to_arrays`` output as one blob: magic, the validated flag and segment lengths as int64, then the segments."""
+    header = numpy.array([validated, *(arrays[name].size for name, _ in _SEGMENTS)], dtype=numpy.int64)
+    return b"".join([_MAGIC, header.tobytes(), *(arrays[name].tobytes() for name, _ in _SEGMENTS)])
+
+
+def parse(buffer: bytes) -> Tuple[Dict[str, numpy.ndarray], bool]:
+    """Arrays and validated flag of a ``dump`` blob, as views into ``buffer`` (which may be an mmap)."""
+    if buffer[: len(_MAGIC)] != _MAGIC or len(buffer) < _HEADER:
+        raise ValueError("not a cached save")
+    header = numpy.frombuffer(buffer, dtype=numpy.int64, count=1 + len(_SEGMENTS), offset=len(_MAGIC)).tolist()
+
+    arrays, offset = {}, _HEADER
+    for (name, dtype), size in zip(_SEGMENTS, header[1:]):
+        arrays[name] = numpy.frombuffer(buffer, dtype=dtype, count=size, offset=offset)
+        offset += arrays[name].nbytes
+    return arrays, bool(header[0])
+
+
+class SaveCache:
+    """Decoded saves on disk, one small binary file per save keyed by the hash of the raw file.
+
+    Entries hold the model fields after validation, so a hit skips base64
+    decoding, JSON parsing and pydantic. Entries written by another
+    ``SCHEMA_VERSION`` are never read and are deleted on the next eviction.
+    Past ``max_bytes`` the least recently used entries go first. The total
+    size is tallied on every put, the directory is only scanned when the
+    tally goes over ``max_bytes`` and every ``EVICT_EVERY`` puts, as
+    concurrent processes may miss each other's updates of it.
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_PATH, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._puts = 0
+
+    def _entry(self, save_hash: str) -> Path:
+        return self.path / f"{save_hash}.v{SCHEMA_VERSION}.bin"
+
+    def get(self, save_hash: str, validated: bool = True) -> Optional[SynergismGame]:
+        """The cached game, None on a miss. ``validated`` skips entries that were only trusted."""
+        entry = self._entry(save_hash)
+        try:
+            with open(entry, "rb") as file:
+                arrays, stored_validated = parse(file.read())
+            if validated and not stored_validated:
+                return None
+            game = from_arrays(arrays)
+            # The mtime is the last use, for eviction.
+            os.utime(entry)
+        except (OSError, ValueError):
+            return None
+        return game
+
+    def put(self, save_hash: str, game: SynergismGame, validated: bool = True) -> None:
+        """Store ``game``, evicting if that takes the cache over ``max_bytes``. Raises ``OSError`` if it cannot write."""
+        blob = dump(to_arrays(game), validated)
+        entry = self._entry(save_hash)
+        self.path.mkdir(parents=True, exist_ok=True)
+        try:
+            replaced = entry.stat().st_size
+        except FileNotFoundError:
+            replaced = 0
+
+        # Write to a temp file and rename, batch workers may store the same save at once.
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(blob)
+            # Readable by everyone like the shop-data cache, mkstemp creates 0600.
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, entry)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        self._puts += 1
+        size = self._read_size()
+        if size is None or self._puts % EVICT_EVERY == 0:
+            self.evict()
+        elif size + len(blob) - replaced > self.max_bytes:
+            self.evict()
+        else:
+            self._write_size(size + len(blob) - replaced)
+
+    def _read_size(self) -> Optional[int]:
+        try:
+            return int((self.path / _SIZE_FILE).read_text())
+        except (OSError, ValueError):
+            return None
+
+    def _write_size(self, size: int) -> None:
+        (self.path / _SIZE_FILE).write_text(str(size))
+
+    def evict(self) -> None:
+        """Delete entries of other schema versions, then past ``max_bytes`` the least recently used ones.
+
+        Goes down to ``LOW_WATER`` of ``max_bytes`` and records the total left.
+        """
+        current = f".v{SCHEMA_VERSION}.bin"
+        entries = []
+        for entry in os.scandir(self.path):
+            if not entry.name.endswith(".bin"):
+                continue
+            try:
+                if entry.name.endswith(current):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                else:
+                    os.unlink(entry.path)
+            except FileNotFoundError:
+                pass  # evicted by another process
+
+        size = sum(entry[1] for entry in entries)
+        if size > self.max_bytes:
+            for _, entry_size, entry_path in sorted(entries):
+                if size <= self.max_bytes * LOW_WATER:
+                    break
+                try:
+                    os.unlink(entry_path)
+                except FileNotFoundError:
+                    pass
+                size -= entry_size
+        self._write_size(size)
+
+    def load(self, file_path: Union[str, Path], trusted: bool = False) -> Tuple[SynergismGame, str]:
+        """``SynergismGame`` of a save on disk and the hash of the bytes it came from.
+
+        The file is hashed in one streamed pass and, only on a miss, decoded
+        in a second one and validated (or trusted). A file rewritten in place
+        between the two is read again, so the hash always matches the game. A
+        cache that cannot be written is logged and skipped. The lookup,
+        decoding, validation and write are profiler stages of their own.
+        """
+        while True:
+            with open(file_path, "rb") as file:
+                before = _stamp(file)
+                with stage("cache_lookup"):
+                    save_hash = content_hash(file)
+                    game = self.get(save_hash, validated=not trusted)
+                if game is not None:
+                    return game, save_hash
+
+                file.seek(0)
+                with stage("decode"):
+                    data = decode_save(file)
+                if _stamp(file) == before:
+                    break
+
+        with stage("validate"):
+            game = SynergismGame.from_trusted(data) if trusted else SynergismGame(**data)
+        with stage("cache_write"):
+            try:
+                self.put(save_hash, game, validated=not trusted)
+            except OSError as e:
+                from loguru import logger  # only a failing cache logs, keep it out of startup
+
+                logger.warning(f"Not caching {file_path} in {self.path}: {e}")
+        return game, save_hash
+
+
+def _stamp(file: BinaryIO) -> Tuple[int, int]:
+    stat = os.fstat(file.fileno())
+    return stat.st_size, stat.st_mtime_ns
@@ -0,0 +1,279 @@
+import base64
+import codecs
+import hashlib
+import json
+import re
+from typing import TYPE_CHECKING, Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Type
+
+if TYPE_CHECKING:
+    from pydantic import BaseModel
+
+CHUNK_SIZE = 1 << 20
+
+# A parsed ``--get`` style path, ``"*"`` matching any key or index.
+KeyPath = Tuple[str, ...]
+
+_B64_ALPHABET = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/="
+_B64_JUNK = bytes(set(range(256)) - set(_B64_ALPHABET))
+_B64_WHITESPACE = b" \t\n\r\x0b\x0c"
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_SKIP_RUN = re.compile(r'(?:[^"\[\]{}]+|"[^"\\]*(?:\\.[^"\\]*)*")*')
+_STRING_TAIL = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+_SCALAR_END = re.compile(r"[,\]}\s]")
+
+
+def model_keys(model: "Type[BaseModel]") -> Set[str]:
+    """Top-level save keys a model reads, i.e. its field aliases minus ``skip`` fields."""
+    keys = set()
+    for name, field in model.model_fields.items():
+        extra = field.json_schema_extra if isinstance(field.json_schema_extra, dict) else {}
+        if not extra.get("skip"):
+            keys.add(field.alias or name)
+    return keys
+
+
+def content_hash(file: BinaryIO, chunk_size: int = CHUNK_SIZE) -> str:
+    """sha256 of a base64 save, ignoring the whitespace exports tend to pick up."""
+    digest = hashlib.sha256()
+    while chunk := file.read(chunk_size):
+        digest.update(chunk.translate(None, _B64_WHITESPACE))
+    return digest.hexdigest()
+
+
+def decode_chunks(file: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Base64-decode a file object chunk by chunk, ignoring whitespace like ``b64decode`` does."""
+    rest = b""
+    while chunk := file.read(chunk_size):
+        data = rest + chunk.translate(None, _B64_JUNK)
+        cut = len(data) - len(data) % 4
+        rest = data[cut:]
+        if cut:
+            yield base64.b64decode(data[:cut])
+
+    if rest:
+        yield base64.b64decode(rest)
+
+
+class _JsonStream:
+    """Pull parser over a stream of text chunks, enough to walk one object and skip values."""
+
+    def __init__(self, chunks: Iterable[str]) -> None:
+        self._chunks = iter(chunks)
+        self._decoder = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append the next chunk, dropping what has been consumed. False at end of input."""
+        if self.eof:
+            return False
+
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self.eof = True
+            return False
+
+        self.buf = self.buf[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()  # type: ignore[union-attr]
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                raise ValueError("Unexpected end of save data")
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos}, got {self.buf[self.pos]!r}")
+        self.pos += 1
+
+    def read_value(self) -> Any:
+        if self.peek() not in '"[{':
+            # A number cut at the buffer edge decodes fine but short, buffer up to its end.
+            while _SCALAR_END.search(self.buf, self.pos) is None and self.fill():
+                pass
+
+        while True:
+            try:
+                value, self.pos = self._decoder.raw_decode(self.buf, self.pos)
+                return value
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+
+    def _skip_string(self) -> None:
+        """Skip to after the closing quote, ``pos`` being just past the opening one."""
+        while (match := _STRING_TAIL.match(self.buf, self.pos)) is None:
+            if not self.fill():
+                raise ValueError("Unterminated string in save data")
+        self.pos = match.end()
+
+    def skip_value(self) -> None:
+        char = self.peek()
+        self.pos += 1
+
+        if char == '"':
+            self._skip_string()
+            return
+
+        if char not in "[{":
+            while (match := _SCALAR_END.search(self.buf, self.pos)) is None:
+                if not self.fill():
+                    self.pos = len(self.buf)
+                    return
+            self.pos = match.start()
+            return
+
+        depth = 1
+        while depth:
+            # Jump over everything that is not a bracket, whole strings included.
+            self.pos = _SKIP_RUN.match(self.buf, self.pos).end()  # type: ignore[union-attr]
+            if self.pos == len(self.buf) or self.buf[self.pos] == '"':
+                # Ran out of buffer, possibly in the middle of a string.
+                if not self.fill():
+                    raise ValueError("Unexpected end of save data")
+                continue
+
+            depth += 1 if self.buf[self.pos] in "[{" else -1
+            self.pos += 1
+
+    def read_object(self, keys: Optional[Set[str]]) -> Dict[str, Any]:
+        """Read the top-level object, decoding only ``keys`` (all if None) and stopping once all are seen."""
+        result: Dict[str, Any] = {}
+        remaining = set(keys) if keys is not None else None
+
+        self.expect("{")
+        if self.peek() == "}":
+            return result
+
+        while True:
+            key = self.read_value()
+            self.expect(":")
+
+            if remaining is None or key in remaining:
+                result[key] = self.read_value()
+                if remaining is not None:
+                    remaining.discard(key)
+                    if not remaining:
+                        return result
+            else:
+                self.skip_value()
+
+            if self.peek() == "}":
+                return result
+            self.expect(",")
+
+    def select(self, patterns: List[KeyPath], prefix: KeyPath, found: List[Tuple[KeyPath, Any]], may_stop: bool = True) -> None:
+        """Append ``(path, value)`` for every pattern matching the value at the cursor.
+
+        Only matched values are decoded, everything else is skipped. With
+        ``may_stop`` nothing after this value is needed, so once every exact
+        key has been seen the rest of the input is left unread.
+        """
+        if any(not pattern for pattern in patterns):
+            value = self.read_value()
+            for pattern in patterns:
+                found.extend(match_path(value, pattern, prefix))
+            return
+
+        char = self.peek()
+        if char not in "[{":
+            self.skip_value()
+            return
+
+        close = "}" if char == "{" else "]"
+        wanted = None if any(pattern[0] == "*" for pattern in patterns) else {pattern[0] for pattern in patterns}
+
+        self.pos += 1
+        if self.peek() == close:
+            self.pos += 1
+            return
+
+        index = 0
+        while True:
+            if char == "{":
+                key = self.read_value()
+                self.expect(":")
+            else:
+                key = str(index)
+                index += 1
+
+            matching = [pattern[1:] for pattern in patterns if pattern[0] in ("*", key)]
+            if matching:
+                last = wanted is not None and wanted == {key}
+                self.select(matching, prefix + (key,), found, may_stop and last)
+                if last and may_stop:
+                    return
+                if wanted is not None:
+                    wanted.discard(key)
+            else:
+                self.skip_value()
+
+            if self.peek() == close:
+                self.pos += 1
+                return
+            self.expect(",")
+
+
+def parse_path(path: str) -> KeyPath:
+    """``"hepteractCrafts.chronos.BAL"`` -> ``("hepteractCrafts", "chronos", "BAL")``, empty for the whole save."""
+    return tuple(part for part in path.split(".") if part)
+
+
+def match_path(value: Any, pattern: KeyPath, prefix: KeyPath = ()) -> Iterator[Tuple[KeyPath, Any]]:
+    """``(path, value)`` pairs matching ``pattern`` inside an already decoded value."""
+    if not pattern:
+        yield prefix, value
+        return
+
+    head, rest = pattern[0], pattern[1:]
+    if isinstance(value, dict):
+        items: Iterable[Tuple[str, Any]] = value.items()
+    elif isinstance(value, list):
+        items = ((str(i), item) for i, item in enumerate(value))
+    else:
+        return
+
+    for key, item in items:
+        if head in ("*", key):
+            yield from match_path(item, rest, prefix + (key,))
+
+
+def text_chunks(file: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Decoded save as UTF-8 text chunks."""
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    for chunk in decode_chunks(file, chunk_size):
+        yield utf8.decode(chunk)
+    yield utf8.decode(b"", final=True)
+
+
+def decode_save(file: BinaryIO, keys: Optional[Set[str]] = None, chunk_size: int = CHUNK_SIZE) -> Dict[str, Any]:
+    """Decode a base64 save from an open binary file, keeping only the top-level ``keys``.
+
+    Defaults to the keys ``SynergismGame`` declares, everything else in the
+    save is skipped without being materialized.
+    """
+    if keys is None:
+        from save_layout import SynergismGame
+
+        keys = model_keys(SynergismGame)
+
+    return _JsonStream(text_chunks(file, chunk_size)).read_object(keys)
+
+
+def query_save(file: BinaryIO, paths: Iterable[str], chunk_size: int = CHUNK_SIZE) -> List[Tuple[KeyPath, Any]]:
+    """Values at ``paths`` (see ``parse_path``) in document order, decoding no more of the save than needed."""
+    found: List[Tuple[KeyPath, Any]] = []
+    _JsonStream(text_chunks(file, chunk_size)).select([parse_path(path) for path in paths], (), found)
+    return found
+
+
+def load_save(file_path, keys: Optional[Set[str]] = None, chunk_size: int = CHUNK_SIZE) -> Dict[str, Any]:
+    """``decode_save`` for a save on disk."""
+    with open(file_path, "rb") as file:
+        return decode_save(file, keys, chunk_size)
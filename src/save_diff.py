@@ -0,0 +1,166 @@
+import argparse
+import json
+import math
+import sys
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from save_layout import Hepteract, HepteractCrafts, ShopUpgrades, SynergismGame, derived
+
+# Plain numeric fields read from the save, compared one to one.
+SCALARS = tuple(
+    name
+    for name, field in SynergismGame.model_fields.items()
+    if field.annotation in (int, float) and not (field.json_schema_extra or {}).get("skip")
+)
+# Per-index fields, the shorter one padded with zeros.
+ARRAYS = ("platonicUpgrades", "usedCorruptions", "achievements")
+STATS = (
+    "shop_benefit_hept",
+    "shop_benefit_accel",
+    *(name for name, value in vars(SynergismGame).items() if isinstance(value, derived)),
+)
+
+
+def crafted(game: SynergismGame, per_craft: Callable[[Hepteract], float]) -> float:
+    """What went into the crafts so far, ``per_craft`` of it per craft.
+
+    Reaching a cap took every intermediate cap (expansions empty the balance),
+    which sums to ``cap - base_cap``, plus the current balance.
+    """
+    return sum(
+        (hept.cap - hept.base_cap + hept.balance) * per_craft(hept)
+        for hept in (getattr(game.hepts, name) for name in HepteractCrafts.model_fields)
+    )
+
+
+# Rate name -> what it is the change per hour of. Hepts and quarks count what
+# went into crafts as earned too, or crafting would show up as a lower rate.
+RATES: Dict[str, Callable[[SynergismGame], float]] = {
+    "hepts": lambda game: game.wowAbyssals + crafted(game, attrgetter("hepteract_conversion")),
+    "quarks": lambda game: game.total_quarks + crafted(game, attrgetter("quarks_per_craft")),
+    "orbs": attrgetter("overfluxOrbs"),
+    "powder": attrgetter("overfluxPowder"),
+}
+
+MS_PER_HOUR = 3_600_000
+
+
+class FieldChange(BaseModel):
+    path: str
+    before: float
+    after: float
+    delta: float
+
+
+class SaveDiff(BaseModel):
+    hours: float
+    fields: List[FieldChange]
+    stats: List[FieldChange]
+    rates: Dict[str, Optional[float]]
+
+
+def raw_fields(game: SynergismGame) -> Iterator[Tuple[str, float]]:
+    """``(path, value)`` of every scalar field, shop level and hepteract balance/cap, in a fixed order."""
+    for name in SCALARS:
+        yield name, getattr(game, name)
+    for name in ShopUpgrades.model_fields:
+        yield f"shop.{name}", getattr(game.shop, name)
+    for name in HepteractCrafts.model_fields:
+        hept = getattr(game.hepts, name)
+        yield f"hepts.{name}.balance", hept.balance
+        yield f"hepts.{name}.cap", hept.cap
+
+
+def _same(before: float, after: float) -> bool:
+    return before == after or (math.isnan(before) and math.isnan(after))
+
+
+def _changes(pairs: Iterator[Tuple[str, Any, Any]], changed_only: bool) -> List[FieldChange]:
+    return [
+        FieldChange(path=path, before=before, after=after, delta=after - before)
+        for path, before, after in pairs
+        if not (changed_only and _same(before, after))
+    ]
+
+
+def _array_pairs(old: SynergismGame, new: SynergismGame) -> Iterator[Tuple[str, int, int]]:
+    for name in ARRAYS:
+        before, after = getattr(old, name), getattr(new, name)
+        for i in range(max(len(before), len(after))):
+            yield f"{name}.{i}", before[i] if i < len(before) else 0, after[i] if i < len(after) else 0
+
+
+def diff_games(old: SynergismGame, new: SynergismGame, changed_only: bool = True) -> SaveDiff:
+    """Field and derived stat changes from ``old`` to ``new``, and per-hour rates over the ``saveTime`` gap.
+
+    Both games need config and shop benefits set (see ``synergisa.build_game``).
+    Stats that are not plain numbers, like ``powder_solution``, are left out.
+    """
+    fields = [(path, before, after) for (path, before), (_, after) in zip(raw_fields(old), raw_fields(new))]
+    fields.extend(_array_pairs(old, new))
+
+    stats = []
+    for name in STATS:
+        before, after = getattr(old, name), getattr(new, name)
+        if isinstance(before, (int, float)):
+            stats.append((name, before, after))
+
+    hours = (new.saveTime - old.saveTime) / MS_PER_HOUR
+    rates = {
+        name: (value(new) - value(old)) / hours if hours else None for name, value in RATES.items()
+    }
+
+    return SaveDiff(hours=hours, fields=_changes(iter(fields), changed_only), stats=_changes(iter(stats), changed_only), rates=rates)
+
+
+def main() -> None:
+    from synergisa import load_config, load_game, load_shop_data
+
+    parser = argparse.ArgumentParser(description="Compare two saves: raw fields, derived stats and rates per hour.")
+    parser.add_argument("old", help="path to the earlier base64-encoded save")
+    parser.add_argument("new", help="path to the later base64-encoded save")
+    parser.add_argument("--all", action="store_true", help="list unchanged fields and stats too")
+    parser.add_argument("--json", action="store_true", help="print the diff as JSON")
+    parser.add_argument("--validate", action="store_true", help="check every field instead of trusting the saves")
+    args = parser.parse_args()
+
+    conf, sd = load_config(), load_shop_data()
+    old, _ = load_game(args.old, conf, sd, trusted=not args.validate)
+    new, _ = load_game(args.new, conf, sd, trusted=not args.validate)
+    diff = diff_games(old, new, changed_only=not args.all)
+
+    if args.json:
+        json.dump(diff.model_dump(), sys.stdout)
+        sys.stdout.write("\n")
+        return
+
+    from rich.console import Console
+    from rich.table import Table
+    from rich import box
+
+    console = Console()
+    for title, changes in (("Fields", diff.fields), ("Derived stats", diff.stats)):
+        table = Table(box=box.MINIMAL_DOUBLE_HEAD, title=title, title_style="bold")
+        table.add_column("Name")
+        table.add_column("Before", justify="right")
+        table.add_column("After", justify="right")
+        table.add_column("Delta", justify="right")
+        for change in changes:
+            style = "green" if change.delta > 0 else "red" if change.delta < 0 else ""
+            table.add_row(change.path, f"{change.before:,.6g}", f"{change.after:,.6g}", f"{change.delta:+,.6g}", style=style)
+        console.print(table)
+
+    table = Table(box=box.MINIMAL_DOUBLE_HEAD, title=f"Rates over {diff.hours:,.2f} hours", title_style="bold")
+    table.add_column("Name")
+    table.add_column("Per hour", justify="right")
+    table.add_column("Per day", justify="right")
+    for name, rate in diff.rates.items():
+        table.add_row(name, "-" if rate is None else f"{rate:,.6g}", "-" if rate is None else f"{rate * 24:,.6g}")
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+from functools import cached_property
+from typing import Dict, Sequence
+
+import numpy
+
+from powder_solver import PowderSolution, diminishing_exponent, solve_fixed_point
+from save_layout import SynergismGame
+
+# Scalar inputs of the derived stats, one float64 array per column.
+COLUMNS = (
+    "challenge15Exponent",
+    "overfluxPowder",
+    "overfluxOrbs",
+    "wowAbyssals",
+    "ascensionCount",
+    "ascensionCounter",
+    "saveTime",
+    "chronometer",
+    "chronometer2",
+    "chronometer3",
+    "powderEX",
+    "calculator3",
+    "corruptionSum",
+    "chronosBalance",
+    "chronosCap",
+    "chronosBaseCap",
+    "chronosConversion",
+    "hps",
+    "addUsesPerDay",
+    "shop_benefit_hept",
+)
+
+
+def _pad(rows: Sequence[Sequence[int]]) -> numpy.ndarray:
+    width = max((len(row) for row in rows), default=0)
+    matrix = numpy.zeros((len(rows), width), dtype=numpy.float64)
+    for i, row in enumerate(rows):
+        matrix[i, : len(row)] = row
+    return matrix
+
+
+class SaveFrame:
+    """Columnar view of many saves, computing the ``SynergismGame`` derived stats with NumPy.
+
+    Every property mirrors the scalar property of the same name on
+    ``SynergismGame`` and returns one value per save.
+    """
+
+    def __init__(self, platonicUpgrades: numpy.ndarray, achievements: numpy.ndarray, **columns: numpy.ndarray) -> None:
+        missing = set(COLUMNS) - columns.keys()
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(sorted(missing))}")
+
+        self.columns: Dict[str, numpy.ndarray] = {name: numpy.asarray(columns[name], dtype=numpy.float64) for name in COLUMNS}
+        self.platonicUpgrades = numpy.asarray(platonicUpgrades, dtype=numpy.float64)
+        self.achievements = numpy.asarray(achievements, dtype=numpy.float64)
+
+    def __getattr__(self, name: str) -> numpy.ndarray:
+        try:
+            return self.__dict__["columns"][name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __len__(self) -> int:
+        return numpy.broadcast(*self.columns.values()).size
+
+    def replace(self, **columns) -> "SaveFrame":
+        """New frame with some columns swapped out. Columns broadcast, so a one-save frame can be swept over a grid."""
+        return SaveFrame(self.platonicUpgrades, self.achievements, **{**self.columns, **columns})
+
+    @classmethod
+    def from_games(cls, games: Sequence[SynergismGame]) -> "SaveFrame":
+        """Collect the columns from games that already have config and shop benefits set."""
+        columns: Dict[str, list] = {name: [] for name in COLUMNS}
+
+        for game in games:
+            if game.config is None:
+                raise ValueError("Config not set")
+
+            columns["challenge15Exponent"].append(game.challenge15Exponent)
+            columns["overfluxPowder"].append(game.overfluxPowder)
+            columns["overfluxOrbs"].append(game.overfluxOrbs)
+            columns["wowAbyssals"].append(game.wowAbyssals)
+            columns["ascensionCount"].append(game.ascensionCount)
+            columns["ascensionCounter"].append(game.ascensionCounter)
+            columns["saveTime"].append(game.saveTime)
+            columns["chronometer"].append(game.shop.chronometer)
+            columns["chronometer2"].append(game.shop.chronometer2)
+            columns["chronometer3"].append(game.shop.chronometer3)
+            columns["powderEX"].append(game.shop.powderEX)
+            columns["calculator3"].append(game.shop.calculator3)
+            columns["corruptionSum"].append(sum(game.usedCorruptions))
+            columns["chronosBalance"].append(game.hepts.chronos.balance)
+            columns["chronosCap"].append(game.hepts.chronos.cap)
+            columns["chronosBaseCap"].append(game.hepts.chronos.base_cap)
+            columns["chronosConversion"].append(game.hepts.chronos.hepteract_conversion)
+            columns["hps"].append(game.config.hps)
+            columns["addUsesPerDay"].append(game.config.addUsesPerDay)
+            columns["shop_benefit_hept"].append(game.shop_benefit_hept)
+
+        return cls(
+            platonicUpgrades=_pad([game.platonicUpgrades for game in games]),
+            achievements=_pad([game.achievements for game in games]),
+            **{name: numpy.array(values, dtype=numpy.float64) for name, values in columns.items()},
+        )
+
+    def get_plat_upgrade(self, row: int, column: int) -> numpy.ndarray:
+        idx = (row - 1) * 5 + column
+        if idx >= self.platonicUpgrades.shape[1]:
+            return numpy.zeros(len(self))
+        return self.platonicUpgrades[:, idx]
+
+    def get_achievement(self, id: int) -> numpy.ndarray:
+        if id >= self.achievements.shape[1]:
+            return numpy.zeros(len(self))
+        return self.achievements[:, id]
+
+    @cached_property
+    def u44(self) -> numpy.ndarray:
+        return self.get_plat_upgrade(4, 4)
+
+    @cached_property
+    def chronos_tier(self) -> numpy.ndarray:
+        return numpy.trunc(numpy.log2(self.chronosCap / self.chronosBaseCap) + 1)
+
+    @cached_property
+    def chronos_to_level(self) -> numpy.ndarray:
+        level_cost = numpy.trunc(self.chronosCap * self.chronosConversion)
+        missing = level_cost - numpy.trunc(self.chronosBalance * self.chronosConversion)
+        return numpy.where(missing == 0, numpy.trunc(self.chronosCap * 2 * self.chronosConversion), missing)
+
+    @cached_property
+    def chronos_percent(self) -> numpy.ndarray:
+        return (1000 * ((self.chronosBalance / 1000) ** ((1 / 6) + ((1 / 750) * self.u44)))) * (6 / 100)
+
+    @cached_property
+    def chronos_percent_next(self) -> numpy.ndarray:
+        return (1000 * ((2**self.chronos_tier) ** ((1 / 6) + ((1 / 750) * self.u44)))) * (6 / 100)
+
+    @cached_property
+    def chronos_increase(self) -> numpy.ndarray:
+        return ((self.chronos_percent_next + 100) / (self.chronos_percent + 100) - 1) * 100
+
+    @cached_property
+    def multiplier(self) -> numpy.ndarray:
+        c15 = self.challenge15Exponent
+        c15boost = numpy.where(c15 > 1.5e18, 1 + 0.05 + 2 * numpy.log2(numpy.maximum(c15, 1.5e18) / 1.5e18) / 100, 1)
+        shopUpgrades = (
+            (1 + self.chronometer / 100) * (1 + 0.5 * self.chronometer2 / 100) * (1 + 1.5 * self.chronometer3 / 100)
+        )
+        omegaBoost = 1 + 0.002 * self.corruptionSum * self.get_plat_upgrade(3, 5)
+
+        balance = self.chronosBalance
+        effective = numpy.where(balance < 1000, balance, 1000 * (balance / 1000) ** (1 / 6 + 1 / 750 * self.u44))
+        chronosBoost = 1 + 0.6 / 1000 * effective
+
+        ascensions = numpy.minimum(0.1, 1 / 100 * numpy.log10(self.ascensionCount + 1))
+        achievementBoost = (1 + ascensions * self.get_achievement(262)) * (1 + ascensions * self.get_achievement(263))
+
+        return c15boost * shopUpgrades * omegaBoost * chronosBoost * achievementBoost
+
+    def current_ascension_timer(self, now: float) -> numpy.ndarray:
+        """Ascension timer at ``now`` (milliseconds since the epoch)."""
+        return ((now - self.saveTime) / 1000) * self.multiplier + self.ascensionCounter
+
+    def hepts_after_ascension(self, now: float) -> numpy.ndarray:
+        return numpy.floor(self.wowAbyssals + self.current_ascension_timer(now) * self.hps * self.shop_benefit_hept)
+
+    @cached_property
+    def hept_per_day(self) -> numpy.ndarray:
+        return self.shop_benefit_hept * self.hps * self.multiplier * (86400 + self.addUsesPerDay * 60 * self.calculator3)
+
+    @cached_property
+    def orb_to_powder(self) -> numpy.ndarray:
+        denominator = (
+            (1 / 100)
+            * (1 + 1 / 50 * numpy.log2(self.challenge15Exponent / (7000000000000000 / 32)))
+            * (1 + self.powderEX / 50)
+            * (1 + self.get_achievement(256) / 20)
+            * (1 + self.get_achievement(257) / 20)
+            * (1 + 0.01 * self.get_plat_upgrade(4, 1))
+        )
+        return 1 / denominator
+
+    @cached_property
+    def hepts_small_inc(self) -> numpy.ndarray:
+        return self.chronos_to_level * 0.0000001 / self.orb_to_powder / 250000
+
+    @cached_property
+    def p44_noname(self) -> numpy.ndarray:
+        return (1 + 0.0000001 / 2) ** ((1 / 6) + ((1 / 750) * self.u44))
+
+    @cached_property
+    def powder_tomorrow(self) -> numpy.ndarray:
+        return self.overfluxPowder + self.overfluxOrbs / self.orb_to_powder
+
+    @cached_property
+    def cube_from_powder(self) -> numpy.ndarray:
+        powder = self.powder_tomorrow
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            large = 1 + 1 / 16 * (numpy.log10(powder) ** 2) - 1
+        return numpy.where(powder > 10000, large, 1 + 1 / 10000 * powder - 1)
+
+    @cached_property
+    def powder_solution(self) -> PowderSolution:
+        return solve_fixed_point(self.hepts_small_inc, diminishing_exponent(self.u44), self.overfluxPowder)
+
+    @cached_property
+    def powder_goal(self) -> numpy.ndarray:
+        """All three branches of ``SynergismGame.powder_goal``, selected per save."""
+        inc = self.hepts_small_inc
+        exponent = self.p44_noname - 1
+
+        with numpy.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            converged = self.powder_solution.root / (self.cube_from_powder + 1) * self.cube_from_powder
+
+            grows = self.chronos_increase + 1 ** (1 / self.chronos_to_level) - 1 * 1000 * 250000 * self.orb_to_powder > 1
+            next_day = self.overfluxPowder + numpy.floor(self.hept_per_day / 24 / 250000) / self.orb_to_powder
+
+        small = numpy.where(grows, next_day, 10000)
+        return numpy.where(inc / (self.overfluxPowder**exponent - 1) < 10000, small, converged)
+
+    @cached_property
+    def orbs_to_powder_goal(self) -> numpy.ndarray:
+        return (self.powder_goal - self.overfluxPowder) * self.orb_to_powder - self.overfluxOrbs
+
+
+def powder_goal_surface(game: SynergismGame, overfluxPowder, overfluxOrbs, challenge15Exponent) -> numpy.ndarray:
+    """Powder goal of ``game`` over the grid of the given powder, orb and C15 exponent values.
+
+    The result has shape ``(len(overfluxPowder), len(overfluxOrbs), len(challenge15Exponent))``.
+    """
+    powder, orbs, c15 = numpy.meshgrid(overfluxPowder, overfluxOrbs, challenge15Exponent, indexing="ij")
+    frame = SaveFrame.from_games([game]).replace(overfluxPowder=powder.ravel(), overfluxOrbs=orbs.ravel(), challenge15Exponent=c15.ravel())
+    return frame.powder_goal.reshape(powder.shape)
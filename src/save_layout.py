@@ -1,24 +1,161 @@
-from functools import cached_property, reduce
-import itertools
+from array import array
+from contextlib import contextmanager
+import copy
+from functools import cached_property, lru_cache
 import math
+from operator import itemgetter
 import time
 
-from typing import Dict, List, Optional
-import pandas
+from typing import Annotated, Any, ClassVar, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+import numpy
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, PlainSerializer, PlainValidator
 
+from powder_solver import PowderSolution, diminishing_exponent_scalar, solve_fixed_point_scalar
+from shop_data import ShopData
 
-class Hepteract(BaseModel, alias_generator=lambda s: s.upper()):
-    """Single Hepteract"""
+# Bump whenever the fields of SynergismGame or its nested models change, or how
+# they are read from a save: caches of decoded saves (see save_cache) are keyed on it.
+SCHEMA_VERSION = 1
 
-    balance: float = Field(alias="BAL")
+
+class derived(cached_property):
+    """A cached derived stat that declares the inputs it reads.
+
+    Inputs are field paths such as ``"hepts.chronos.balance"`` or
+    ``"config.hps"``, or the names of other derived stats. Models using it
+    invalidate a cached value whenever one of its inputs, direct or
+    transitive, is changed (see ``SynergismGame.update``).
+    """
+
+    def __init__(self, *inputs: str) -> None:
+        self.inputs: Tuple[str, ...] = inputs
+
+    def __call__(self, func):
+        super().__init__(func)
+        return self
+
+
+def _replaced(obj: Any, path: str, value: Any) -> Any:
+    """Shallow copy of ``obj`` with ``path`` set to ``value``, copying every object on the way."""
+    head, _, rest = path.partition(".")
+
+    if isinstance(obj, (list, array)):
+        replaced = obj[:]
+        idx = int(head)
+        replaced[idx] = _replaced(obj[idx], rest, value) if rest else value
+        return replaced
+
+    replaced = copy.copy(obj)
+    setattr(replaced, head, _replaced(getattr(obj, head), rest, value) if rest else value)
+    return replaced
+
+
+def _to_array(typecode: str, value: Iterable[int]) -> array:
+    # bytes() converts a list of small ints several times faster than array("B", ...) does
+    return array(typecode, bytes(value)) if typecode == "B" else array(typecode, value)
+
+
+def _compact(typecode: str) -> PlainValidator:
+    """Validator storing a list of small ints as an ``array`` of ``typecode``."""
+
+    def validate(value: Iterable[int]) -> array:
+        if isinstance(value, array) and value.typecode == typecode:
+            return value
+        try:
+            return _to_array(typecode, value)
+        except (TypeError, ValueError, OverflowError) as e:
+            raise ValueError(f"expected a list of integers fitting array('{typecode}'): {e}") from e
+
+    return PlainValidator(validate)
+
+
+def _construct(cls: type, values: Dict[str, Any]) -> Any:
+    """What ``cls.model_construct(**values)`` ends up doing, without its per-field Python loop.
+
+    ``values`` must hold every field, defaults included.
+    """
+    model = cls.__new__(cls)
+    object.__setattr__(model, "__dict__", values)
+    object.__setattr__(model, "__pydantic_fields_set__", set(values))
+    object.__setattr__(model, "__pydantic_extra__", None)
+    object.__setattr__(model, "__pydantic_private__", None)
+    return model
+
+
+# One byte per achievement (0/1), four per platonic upgrade or corruption level.
+ByteArray = Annotated[array, _compact("B"), PlainSerializer(list)]
+IntArray = Annotated[array, _compact("i"), PlainSerializer(list)]
+
+
+class Hepteract:
+    """Single Hepteract, a slotted struct read from the save's ``BAL``/``CAP``/... keys."""
+
+    __slots__ = ("balance", "cap", "base_cap", "hepteract_conversion", "other_conversions", "html_string")
+    SAVE_KEYS = ("BAL", "CAP", "BASE_CAP", "HEPTERACT_CONVERSION", "OTHER_CONVERSIONS", "HTML_STRING")
+
+    balance: float
     cap: float
     base_cap: float
     hepteract_conversion: int
     other_conversions: Dict[str, float]
     html_string: str
-    
+
+    def __init__(
+        self,
+        balance: float,
+        cap: float,
+        base_cap: float,
+        hepteract_conversion: int,
+        other_conversions: Dict[str, float],
+        html_string: str,
+    ) -> None:
+        self.balance = balance
+        self.cap = cap
+        self.base_cap = base_cap
+        self.hepteract_conversion = hepteract_conversion
+        self.other_conversions = other_conversions
+        self.html_string = html_string
+
+    @classmethod
+    def from_save(cls, data: Dict[str, Any], trusted: bool = False) -> "Hepteract":
+        """Build from the save dict. Untrusted values are type checked, trusted ones taken as they are."""
+        if trusted:
+            return cls(*_HEPTERACT_KEYS(data))
+
+        try:
+            conversion = float(data["HEPTERACT_CONVERSION"])
+            if not conversion.is_integer():
+                raise ValueError(f"HEPTERACT_CONVERSION {conversion} is not an integer")
+            return cls(
+                float(data["BAL"]),
+                float(data["CAP"]),
+                float(data["BASE_CAP"]),
+                int(conversion),
+                {str(k): float(v) for k, v in data["OTHER_CONVERSIONS"].items()},
+                str(data["HTML_STRING"]),
+            )
+        except (KeyError, TypeError, AttributeError) as e:
+            raise ValueError(f"invalid hepteract: {e!r}") from e
+
+    @classmethod
+    def validate(cls, value: Any) -> "Hepteract":
+        return value if isinstance(value, cls) else cls.from_save(value)
+
+    def to_save(self) -> Dict[str, Any]:
+        return {key: getattr(self, name) for key, name in zip(self.SAVE_KEYS, self.__slots__)}
+
+    def __repr__(self) -> str:
+        return f"Hepteract({', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Hepteract):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __copy__(self) -> "Hepteract":
+        return Hepteract(*(getattr(self, name) for name in self.__slots__))
+
     @property
     def tier(self) -> int:
         """Return the tier of the hepteract."""
@@ -41,15 +178,32 @@ class Hepteract(BaseModel, alias_generator=lambda s: s.upper()):
 
         return self.level_cost - int(self.balance * self.hepteract_conversion)
 
-    def _total_cost_counter(self, tier: int) -> int:
-        if tier == 1:
-            return self.level_cost
+    @property
+    def total_cost(self) -> int:
+        return self.tier * self.level_cost
+
+    @property
+    def quarks_per_craft(self) -> float:
+        return self.other_conversions["worlds"] if self.html_string == "quark" else 0
+
+    def cap_after(self, doublings: int) -> float:
+        return self.cap * 2**doublings
 
-        return self._total_cost_counter(tier - 1) + self.level_cost
+    def crafts_to_cap(self, cap: float) -> float:
+        """Crafts needed to fill up to ``cap``, expanding on the way.
 
-    @cached_property
-    def total_cost(self) -> int:
-        return self._total_cost_counter(self.tier)
+        Each expansion needs a full balance and empties it, so that is the
+        current gap plus every intermediate cap: ``2 * cap - self.cap - balance``.
+        """
+        return 2 * cap - self.cap - self.balance
+
+    def cost_to_cap(self, cap: float) -> int:
+        """Hepteracts needed to fill up to ``cap``."""
+        return int(self.crafts_to_cap(cap) * self.hepteract_conversion)
+
+    def quark_cost_to_cap(self, cap: float) -> int:
+        """Quarks needed to fill up to ``cap``, only the quark hepteract costs any."""
+        return math.ceil(self.crafts_to_cap(cap) * self.quarks_per_craft)
 
     def effective_boost(self, limit: float, dr: float, boost: float) -> float:
         if self.balance < limit:
@@ -62,17 +216,22 @@ class Hepteract(BaseModel, alias_generator=lambda s: s.upper()):
         return math.floor(hepts / self.hepteract_conversion)
 
 
+_HEPTERACT_KEYS = itemgetter(*Hepteract.SAVE_KEYS)
+
+HepteractField = Annotated[Hepteract, PlainValidator(Hepteract.validate), PlainSerializer(Hepteract.to_save)]
+
+
 class HepteractCrafts(BaseModel):
     """Class for hepteract types"""
 
-    chronos: Hepteract
-    hyperrealism: Hepteract
-    quark: Hepteract
-    challenge: Hepteract
-    abyss: Hepteract
-    accelerator: Hepteract
-    acceleratorBoost: Hepteract
-    multiplier: Hepteract
+    chronos: HepteractField
+    hyperrealism: HepteractField
+    quark: HepteractField
+    challenge: HepteractField
+    abyss: HepteractField
+    accelerator: HepteractField
+    acceleratorBoost: HepteractField
+    multiplier: HepteractField
 
 
 class ShopUpgrades(BaseModel):
@@ -149,10 +308,35 @@ class ShopUpgrades(BaseModel):
 class QuarkCost(BaseModel):
     base: int
     inc: int
+    maxLevel: Optional[int] = None
 
     def quark_cost(self, level: int) -> int:
+        """Quarks spent on all levels up to ``level``."""
         return math.floor(((self.base + self.inc * level) * level) / 2)
 
+    def levels_for(self, level: int, quarks: int) -> int:
+        """Highest level reachable from ``level`` with ``quarks``, at most ``maxLevel``, solved in closed form."""
+        if not self.base and not self.inc:
+            # Free, every level is reachable but only a capped item has a highest one.
+            return max(level, self.maxLevel) if self.maxLevel is not None else level
+
+        budget = self.quark_cost(level) + quarks
+        if self.inc:
+            # quark_cost(x) <= budget  <=>  inc * x**2 + base * x < 2 * (budget + 1)
+            target = int((math.sqrt(self.base**2 + 8 * self.inc * (budget + 1)) - self.base) / (2 * self.inc))
+        else:
+            target = (2 * budget + 1) // self.base
+
+        # The float root can be one off either way for huge budgets.
+        while self.quark_cost(target + 1) <= budget:
+            target += 1
+        while target > level and self.quark_cost(target) > budget:
+            target -= 1
+
+        if self.maxLevel is not None:
+            target = min(target, self.maxLevel)
+        return max(target, level)
+
 
 class ShopQuarkCosts(BaseModel):
     seasonPass: QuarkCost
@@ -177,12 +361,28 @@ class ShopBuys:
     wowY: int
     wowCost: int
 
-    def __init__(self, sd: pandas.DataFrame, quarks: int) -> None:
-        wow_pass_idx: int = (sd["WoW Passes"][sd["WoW Passes", "Cost"] - quarks < 0]).idxmax()["Cost"]  # type: ignore[index, assignment]
-        accel_idx: int = (sd["Acceleration"][sd["Acceleration", "Cost"] - quarks < 0]).idxmax()["Cost"]  # type: ignore[index, assignment]
+    def __init__(self, sd: ShopData, quarks: int) -> None:
+        self.wow3, self.wowY, self.wowCost = [int(x) for x in sd.best_wow(quarks)]
+        self.accel1, self.accel2, self.accelCost = [int(x) for x in sd.best_accel(quarks)]
+
+    @staticmethod
+    def batch(sd: ShopData, quarks: numpy.ndarray) -> Dict[str, numpy.ndarray]:
+        """Best affordable tiers for an array of quark totals, keyed like the attributes."""
+        wow = sd.best_wow(quarks)
+        accel = sd.best_accel(quarks)
+        return {
+            "accel1": accel[..., 0],
+            "accel2": accel[..., 1],
+            "accelCost": accel[..., 2],
+            "wow3": wow[..., 0],
+            "wowY": wow[..., 1],
+            "wowCost": wow[..., 2],
+        }
 
-        self.wow3, self.wowY, self.wowCost = [int(x) for x in sd["WoW Passes"].iloc[wow_pass_idx].tolist()]
-        self.accel1, self.accel2, self.accelCost = [int(x) for x in sd["Acceleration"].iloc[accel_idx].tolist()]
+
+def shop_benefit(first, second):
+    """Boost from a pair of shop upgrades worth 1% and 0.5% per level (Accel 1/2, WoW V.3/V.Y). Works on arrays too."""
+    return 1 + 0.01 * first + second * 0.005 + 0.01 * first * second * 0.005
 
 
 class SynergismConfig(BaseModel):
@@ -198,7 +398,16 @@ class SynergismConfig(BaseModel):
 
 
 class SynergismGame(BaseModel):
-    """A Synergise savegame. All ints are floats due to scinetific notation."""
+    """A Synergise savegame. All ints are floats due to scinetific notation.
+
+    Derived stats are ``derived`` nodes: they are cached, and assigning a field
+    or calling ``update`` drops exactly the cached stats downstream of it.
+    """
+
+    model_config = ConfigDict(ignored_types=(derived,))
+
+    # input path -> names of derived stats depending on it, filled in below the class
+    _dependents: ClassVar[Dict[str, FrozenSet[str]]] = {}
 
     wowCubes: float
     wowTesseracts: float
@@ -212,9 +421,9 @@ class SynergismGame(BaseModel):
     overfluxOrbs: float
     shop: ShopUpgrades = Field(alias="shopUpgrades")
     hepts: HepteractCrafts = Field(alias="hepteractCrafts")
-    platonicUpgrades: List[int]
-    usedCorruptions: List[int]
-    achievements: List[int]
+    platonicUpgrades: IntArray
+    usedCorruptions: IntArray
+    achievements: ByteArray
     ascensionCount: int
     ascensionCounter: float
     saveTime: int = Field(alias="offlinetick")
@@ -224,15 +433,97 @@ class SynergismGame(BaseModel):
     shop_benefit_hept: float = Field(skip=True, required=False, default=0)
     shop_benefit_accel: float = Field(skip=True, required=False, default=0)
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        self.invalidate(name)
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _affected(cls, path: str) -> FrozenSet[str]:
+        """Derived stats to drop when ``path`` changes: inputs at, above or below it."""
+        affected: set = set()
+        for source, dependents in cls._dependents.items():
+            if source == path or source.startswith(path + ".") or path.startswith(source + "."):
+                affected |= dependents
+        return frozenset(affected)
+
+    def invalidate(self, path: str) -> None:
+        for name in self._affected(path):
+            self.__dict__.pop(name, None)
+
+    def get_path(self, path: str) -> Any:
+        value: Any = self
+        for part in path.split("."):
+            value = value[int(part)] if isinstance(value, (list, array)) else getattr(value, part)
+        return value
+
+    def update(self, path: str, value: Any) -> None:
+        """Set a (possibly nested) input such as ``"hepts.chronos.balance"`` and invalidate what depends on it.
+
+        Nested models and lists on the path are copied rather than mutated, so
+        objects shared with other games (the config) are never changed.
+        """
+        head, _, rest = path.partition(".")
+        if rest:
+            value = _replaced(getattr(self, head), rest, value)
+
+        BaseModel.__setattr__(self, head, value)
+        self.invalidate(path)
+
+    @contextmanager
+    def what_if(self, changes: Dict[str, Any]) -> Iterator["SynergismGame"]:
+        """Apply ``changes`` (path -> value) for the duration of the block, then restore."""
+        saved = {path.partition(".")[0]: None for path in changes}
+        for head in saved:
+            saved[head] = getattr(self, head)
+
+        try:
+            for path, value in changes.items():
+                self.update(path, value)
+            yield self
+        finally:
+            for head, value in saved.items():
+                self.update(head, value)
+
+    @classmethod
+    def from_trusted(cls, data: Dict[str, Any]) -> "SynergismGame":
+        """Build from a decoded save without per-field validation.
+
+        Only for saves known to be well formed (exported by the game), where
+        the batch and service paths would otherwise spend most of their time
+        in pydantic. Missing keys still raise ``KeyError``, wrong types are not
+        caught.
+        """
+        crafts = data["hepteractCrafts"]
+        shop = data["shopUpgrades"]
+
+        return _construct(
+            cls,
+            {
+                **dict(zip(_TRUSTED_SCALARS, _TRUSTED_SCALAR_KEYS(data))),
+                "shop": _construct(ShopUpgrades, dict(zip(_SHOP_FIELDS, _SHOP_KEYS(shop)))),
+                "hepts": _construct(
+                    HepteractCrafts,
+                    {name: Hepteract.from_save(craft, trusted=True) for name, craft in zip(_CRAFTS, _CRAFT_KEYS(crafts))},
+                ),
+                "platonicUpgrades": _to_array("i", data["platonicUpgrades"]),
+                "usedCorruptions": _to_array("i", data["usedCorruptions"]),
+                "achievements": _to_array("B", data["achievements"]),
+                "config": None,
+                "shop_benefit_hept": 0,
+                "shop_benefit_accel": 0,
+            },
+        )
+
     def set_config(self, config: SynergismConfig) -> None:
         self.config = config
 
     def set_shop_benefits(self, buys: ShopBuys) -> None:
         if self.total_quarks > 2000:
-            self.shop_benefit_accel = round(1 + 0.01 * buys.accel1 + buys.accel2 * 0.005 + 0.01 * buys.accel1 * buys.accel2 * 0.005, 3)
-        
+            self.shop_benefit_accel = round(shop_benefit(buys.accel1, buys.accel2), 3)
+
         if self.total_quarks > 5000:
-            self.shop_benefit_hept = round(1 +  0.01 * buys.wow3 + buys.wowY * 0.005 + 0.01 * buys.wow3 * buys.wowY * 0.005, 3)
+            self.shop_benefit_hept = round(shop_benefit(buys.wow3, buys.wowY), 3)
 
     def get_plat_upgrade(self, row: int, column: int) -> int:
         try:
@@ -246,23 +537,34 @@ class SynergismGame(BaseModel):
         except IndexError:
             return 0
 
-    @property
+    @derived("platonicUpgrades")
     def u44(self) -> int:
         return self.get_plat_upgrade(4, 4)
 
-    @cached_property
+    @derived("hepts.chronos.balance", "u44")
     def chronos_percent(self) -> float:
         return (1000 * ((self.hepts.chronos.balance / 1000) ** ((1 / 6) + ((1 / 750) * self.u44)))) * (6 / 100)
 
-    @cached_property
+    @derived("hepts.chronos.cap", "hepts.chronos.base_cap", "u44")
     def chronos_percent_next(self) -> float:
         return (1000 * ((2 ** (self.hepts.chronos.tier)) ** ((1 / 6) + ((1 / 750) * self.u44)))) * (6 / 100)
 
-    @cached_property
+    @derived("chronos_percent", "chronos_percent_next")
     def chronos_increase(self) -> float:
         return ((self.chronos_percent_next + 100) / (self.chronos_percent + 100) - 1) * 100
 
-    @cached_property
+    @derived(
+        "challenge15Exponent",
+        "shop.chronometer",
+        "shop.chronometer2",
+        "shop.chronometer3",
+        "usedCorruptions",
+        "platonicUpgrades",
+        "hepts.chronos.balance",
+        "u44",
+        "ascensionCount",
+        "achievements",
+    )
     def multiplier(self) -> float:
         c15boost: float = (
             1 + 0.05 + 2 * math.log2(self.challenge15Exponent / 1.5e18) / 100
@@ -287,7 +589,7 @@ class SynergismGame(BaseModel):
         now = int(time.time() * 1000)
         return ((now - self.saveTime) / 1000) * self.multiplier + self.ascensionCounter
 
-    @cached_property
+    @derived("quarksLeft", "config.shopQuarkCost", *(f"shop.{item}" for item in ShopQuarkCosts.model_fields))
     def total_quarks(self) -> int:
         if self.config is None:
             raise ValueError("Config not set")
@@ -301,7 +603,7 @@ class SynergismGame(BaseModel):
 
         return math.floor(self.quarksLeft) + used_sum - 15
 
-    @cached_property
+    @derived("shop_benefit_hept", "config.hps", "config.addUsesPerDay", "shop.calculator3", "multiplier")
     def hept_per_day(self) -> float:
         if not self.config:
             raise ValueError("Config not set")
@@ -309,13 +611,13 @@ class SynergismGame(BaseModel):
         return self.shop_benefit_hept * self.config.hps * self.multiplier * (86400 + self.config.addUsesPerDay * 60 * self.shop.calculator3)
 
 
-    @cached_property
+    @property
     def hepts_after_ascension(self) -> int:
         if not self.config:
             raise ValueError("Config not set")
         return math.floor((self.wowAbyssals + self.current_ascension_timer * self.config.hps * self.shop_benefit_hept))
 
-    @cached_property
+    @derived("challenge15Exponent", "shop.powderEX", "achievements", "platonicUpgrades")
     def orb_to_powder(self) -> float:
         denominator = math.prod(
             [
@@ -329,27 +631,42 @@ class SynergismGame(BaseModel):
         )
         return 1/denominator
 
-    @property
+    @derived("hepts.chronos", "orb_to_powder")
     def hepts_small_inc(self) -> float:
         return self.hepts.chronos.to_level * 0.0000001 / self.orb_to_powder / 250000
     
-    @property
+    @derived("platonicUpgrades")
     def p44_noname(self) -> float:
         """ Dimnishing returns reduction value """
         return (1+0.0000001/2) ** ((1/6)+((1/750)*self.get_plat_upgrade(4, 4)))
 
-    @property
+    @derived("overfluxPowder", "overfluxOrbs", "orb_to_powder")
     def powder_tomorrow(self) -> float:
         return self.overfluxPowder + self.overfluxOrbs / self.orb_to_powder
 
-    @property
+    @derived("powder_tomorrow")
     def cube_from_powder(self) -> float:
         if self.powder_tomorrow > 10000:
             return 1+1/16* (math.log10(self.powder_tomorrow) ** 2) - 1 
         else:
             return 1+1/10000*self.powder_tomorrow - 1
 
-    @property
+    @derived("hepts_small_inc", "u44", "overfluxPowder")
+    def powder_solution(self) -> PowderSolution:
+        """Fixed point of ``x -> hepts_small_inc / (x ** (p44_noname - 1) - 1)``, with iterations and residual."""
+        return solve_fixed_point_scalar(self.hepts_small_inc, diminishing_exponent_scalar(self.u44), self.overfluxPowder)
+
+    @derived(
+        "hepts_small_inc",
+        "overfluxPowder",
+        "p44_noname",
+        "powder_solution",
+        "chronos_increase",
+        "hepts.chronos",
+        "orb_to_powder",
+        "hept_per_day",
+        "cube_from_powder",
+    )
     def powder_goal(self) -> float:
         """
         F5 = small incr in hept
@@ -369,8 +686,46 @@ class SynergismGame(BaseModel):
                 return self.overfluxPowder + math.floor(self.hept_per_day / 24 / 250000) / self.orb_to_powder
             else:
                 return 10000
-        return (self.hepts_small_inc / ((self.hepts_small_inc / ((self.hepts_small_inc / ((self.hepts_small_inc / ((self.overfluxPowder) ** (self.p44_noname -1) -1)) ** (self.p44_noname -1) -1)) ** (self.p44_noname -1) -1)) ** (self.p44_noname -1) -1)) / (self.cube_from_powder + 1) * self.cube_from_powder
+        # The nested F5 step is a fixed-point iteration, solved to tolerance instead of unrolled 4 times.
+        return float(self.powder_solution.root) / (self.cube_from_powder + 1) * self.cube_from_powder
 
-    @property
+    @derived("powder_goal", "overfluxPowder", "orb_to_powder", "overfluxOrbs")
     def orbs_to_powder_goal(self) -> float:
         return (self.powder_goal - self.overfluxPowder) * self.orb_to_powder - self.overfluxOrbs
+
+
+def _dependency_graph(model: type) -> Dict[str, FrozenSet[str]]:
+    """Map every input path of the ``derived`` stats of ``model`` to all stats downstream of it."""
+    nodes = {name: attr.inputs for name, attr in vars(model).items() if isinstance(attr, derived)}
+
+    direct: Dict[str, set] = {}
+    for name, inputs in nodes.items():
+        for source in inputs:
+            if source not in nodes and source.split(".")[0] not in model.model_fields:
+                raise TypeError(f"{model.__name__}.{name} depends on unknown input {source!r}")
+            direct.setdefault(source, set()).add(name)
+
+    def downstream(source: str) -> set:
+        found: set = set()
+        for name in direct.get(source, ()):
+            found |= {name} | downstream(name)
+        return found
+
+    return {source: frozenset(downstream(source)) for source in direct if source not in nodes}
+
+
+SynergismGame._dependents.update(_dependency_graph(SynergismGame))
+
+# Field names and save key getters for ``from_trusted``, which copies the plain fields over as they are.
+_TRUSTED_FIELDS = {
+    name: field.alias or name
+    for name, field in SynergismGame.model_fields.items()
+    if name not in ("shop", "hepts", "platonicUpgrades", "usedCorruptions", "achievements")
+    and not (field.json_schema_extra or {}).get("skip")
+}
+_TRUSTED_SCALARS = tuple(_TRUSTED_FIELDS)
+_TRUSTED_SCALAR_KEYS = itemgetter(*_TRUSTED_FIELDS.values())
+_SHOP_FIELDS = tuple(ShopUpgrades.model_fields)
+_SHOP_KEYS = itemgetter(*_SHOP_FIELDS)
+_CRAFTS = tuple(HepteractCrafts.model_fields)
+_CRAFT_KEYS = itemgetter(*_CRAFTS)
@@ -0,0 +1,266 @@
+import argparse
+import heapq
+import json
+import math
+import sys
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+import numpy
+from pydantic import BaseModel
+
+from save_layout import HepteractCrafts, SynergismGame, shop_benefit
+from shop_data import ShopData
+
+MS_PER_DAY = 86_400_000
+
+# Events per kind, and the resources whose amount or rate they read.
+CRAFTS = tuple(HepteractCrafts.model_fields)
+USES: Dict[str, FrozenSet[str]] = {
+    **{f"craft:{name}": frozenset({"hepts"}) for name in CRAFTS},
+    # Leveling Chronos also waits for the orbs to reach the powder goal, like the dashboard's "Level Chronos!".
+    "craft:chronos": frozenset({"hepts", "orbs"}),
+    "craft:quark": frozenset({"hepts", "quarks"}),
+    "accel": frozenset({"quarks"}),
+    "wow": frozenset({"quarks"}),
+}
+# Shop levels behind each pass table's two columns.
+PASSES = {"accel": ("chronometer", "chronometer2"), "wow": ("seasonPass3", "seasonPassY")}
+
+
+class Event(BaseModel):
+    key: str
+    label: str
+    # Balance each resource has to reach, and what buying takes out of it.
+    cost: Dict[str, float]
+    spend: Dict[str, float]
+    # ms since the epoch, None when the income never gets there.
+    time: Optional[int]
+
+
+class Resource:
+    """A balance growing linearly from ``amount`` at ``since`` (ms) at ``rate`` per day."""
+
+    __slots__ = ("amount", "since", "rate")
+
+    def __init__(self, amount: float, since: float, rate: float) -> None:
+        self.amount = amount
+        self.since = since
+        self.rate = rate
+
+    def at(self, time: float) -> float:
+        return self.amount + self.rate * (time - self.since) / MS_PER_DAY
+
+    def advance(self, time: float) -> None:
+        self.amount, self.since = self.at(time), time
+
+    def reached(self, target: float) -> float:
+        """When the balance first reaches ``target``, ``since`` if it already has, inf if it never will."""
+        missing = target - self.amount
+        if not missing > 0:
+            return self.since if missing <= 0 else math.inf  # NaN targets are never reached
+        return self.since + missing / self.rate * MS_PER_DAY if self.rate > 0 else math.inf
+
+
+class Scheduler:
+    """Timeline of when the next tier of each hepteract craft and of the Accel/WoW passes becomes affordable.
+
+    Hepts accrue at ``hept_per_day`` from ``wowAbyssals``, quarks at
+    ``quarks_per_day`` from ``total_quarks`` and orbs at ``orbs_per_day`` from
+    ``overfluxOrbs``, all from the save time on. Chronos levels up once the
+    hepts are there and ``orbs_to_powder_goal`` is down to 0. Every event sits
+    in one heap ordered by time. ``apply`` buys an event and recomputes only
+    the events reading a resource it changed, older heap entries of those are
+    skipped when they surface.
+    """
+
+    def __init__(self, game: SynergismGame, sd: ShopData, quarks_per_day: float = 0, orbs_per_day: float = 0) -> None:
+        if game.config is None:
+            raise ValueError("Config not set")
+
+        # Purchases update this copy, nested models are copied on write so the caller's game is untouched.
+        self.game = game.model_copy()
+        self.sd = sd
+        self.now = float(game.saveTime)
+        self.resources = {
+            "hepts": Resource(game.wowAbyssals, self.now, game.hept_per_day),
+            "quarks": Resource(game.total_quarks, self.now, quarks_per_day),
+            "orbs": Resource(game.overfluxOrbs, self.now, orbs_per_day),
+        }
+        # Next row of each pass table: ShopBuys takes the dearest row costing less than total_quarks,
+        # and rows the save's shop levels already match or beat buy nothing.
+        self._rows = {
+            key: self._next_row(key, int(numpy.searchsorted(self._table(key)[:, 2], game.total_quarks, side="left")))
+            for key in PASSES
+        }
+        self.events: Dict[str, Event] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._pushed = 0
+        self._current: Dict[str, int] = {}
+
+        for key in USES:
+            self._schedule(key)
+
+    def _table(self, key: str) -> numpy.ndarray:
+        return self.sd.accel if key == "accel" else self.sd.wow
+
+    def _next_row(self, key: str, row: int) -> int:
+        """First row of the ``key`` table from ``row`` on that raises one of its shop levels, past the end if none."""
+        table = self._table(key)[row:]
+        first, second = (getattr(self.game.shop, name) for name in PASSES[key])
+        raises = numpy.flatnonzero((table[:, 0] > first) | (table[:, 1] > second))
+        return row + int(raises[0]) if len(raises) else row + len(table)
+
+    def _cost(self, key: str) -> Optional[Tuple[str, Dict[str, float], Dict[str, float]]]:
+        """Label, resource targets and spending of the next purchase of ``key``, None if there is none."""
+        game = self.game
+        if key.startswith("craft:"):
+            name = key.partition(":")[2]
+            hept = getattr(game.hepts, name)
+            hepts = hept.to_level
+            tier = hept.tier + (hept.balance >= hept.cap)
+            spend = {"hepts": hepts}
+            if hept.quarks_per_craft:
+                spend["quarks"] = math.ceil(hepts / hept.hepteract_conversion * hept.quarks_per_craft)
+            cost = dict(spend)
+            if "quarks" in spend:
+                # Quarks are tracked as total_quarks, crafts only take what is above quark_keep (as in print_balances).
+                cost["quarks"] += game.config.quark_keep
+            if name == "chronos":
+                # Orbs to hold for orbs_to_powder_goal to hit 0, at least none.
+                cost["orbs"] = max(game.overfluxOrbs + game.orbs_to_powder_goal, 0.0)
+                return f"Level Chronos to tier {tier}", cost, spend
+            return f"{name.title()} tier {tier} full", cost, spend
+
+        if key in PASSES:
+            table = self._table(key)
+            row = self._rows[key]
+            if row >= len(table):
+                return None
+            first, second, cost = (int(x) for x in table[row])
+            return f"{'Accel' if key == 'accel' else 'WoW'} {first}/{second}", {"quarks": cost + 1}, {}
+
+        raise KeyError(key)
+
+    def _schedule(self, key: str) -> None:
+        self._pushed += 1
+        self._current[key] = self._pushed
+        next_purchase = self._cost(key)
+        if next_purchase is None:
+            self.events.pop(key, None)
+            return
+
+        label, cost, spend = next_purchase
+        time = max(self.resources[name].reached(target) for name, target in cost.items())
+        self.events[key] = Event(key=key, label=label, cost=cost, spend=spend, time=None if math.isinf(time) else math.ceil(time))
+        heapq.heappush(self._heap, (time, self._pushed, key))
+
+    def next(self) -> Optional[Event]:
+        """The earliest event that is still current, None when nothing is ever affordable."""
+        while self._heap:
+            time, pushed, key = self._heap[0]
+            if self._current.get(key) == pushed and not math.isinf(time):
+                return self.events[key]
+            heapq.heappop(self._heap)
+        return None
+
+    def timeline(self) -> List[Event]:
+        """Every current event, earliest first and never-affordable ones last."""
+        return sorted(self.events.values(), key=lambda e: math.inf if e.time is None else e.time)
+
+    def apply(self, key: str) -> Event:
+        """Buy ``key`` as soon as it is affordable and reschedule what that changes."""
+        event = self.events[key]
+        if event.time is None:
+            raise ValueError(f"{event.label} never becomes affordable")
+
+        self.now = max(self.now, event.time)
+        for resource in self.resources.values():
+            resource.advance(self.now)
+
+        game = self.game
+        changed: Set[str] = set()
+        if key.startswith("craft:"):
+            for name, amount in event.spend.items():
+                self.resources[name].amount -= amount
+            changed |= set(event.spend)
+
+            name = key.partition(":")[2]
+            hept = getattr(game.hepts, name)
+            if hept.balance >= hept.cap:
+                game.update(f"hepts.{name}.cap", hept.cap * 2)
+            game.update(f"hepts.{name}.balance", getattr(game.hepts, name).cap)
+            if name == "chronos":
+                # Chronos feeds the multiplier and the powder goal.
+                changed |= {"hepts", "orbs"}
+        else:
+            # Pass tiers are priced in total quarks, which buying one does not lower. A tier only ever
+            # raises the shop levels, the save may be past the table in one of them already.
+            table = self._table(key)
+            levels = [max(getattr(game.shop, name), int(level)) for name, level in zip(PASSES[key], table[self._rows[key], :2])]
+            for name, level in zip(PASSES[key], levels):
+                game.update(f"shop.{name}", level)
+            if key == "wow":
+                game.update("shop_benefit_hept", max(game.shop_benefit_hept, round(shop_benefit(*levels), 3)))
+            self._rows[key] = self._next_row(key, self._rows[key] + 1)
+            changed |= {"hepts", "orbs"}
+
+        self.resources["hepts"].rate = game.hept_per_day
+
+        for other in {key} | {other for other, uses in USES.items() if uses & changed}:
+            self._schedule(other)
+        return event
+
+    def run(self, until: Optional[float] = None, limit: int = 10_000) -> List[Event]:
+        """Apply events in time order up to ``until`` (ms since the epoch) or ``limit`` purchases."""
+        bought = []
+        while len(bought) < limit:
+            event = self.next()
+            if event is None or (until is not None and event.time > until):
+                break
+            bought.append(self.apply(event.key))
+        return bought
+
+
+def main() -> None:
+    from synergisa import load_config, load_game, load_shop_data
+
+    parser = argparse.ArgumentParser(description="Predict when each craft tier, pass tier and the Chronos level-up becomes affordable.")
+    parser.add_argument("file_path", help="path to the base64-encoded file")
+    parser.add_argument("--quarks-per-day", type=float, default=0)
+    parser.add_argument("--orbs-per-day", type=float, default=0)
+    parser.add_argument("--days", type=float, help="buy every event as it comes for this many days, instead of one timeline")
+    parser.add_argument("--json", action="store_true", help="print the events as JSON Lines")
+    args = parser.parse_args()
+
+    sd = load_shop_data()
+    game, _ = load_game(args.file_path, load_config(), sd)
+    scheduler = Scheduler(game, sd, args.quarks_per_day, args.orbs_per_day)
+    start = scheduler.now
+    events = scheduler.run(start + args.days * MS_PER_DAY) if args.days is not None else scheduler.timeline()
+
+    if args.json:
+        for event in events:
+            sys.stdout.write(json.dumps(event.model_dump()) + "\n")
+        return
+
+    from datetime import datetime, timezone
+
+    from rich.console import Console
+    from rich.table import Table
+    from rich import box
+
+    table = Table(box=box.MINIMAL_DOUBLE_HEAD, title="Purchases" if args.days is not None else "Next purchases", title_style="bold")
+    table.add_column("When (UTC)")
+    table.add_column("In", justify="right")
+    table.add_column("Event")
+    table.add_column("Cost", justify="right")
+    for event in events:
+        when = "never" if event.time is None else f"{datetime.fromtimestamp(event.time / 1000, timezone.utc):%Y-%m-%d %H:%M}"
+        wait = "" if event.time is None else f"{(event.time - start) / MS_PER_DAY:,.2f} d"
+        cost = ", ".join(f"{amount:.3g} {name}" for name, amount in (event.spend or event.cost).items())
+        table.add_row(when, wait, event.label, cost)
+    Console().print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import argparse
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy
+from pydantic import BaseModel
+
+from save_frame import COLUMNS, SaveFrame
+from save_layout import SynergismGame
+
+# Derived stats ``SaveFrame`` computes, and the ones reported by default.
+STATS = (
+    "chronos_percent",
+    "chronos_percent_next",
+    "chronos_increase",
+    "multiplier",
+    "hept_per_day",
+    "orb_to_powder",
+    "hepts_small_inc",
+    "p44_noname",
+    "powder_tomorrow",
+    "cube_from_powder",
+    "powder_goal",
+    "orbs_to_powder_goal",
+)
+DEFAULT_STATS = ("hept_per_day", "multiplier", "powder_goal")
+
+# Platonic upgrades the stats read, as (row, column).
+PLATONIC = {"u35": (3, 5), "u41": (4, 1), "u44": (4, 4)}
+# A timestamp, where a relative change means nothing, and the Chronos cap inputs: caps are exact
+# powers of two of the base cap, so any step off them crosses a tier and the difference is a jump.
+SKIPPED = ("saveTime", "chronosCap", "chronosBaseCap", "chronosConversion")
+INPUTS = tuple(name for name in COLUMNS if name not in SKIPPED) + tuple(PLATONIC)
+
+# Relative step of the finite differences, absolute when the input is 0.
+STEP = 1e-4
+
+
+class Driver(BaseModel):
+    stat: str
+    input: str
+    value: float
+    derivative: float
+    elasticity: float
+
+
+def _plat_index(name: str) -> int:
+    row, column = PLATONIC[name]
+    return (row - 1) * 5 + column
+
+
+def _input_value(frame: SaveFrame, name: str) -> float:
+    if name in PLATONIC:
+        return float(frame.get_plat_upgrade(*PLATONIC[name])[0])
+    return float(frame.columns[name][0])
+
+
+def sensitivity(
+    game: SynergismGame,
+    stats: Sequence[str] = DEFAULT_STATS,
+    inputs: Optional[Sequence[str]] = None,
+    step: float = STEP,
+) -> List[Driver]:
+    """Derivative and elasticity of every stat with respect to every input, around ``game``.
+
+    Central differences, or forward ones for inputs at 0, all evaluated as
+    rows of a single ``SaveFrame``: row 0 is the save itself and each input
+    adds a row moved up and one moved down. The elasticity is the % change of
+    the stat per 1% change of the input (0 for inputs at 0).
+    """
+    inputs = list(inputs or INPUTS)
+    unknown = set(inputs) - set(INPUTS) | set(stats) - set(STATS)
+    if unknown:
+        raise ValueError(f"Unknown inputs or stats: {', '.join(sorted(unknown))}")
+
+    base = SaveFrame.from_games([game])
+    rows = 1 + 2 * len(inputs)
+
+    columns: Dict[str, numpy.ndarray] = {name: numpy.repeat(column, rows) for name, column in base.columns.items()}
+    width = max(base.platonicUpgrades.shape[1], *(_plat_index(name) + 1 for name in PLATONIC))
+    platonic = numpy.zeros((rows, width))
+    platonic[:, : base.platonicUpgrades.shape[1]] = base.platonicUpgrades
+
+    points: List[Tuple[float, float]] = []
+    for i, name in enumerate(inputs):
+        value = _input_value(base, name)
+        h = step * abs(value) or step
+        up, down = value + h, (value - h if value else value)
+        target = platonic[:, _plat_index(name)] if name in PLATONIC else columns[name]
+        target[1 + 2 * i] = up
+        target[2 + 2 * i] = down
+        points.append((value, up - down))
+
+    frame = SaveFrame(platonic, numpy.repeat(base.achievements, rows, axis=0), **columns)
+
+    drivers = []
+    with numpy.errstate(all="ignore"):
+        for stat in stats:
+            result = getattr(frame, stat)
+            for i, (name, (value, span)) in enumerate(zip(inputs, points)):
+                derivative = float((result[1 + 2 * i] - result[2 + 2 * i]) / span)
+                elasticity = derivative * value / result[0] if result[0] else math.nan
+                drivers.append(Driver(stat=stat, input=name, value=value, derivative=derivative, elasticity=elasticity))
+    return drivers
+
+
+def top_drivers(drivers: List[Driver], stat: str, count: Optional[int] = None) -> List[Driver]:
+    """Drivers of ``stat`` with any effect, largest elasticity first."""
+    ranked = [d for d in drivers if d.stat == stat and d.derivative != 0 and math.isfinite(d.elasticity)]
+    ranked.sort(key=lambda d: abs(d.elasticity), reverse=True)
+    return ranked[:count]
+
+
+def main() -> None:
+    from rich.console import Console
+    from rich.table import Table
+    from rich import box
+
+    from synergisa import load_config, load_game, load_shop_data
+
+    parser = argparse.ArgumentParser(description="Rank which inputs move the derived stats the most.")
+    parser.add_argument("file_path", help="path to the base64-encoded file")
+    parser.add_argument("--stats", nargs="+", choices=STATS, default=DEFAULT_STATS, metavar="STAT", help=f"any of {', '.join(STATS)}")
+    parser.add_argument("--top", type=int, default=10, help="drivers shown per stat")
+    parser.add_argument("--step", type=float, default=STEP, help="relative finite-difference step")
+    args = parser.parse_args()
+
+    game, _ = load_game(args.file_path, load_config(), load_shop_data())
+    drivers = sensitivity(game, args.stats, step=args.step)
+
+    console = Console()
+    for stat in args.stats:
+        table = Table(box=box.MINIMAL_DOUBLE_HEAD, title=f"Drivers of {stat}", title_style="bold")
+        table.add_column("Input")
+        table.add_column("Value", justify="right")
+        table.add_column(f"d {stat} / d input", justify="right")
+        table.add_column("Elasticity", justify="right")
+        ranked = top_drivers(drivers, stat, args.top)
+        for driver in ranked:
+            table.add_row(driver.input, f"{driver.value:,.6g}", f"{driver.derivative:,.4g}", f"{driver.elasticity:+.4f}")
+        if not ranked:
+            table.caption = f"No input moves it around this save, it is flat at {getattr(game, stat):,.6g}"
+        console.print(table)
+
+
+if __name__ == "__main__":
+    main()
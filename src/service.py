@@ -0,0 +1,216 @@
+import argparse
+import asyncio
+import io
+import json
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from typing import Any, Deque, Dict, Optional, Tuple
+
+import numpy
+from loguru import logger
+
+from save_decoder import content_hash, decode_save
+from synergisa import build_game, game_report, load_config, load_shop_data
+
+MAX_BODY = 64 << 20
+
+# Per-process state, filled once by the pool initializer so the config and the
+# shop table stay resident between requests.
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(trusted: bool = False) -> None:
+    _worker["config"] = load_config()
+    _worker["shop"] = load_shop_data()
+    _worker["trusted"] = trusted
+
+
+def evaluate(body: bytes) -> Dict[str, Any]:
+    """Decode and validate one base64 save and return its report. Runs in a pool worker."""
+    game, buys = build_game(decode_save(io.BytesIO(body)), _worker["config"], _worker["shop"], _worker["trusted"])
+    return game_report(game, buys)
+
+
+def _started() -> None:
+    """No-op run once to fork the pool workers."""
+
+
+def save_key(body: bytes) -> str:
+    """Cache key of a submitted save, ignoring the whitespace exports tend to pick up."""
+    return content_hash(io.BytesIO(body))
+
+
+class ReportCache:
+    """LRU of report JSON by save hash, bounded by the number of entries."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[bytes]:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: bytes) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class Metrics:
+    """Request counters and the latencies of the most recent requests."""
+
+    def __init__(self, window: int = 1024) -> None:
+        self.counts: Dict[str, int] = {"requests": 0, "hits": 0, "misses": 0, "errors": 0}
+        self.latencies: Deque[float] = deque(maxlen=window)
+
+    def observe(self, seconds: float) -> None:
+        self.counts["requests"] += 1
+        self.latencies.append(seconds)
+
+    def snapshot(self, cache: ReportCache) -> Dict[str, Any]:
+        latency: Dict[str, float] = {}
+        if self.latencies:
+            p50, p95, p99 = numpy.percentile(self.latencies, (50, 95, 99))
+            latency = {"p50_ms": p50 * 1000, "p95_ms": p95 * 1000, "p99_ms": p99 * 1000, "max_ms": max(self.latencies) * 1000}
+
+        return {**self.counts, "cache_entries": len(cache), "cache_max_entries": cache.max_entries, "latency": latency}
+
+
+class SaveService:
+    """HTTP/JSON front for ``game_report``.
+
+    ``POST /evaluate`` takes a base64 save as the body and returns the report,
+    ``GET /metrics`` the cache and latency counters. Decoding and validation
+    run in a process pool and hashing in a thread, so the event loop only
+    parses requests and serves cache hits. Reports are cached by save hash,
+    and concurrent submissions of the same save share one evaluation. A
+    cached report keeps the wall-clock values (ascension timer) of the moment
+    it was computed.
+    """
+
+    def __init__(self, workers: Optional[int] = None, cache_entries: int = 256, trusted: bool = False) -> None:
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(trusted,))
+        self.cache = ReportCache(cache_entries)
+        self.metrics = Metrics()
+        self._in_flight: Dict[str, "asyncio.Future[bytes]"] = {}
+
+    async def report(self, body: bytes) -> bytes:
+        # Bodies go up to MAX_BODY, hashing one on the loop would hold up every other request.
+        key = await asyncio.get_running_loop().run_in_executor(None, save_key, body)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.metrics.counts["hits"] += 1
+            return cached
+
+        self.metrics.counts["misses"] += 1
+        if key not in self._in_flight:
+            self._in_flight[key] = asyncio.ensure_future(self._evaluate(key, body))
+        return await asyncio.shield(self._in_flight[key])
+
+    async def _evaluate(self, key: str, body: bytes) -> bytes:
+        try:
+            report = await asyncio.get_running_loop().run_in_executor(self.pool, evaluate, body)
+        finally:
+            del self._in_flight[key]
+
+        result = json.dumps(report).encode()
+        self.cache.put(key, result)
+        return result
+
+    async def route(self, method: str, path: str, body: bytes) -> Tuple[HTTPStatus, bytes]:
+        if path == "/metrics" and method == "GET":
+            return HTTPStatus.OK, json.dumps(self.metrics.snapshot(self.cache)).encode()
+
+        if path == "/evaluate":
+            if method != "POST":
+                return HTTPStatus.METHOD_NOT_ALLOWED, _error("Use POST with the base64 save as the body")
+            try:
+                return HTTPStatus.OK, await self.report(body)
+            except Exception as e:  # noqa: BLE001 - a bad save is the client's problem, not the service's
+                self.metrics.counts["errors"] += 1
+                return HTTPStatus.UNPROCESSABLE_ENTITY, _error(f"{type(e).__name__}: {e}")
+
+        return HTTPStatus.NOT_FOUND, _error(f"No route {method} {path}")
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        started = time.perf_counter()
+        try:
+            try:
+                method, path, _ = (await reader.readline()).decode("latin-1").split(" ", 2)
+                headers: Dict[str, str] = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY:
+                    status, payload = HTTPStatus.REQUEST_ENTITY_TOO_LARGE, _error(f"Body over {MAX_BODY} bytes")
+                else:
+                    status, payload = await self.route(method, path.split("?", 1)[0], await reader.readexactly(length))
+            except (ValueError, asyncio.IncompleteReadError):
+                status, payload = HTTPStatus.BAD_REQUEST, _error("Malformed request")
+
+            writer.write(
+                f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                f"Connection: close\r\n\r\n".encode()
+                + payload
+            )
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            self.metrics.observe(time.perf_counter() - started)
+
+    async def listen(self, host: str, port: int) -> asyncio.AbstractServer:
+        # Fork the workers before accepting anything, workers forked later would hold the open client sockets.
+        await asyncio.get_running_loop().run_in_executor(self.pool, _started)
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def serve(self, host: str, port: int) -> None:
+        server = await self.listen(host, port)
+        logger.info(f"Listening on http://{host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+    def close(self) -> None:
+        self.pool.shutdown(cancel_futures=True)
+
+
+def _error(message: str) -> bytes:
+    return json.dumps({"error": message}).encode()
+
+
+@logger.catch
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve save reports over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("-j", "--workers", type=int, help="worker processes, defaults to CPU count")
+    parser.add_argument("--cache-entries", type=int, default=256, help="reports kept in the LRU cache")
+    parser.add_argument("--trusted", action="store_true", help="skip per-field validation of submitted saves")
+    args = parser.parse_args()
+
+    service = SaveService(args.workers, args.cache_entries, args.trusted)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy
+
+from profiler import profiled
+
+CACHE_SUFFIX = ".shop.npz"
+
+
+class ShopData:
+    """The Shop sheet of Data.xlsx as plain integer arrays.
+
+    ``accel`` rows are ``(Accel 1, Accel 2, Cost)`` and ``wow`` rows are
+    ``(WoW V.3, WoW V.Y, Cost)``, sorted by cost. Blank rows of the sheet
+    are dropped.
+    """
+
+    accel: numpy.ndarray
+    wow: numpy.ndarray
+
+    def __init__(self, accel: numpy.ndarray, wow: numpy.ndarray) -> None:
+        self.accel = accel[numpy.argsort(accel[:, 2], kind="stable")]
+        self.wow = wow[numpy.argsort(wow[:, 2], kind="stable")]
+
+        # Cost columns for searchsorted, and the tables with an all-zero
+        # "nothing bought" row in front so index -1 + 1 lands on it.
+        self._accel_cost = numpy.ascontiguousarray(self.accel[:, 2])
+        self._wow_cost = numpy.ascontiguousarray(self.wow[:, 2])
+        self._accel_rows = numpy.vstack([numpy.zeros((1, 3), dtype=numpy.int64), self.accel])
+        self._wow_rows = numpy.vstack([numpy.zeros((1, 3), dtype=numpy.int64), self.wow])
+
+    @staticmethod
+    def _best(costs: numpy.ndarray, rows: numpy.ndarray, quarks: numpy.ndarray) -> numpy.ndarray:
+        return rows[numpy.searchsorted(costs, quarks, side="left")]
+
+    def best_accel(self, quarks) -> numpy.ndarray:
+        """Most expensive Acceleration row costing less than ``quarks`` (zeros if none), per element."""
+        return self._best(self._accel_cost, self._accel_rows, numpy.asarray(quarks))
+
+    def best_wow(self, quarks) -> numpy.ndarray:
+        """Most expensive WoW Passes row costing less than ``quarks`` (zeros if none), per element."""
+        return self._best(self._wow_cost, self._wow_rows, numpy.asarray(quarks))
+
+    @classmethod
+    @profiled("shop_compile")
+    def from_xlsx(cls, xlsx_path: Union[str, Path]) -> "ShopData":
+        import pandas  # only needed when the cache has to be rebuilt
+
+        sd = pandas.read_excel(xlsx_path, sheet_name="Shop", header=[0, 1], engine="openpyxl")
+
+        return cls(_table(sd["Acceleration"].to_numpy()), _table(sd["WoW Passes"].to_numpy()))
+
+
+def _table(values: numpy.ndarray) -> numpy.ndarray:
+    return values[~numpy.isnan(values.astype(float)).any(axis=1)].astype(numpy.int64)
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_cache(cache_path: Path, shop: ShopData, mtime_ns: int, sha256: str) -> None:
+    # Write to a temp file and rename, batch workers may race on a cold cache.
+    fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            numpy.savez(file, accel=shop.accel, wow=shop.wow, mtime_ns=numpy.int64(mtime_ns), sha256=numpy.str_(sha256))
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_shop_data(data_path: Union[str, Path], cache_path: Optional[Union[str, Path]] = None) -> ShopData:
+    """Load the shop tables, compiling Data.xlsx into an npz cache next to it when stale.
+
+    The cache is trusted while the workbook mtime is unchanged. If only the
+    mtime moved but the content hash is the same, the cache is re-stamped
+    instead of re-parsed.
+    """
+    xlsx_path = Path(data_path) / "Data.xlsx"
+    cache_path = Path(cache_path) if cache_path else xlsx_path.with_suffix(CACHE_SUFFIX)
+    mtime_ns = xlsx_path.stat().st_mtime_ns
+
+    sha256: Optional[str] = None
+    if cache_path.exists():
+        try:
+            with numpy.load(cache_path) as cached:
+                shop = ShopData(cached["accel"], cached["wow"])
+                if int(cached["mtime_ns"]) == mtime_ns:
+                    return shop
+
+                sha256 = _sha256(xlsx_path)
+                if str(cached["sha256"]) == sha256:
+                    _write_cache(cache_path, shop, mtime_ns, sha256)
+                    return shop
+        except (OSError, KeyError, ValueError) as e:
+            from loguru import logger  # only the slow paths log, keep it out of startup
+
+            logger.warning(f"Ignoring unreadable shop cache {cache_path}: {e}")
+
+    from loguru import logger
+
+    logger.info(f"Compiling {xlsx_path} into {cache_path}")
+    shop = ShopData.from_xlsx(xlsx_path)
+    _write_cache(cache_path, shop, mtime_ns, sha256 or _sha256(xlsx_path))
+
+    return shop
@@ -0,0 +1,172 @@
+import heapq
+import math
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from save_layout import QuarkCost, SynergismGame, shop_benefit
+from shop_data import ShopData
+
+# Shop upgrades each objective is multiplied by, as (1 + boost * level): the
+# Accel pair (chronometer 1/2) in the multiplier, and for hepts also the WoW
+# pair (season pass 3/Y) behind ``shop_benefit_hept``.
+BOOSTS: Dict[str, Dict[str, float]] = {
+    "multiplier": {"chronometer": 0.01, "chronometer2": 0.005},
+    "hept_per_day": {"chronometer": 0.01, "chronometer2": 0.005, "seasonPass3": 0.01, "seasonPassY": 0.005},
+}
+OBJECTIVES = tuple(BOOSTS)
+
+
+class ShopStep(BaseModel):
+    item: str
+    from_level: int
+    to_level: int
+    quarks: int
+    gain: float
+
+
+class ShopPlan(BaseModel):
+    objective: str
+    baseline: float
+    value: float
+    steps: List[ShopStep]
+    quarks_left: int
+
+
+def table_caps(sd: ShopData) -> Dict[str, int]:
+    """Highest levels in the Accel and WoW tables, the shop's caps for those upgrades."""
+    return {
+        "chronometer": int(sd.accel[:, 0].max()),
+        "chronometer2": int(sd.accel[:, 1].max()),
+        "seasonPass3": int(sd.wow[:, 0].max()),
+        "seasonPassY": int(sd.wow[:, 1].max()),
+    }
+
+
+def _gain_per_quark(cost: QuarkCost, boost: float, level: int) -> float:
+    """Log gain of the objective per quark for the level after ``level``."""
+    price = cost.quark_cost(level + 1) - cost.quark_cost(level)
+    gain = math.log1p(boost / (1 + boost * level))
+    return gain / price if price else math.inf
+
+
+def _levels_worth(cost: QuarkCost, boost: float, level: int, limit: int, threshold: float) -> int:
+    """Highest level up to ``limit`` whose levels past ``level`` all gain at least ``threshold`` per quark."""
+    # The gain per quark only falls with the level, so the levels worth it are a prefix.
+    low, high = level, limit
+    while low < high:
+        middle = (low + high + 1) // 2
+        if _gain_per_quark(cost, boost, middle - 1) >= threshold:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def evaluate(game: SynergismGame, objective: str, levels: Dict[str, int]) -> float:
+    """``objective`` of ``game`` with the shop at ``levels``.
+
+    ``shop_benefit_hept`` is taken from the season pass levels (of the save
+    unless ``levels`` has them), not from the WoW tier ``total_quarks`` buys,
+    so a plan and its baseline are valued the same way.
+    """
+    changes: Dict[str, float] = {f"shop.{name}": level for name, level in levels.items()}
+    if objective == "hept_per_day":
+        passes = [levels.get(name, getattr(game.shop, name)) for name in ("seasonPass3", "seasonPassY")]
+        changes["shop_benefit_hept"] = round(shop_benefit(*passes), 3)
+    with game.what_if(changes):
+        return getattr(game, objective)
+
+
+def plan_shop(game: SynergismGame, sd: ShopData, objective: str = "multiplier", quarks: Optional[int] = None) -> ShopPlan:
+    """Quark shop levels to buy next, best gain per quark first.
+
+    The budget defaults to the unspent quarks above ``quark_keep``. Items are
+    capped at ``QuarkCost.maxLevel`` or, when that is not set, at the highest
+    level of their Accel/WoW table.
+
+    Buying the best next level over and over would take one step per level,
+    so the bulk of the budget goes first to every level above a gain per
+    quark cut-off, the lowest one the budget covers, found by bisection with
+    closed-form costs. The few quarks left are spent from a heap of the items
+    by the gain per quark of their next level, each pop buying every level
+    still better than the runner-up. The cost does not grow with the budget.
+    The baseline and planned values come from ``evaluate``.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective {objective}, expected one of {', '.join(OBJECTIVES)}")
+    if game.config is None:
+        raise ValueError("Config not set")
+
+    if quarks is None:
+        quarks = max(math.floor(game.quarksLeft) - game.config.quark_keep, 0)
+
+    boosts = BOOSTS[objective]
+    caps = table_caps(sd)
+    costs: Dict[str, QuarkCost] = {}
+    for name in boosts:
+        cost = getattr(game.config.shopQuarkCost, name)
+        costs[name] = cost if cost.maxLevel is not None else cost.model_copy(update={"maxLevel": caps.get(name)})
+
+    levels = {name: getattr(game.shop, name) for name in boosts}
+    baseline = evaluate(game, objective, levels)
+    steps: List[ShopStep] = []
+
+    def buy(name: str, to_level: int) -> None:
+        nonlocal quarks
+        cost, boost, level = costs[name], boosts[name], levels[name]
+        spent = cost.quark_cost(to_level) - cost.quark_cost(level)
+        gain = (1 + boost * to_level) / (1 + boost * level)
+        quarks -= spent
+        levels[name] = to_level
+        if steps and steps[-1].item == name:
+            last = steps[-1]
+            steps[-1] = ShopStep(item=name, from_level=last.from_level, to_level=to_level, quarks=last.quarks + spent, gain=(1 + last.gain) * gain - 1)
+        else:
+            steps.append(ShopStep(item=name, from_level=level, to_level=to_level, quarks=spent, gain=gain - 1))
+
+    def cut(threshold: float) -> Dict[str, int]:
+        return {
+            name: _levels_worth(costs[name], boosts[name], level, costs[name].levels_for(level, quarks), threshold)
+            for name, level in levels.items()
+        }
+
+    def spend(targets: Dict[str, int]) -> int:
+        return sum(costs[name].quark_cost(target) - costs[name].quark_cost(levels[name]) for name, target in targets.items())
+
+    # Bisect the cut-off in log space, from a gain per quark nothing reaches to one everything does.
+    low, high = math.log(1e-300), math.log(1e300)
+    for _ in range(64):
+        middle = (low + high) / 2
+        if spend(cut(math.exp(middle))) <= quarks:
+            high = middle
+        else:
+            low = middle
+    targets = cut(math.exp(high))
+    for name in sorted(targets, key=lambda name: -_gain_per_quark(costs[name], boosts[name], levels[name])):
+        if targets[name] > levels[name]:
+            buy(name, targets[name])
+
+    heap: List[Tuple[float, str]] = [
+        (-_gain_per_quark(costs[name], boosts[name], level), name)
+        for name, level in levels.items()
+        if costs[name].maxLevel is None or level < costs[name].maxLevel
+    ]
+    heapq.heapify(heap)
+    while heap:
+        _, name = heapq.heappop(heap)
+        cost, boost, level = costs[name], boosts[name], levels[name]
+
+        limit = cost.levels_for(level, quarks)
+        if limit == level:
+            # Not even one more level fits, and levels only get dearer.
+            continue
+
+        # Every level at least as good as the runner-up's next one; the first always is.
+        target = max(_levels_worth(cost, boost, level, limit, -heap[0][0] if heap else 0.0), level + 1)
+        buy(name, target)
+        if cost.maxLevel is None or target < cost.maxLevel:
+            heapq.heappush(heap, (-_gain_per_quark(cost, boost, target), name))
+
+    value = evaluate(game, objective, levels)
+    return ShopPlan(objective=objective, baseline=baseline, value=value, steps=steps, quarks_left=quarks)
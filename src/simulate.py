@@ -0,0 +1,192 @@
+import argparse
+import math
+import time
+from typing import Dict, Optional
+
+import numpy
+
+from loguru import logger
+
+from hept_planner import first_linked_doubling, linked_cost
+from save_frame import SaveFrame
+from save_layout import SynergismGame, shop_benefit
+from shop_data import ShopData
+
+PERCENTILES = (5, 50, 95)
+RECORDED = ("hepts", "chronos_tier", "multiplier", "hept_per_day", "total_quarks")
+
+# Linked craft tiers to price up front, far beyond anything reachable in months.
+MAX_TIERS = 64
+
+
+class Simulation:
+    """Recorded percentiles (``PERCENTILES`` x record points) and the final value of every run."""
+
+    hours: numpy.ndarray
+    percentiles: Dict[str, numpy.ndarray]
+    final: Dict[str, numpy.ndarray]
+
+    def __init__(self, hours: numpy.ndarray, percentiles: Dict[str, numpy.ndarray], final: Dict[str, numpy.ndarray]) -> None:
+        self.hours = hours
+        self.percentiles = percentiles
+        self.final = final
+
+
+def _noise(rng: numpy.random.Generator, cv: float, size: int) -> numpy.ndarray:
+    """Mean-one lognormal factors with coefficient of variation ``cv``."""
+    if cv <= 0:
+        return numpy.ones(size)
+    sigma = math.sqrt(math.log1p(cv**2))
+    return rng.lognormal(-(sigma**2) / 2, sigma, size)
+
+
+def simulate(
+    game: SynergismGame,
+    shop: ShopData,
+    days: float = 90,
+    step_hours: float = 1,
+    runs: int = 1,
+    hps_cv: float = 0,
+    uses_cv: float = 0,
+    quarks_per_day: float = 0,
+    record_hours: float = 24,
+    seed: Optional[int] = None,
+) -> Simulation:
+    """Step hepteract and quark income forward in time, for ``runs`` Monte Carlo runs at once.
+
+    Every step accrues ``hps * multiplier * shop_benefit_hept`` per second
+    plus the calculator add uses, like ``hept_per_day`` does. Whenever the
+    banked hepts cover the next linked craft tier (Chronos and the crafts in
+    ratio with it, see ``hept_planner``) it is bought, which raises the
+    multiplier. Quarks grow by ``quarks_per_day`` and move the WoW pass tier
+    from ``ShopBuys``. ``hps`` and the add uses get independent lognormal
+    noise per run and step with the given coefficients of variation.
+    """
+    if game.config is None:
+        raise ValueError("Config not set")
+
+    conf = game.config
+    crafts = game.hepts
+    rng = numpy.random.default_rng(seed)
+
+    # Ladder of linked tiers: index 0 is the save as is, then every ratio-valid Chronos cap.
+    first = first_linked_doubling(crafts)
+    caps = [crafts.chronos.cap_after(d) for d in range(first, first + MAX_TIERS)] if first is not None else []
+    cumulative_cost = numpy.array([0.0] + [float(linked_cost(crafts, cap)) for cap in caps])
+    ladder_balance = numpy.array([crafts.chronos.balance] + caps)
+    ladder_tier = numpy.array([crafts.chronos.tier] + [int(math.log2(cap / crafts.chronos.base_cap) + 1) for cap in caps])
+    ladder_multiplier = SaveFrame.from_games([game]).replace(chronosBalance=ladder_balance).multiplier
+
+    steps = int(round(days * 24 / step_hours))
+    step_days = step_hours / 24
+    record_every = max(int(round(record_hours / step_hours)), 1)
+    add_seconds = 60 * game.shop.calculator3
+
+    earned = numpy.full(runs, float(game.hepts_after_ascension))
+    quarks = numpy.full(runs, float(game.total_quarks))
+
+    def state() -> Dict[str, numpy.ndarray]:
+        tier = numpy.searchsorted(cumulative_cost, earned, side="right") - 1
+        wow = shop.best_wow(quarks)
+        benefit = numpy.where(quarks > 5000, numpy.round(shop_benefit(wow[:, 0], wow[:, 1]), 3), 0)
+        multiplier = ladder_multiplier[tier]
+        return {
+            "tier_index": tier,
+            "benefit": benefit,
+            "hepts": earned - cumulative_cost[tier],
+            "chronos_tier": ladder_tier[tier],
+            "multiplier": multiplier,
+            "hept_per_day": benefit * conf.hps * multiplier * (86400 + conf.addUsesPerDay * add_seconds),
+            "total_quarks": quarks,
+        }
+
+    hours = []
+    recorded: Dict[str, list] = {name: [] for name in RECORDED}
+
+    current = state()
+    for step in range(steps + 1):
+        if step % record_every == 0 or step == steps:
+            hours.append(step * step_hours)
+            for name in RECORDED:
+                recorded[name].append(numpy.percentile(current[name], PERCENTILES))
+
+        if step == steps:
+            break
+
+        hps = conf.hps * _noise(rng, hps_cv, runs)
+        uses = conf.addUsesPerDay * step_days * _noise(rng, uses_cv, runs)
+        earned += current["benefit"] * hps * current["multiplier"] * (step_days * 86400 + uses * add_seconds)
+        quarks += quarks_per_day * step_days
+        current = state()
+
+    return Simulation(
+        hours=numpy.array(hours),
+        percentiles={name: numpy.array(values).T for name, values in recorded.items()},
+        final={name: current[name] for name in RECORDED},
+    )
+
+
+@logger.catch
+def main() -> None:
+    from rich.console import Console
+    from rich.table import Table
+    from rich import box
+
+    from synergisa import load_config, load_game, load_shop_data
+
+    parser = argparse.ArgumentParser(description="Simulate hepteract and quark income over time.")
+    parser.add_argument("file_path", help="path to the base64-encoded file")
+    parser.add_argument("--days", type=float, default=90)
+    parser.add_argument("--step-hours", type=float, default=1)
+    parser.add_argument("--runs", type=int, default=1, help="Monte Carlo runs")
+    parser.add_argument("--hps-cv", type=float, default=0, help="relative spread of hps per step")
+    parser.add_argument("--uses-cv", type=float, default=0, help="relative spread of add uses per step")
+    parser.add_argument("--quarks-per-day", type=float, default=0)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    shop = load_shop_data()
+    game, _ = load_game(args.file_path, load_config(), shop)
+
+    started = time.perf_counter()
+    sim = simulate(
+        game,
+        shop,
+        days=args.days,
+        step_hours=args.step_hours,
+        runs=args.runs,
+        hps_cv=args.hps_cv,
+        uses_cv=args.uses_cv,
+        quarks_per_day=args.quarks_per_day,
+        seed=args.seed,
+    )
+    logger.info(f"{args.runs} runs over {args.days} days in {time.perf_counter() - started:.2f}s")
+
+    low, mid, high = PERCENTILES
+    table = Table(box=box.MINIMAL_DOUBLE_HEAD, title=f"Simulation (p{mid} [p{low} - p{high}])", title_style="bold")
+    table.add_column("Day")
+    table.add_column("Chronos tier")
+    table.add_column("Multiplier")
+    table.add_column("Hept per day")
+    table.add_column("Banked hepts")
+
+    def cell(name: str, i: int, fmt: str) -> str:
+        p_low, p_mid, p_high = sim.percentiles[name][:, i]
+        if p_low == p_high:
+            return f"{p_mid:{fmt}}"
+        return f"{p_mid:{fmt}} [{p_low:{fmt}} - {p_high:{fmt}}]"
+
+    for i, hour in enumerate(sim.hours):
+        table.add_row(
+            f"{hour / 24:g}",
+            cell("chronos_tier", i, ".0f"),
+            cell("multiplier", i, ".3f"),
+            cell("hept_per_day", i, ".2e"),
+            cell("hepts", i, ".2e"),
+        )
+
+    Console().print(table)
+
+
+if __name__ == "__main__":
+    main()
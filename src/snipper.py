@@ -1,17 +1,189 @@
+import argparse
+import mmap
+import os
+import shutil
+import subprocess
 import sys
-from rich.prompt import Confirm
+import zipfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+# Most characters a spreadsheet cell holds.
+CELL_LIMITS = {"sheets": 50000, "excel": 32767}
+CHUNK_SIZE = 49000
+
+# Clipboard commands tried in order, the first one on PATH wins.
+CLIPBOARD_COMMANDS = (
+    ["wl-copy"],
+    ["xclip", "-selection", "clipboard"],
+    ["xsel", "--clipboard", "--input"],
+    ["pbcopy"],
+    ["clip.exe"],
+    ["clip"],
+)
+
+
+def chunks(buffer, size: int) -> Iterator[memoryview]:
+    """Consecutive ``size`` byte slices of ``buffer``, without copying."""
+    view = memoryview(buffer)
+    try:
+        for start in range(0, len(view), size):
+            yield view[start : start + size]
+    finally:
+        view.release()
+
+
+def part_name(stem: str, index: int, total: int) -> str:
+    """``<stem>.part01.txt`` style names, zero-padded so they sort in order."""
+    return f"{stem}.part{index + 1:0{max(len(str(total)), 2)}d}.txt"
+
+
+class Sink(ABC):
+    """Where the chunks go. ``write`` gets them in order, ``close`` runs once at the end."""
+
+    @abstractmethod
+    def write(self, index: int, total: int, chunk: memoryview) -> None:
+        """Take chunk ``index`` of ``total``. The view is only valid during the call."""
+
+    def close(self) -> None:
+        pass
+
+
+class ClipboardSink(Sink):
+    """Copy one chunk at a time, waiting for confirmation before the next."""
+
+    def __init__(self, confirm: bool = True) -> None:
+        self.command = self.find_command()
+        self.confirm = confirm
+
+    @staticmethod
+    def find_command() -> List[str]:
+        for command in CLIPBOARD_COMMANDS:
+            if shutil.which(command[0]):
+                return command
+        raise RuntimeError(f"No clipboard command found, install one of {', '.join(c[0] for c in CLIPBOARD_COMMANDS)}")
+
+    def write(self, index: int, total: int, chunk: memoryview) -> None:
+        subprocess.run(self.command, input=chunk, check=True)
+        print(f"Part {index + 1}/{total} ({len(chunk)} characters) copied to the clipboard")
+
+        if self.confirm and index + 1 < total:
+            from rich.prompt import Confirm
+
+            if not Confirm.ask("Next part?"):
+                raise KeyboardInterrupt
+
+
+class StdoutSink(Sink):
+    """Every chunk on its own line."""
+
+    def write(self, index: int, total: int, chunk: memoryview) -> None:
+        sys.stdout.buffer.write(chunk)
+        sys.stdout.buffer.write(b"\n")
+
+    def close(self) -> None:
+        sys.stdout.flush()
+
+
+class FilesSink(Sink):
+    """One numbered file per chunk."""
+
+    def __init__(self, out_dir: Path, stem: str) -> None:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        self.out_dir = out_dir
+        self.stem = stem
+
+    def write(self, index: int, total: int, chunk: memoryview) -> None:
+        with open(self.out_dir / part_name(self.stem, index, total), "wb") as file:
+            file.write(chunk)
+
+
+class ArchiveSink(Sink):
+    """All chunks as numbered members of one zip archive."""
+
+    def __init__(self, path: Path, stem: str, compress: bool = False) -> None:
+        self.stem = stem
+        self.archive = zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED)
+
+    def write(self, index: int, total: int, chunk: memoryview) -> None:
+        with self.archive.open(part_name(self.stem, index, total), "w") as member:
+            member.write(chunk)
+
+    def close(self) -> None:
+        self.archive.close()
+
+
+def snip(file_path: str, sink: Sink, size: int = CHUNK_SIZE) -> int:
+    """Split the save into ``size`` character chunks and hand them to ``sink``. Returns the number of chunks."""
+    count = 0
+    with open(file_path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            sink.close()
+            return 0
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            total = (len(mapped) + size - 1) // size
+            try:
+                for index, chunk in enumerate(chunks(mapped, size)):
+                    try:
+                        sink.write(index, total, chunk)
+                    finally:
+                        chunk.release()
+                    count += 1
+            finally:
+                sink.close()
+
+    return count
+
+
+def cell_limit(value: str) -> int:
+    return CELL_LIMITS[value] if value in CELL_LIMITS else int(value)
+
+
+def make_sink(kind: str, file_path: str, output: Optional[str], confirm: bool, compress: bool) -> Sink:
+    stem = Path(file_path).stem
+    if kind == "clipboard":
+        return ClipboardSink(confirm)
+    if kind == "stdout":
+        return StdoutSink()
+    if kind == "files":
+        return FilesSink(Path(output or "."), stem)
+    return ArchiveSink(Path(output or f"{stem}.zip"), stem, compress)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cut a save into spreadsheet-sized parts.")
+    parser.add_argument("file_path", help="path to the base64-encoded file")
+    parser.add_argument("--sink", choices=["clipboard", "stdout", "files", "zip"], default="clipboard")
+    parser.add_argument("-o", "--output", help="directory for files, archive path for zip")
+    parser.add_argument("--size", type=int, default=CHUNK_SIZE, help="characters per part")
+    parser.add_argument(
+        "--cell-limit",
+        type=cell_limit,
+        default=CELL_LIMITS["sheets"],
+        help="cap parts at a spreadsheet's cell size: sheets, excel or a number",
+    )
+    parser.add_argument("-y", "--yes", action="store_true", help="do not ask before copying the next part")
+    parser.add_argument("--compress", action="store_true", help="deflate the zip archive")
+    args = parser.parse_args()
+
+    size = min(args.size, args.cell_limit)
+    if size <= 0:
+        parser.error("--size and --cell-limit must be positive")
+
+    try:
+        sink = make_sink(args.sink, args.file_path, args.output, not args.yes, args.compress)
+    except RuntimeError as e:
+        parser.error(str(e))
+    try:
+        count = snip(args.file_path, sink, size)
+    except KeyboardInterrupt:
+        return
+
+    if args.sink != "stdout":
+        print(f"{count} part(s) of up to {size} characters", file=sys.stderr)
 
-import pandas as pd
 
 if __name__ == "__main__":
-    argc = len(sys.argv)
-    filename = sys.argv[1]
-
-    with open(filename, "r") as file:
-        while line := file.read(49000):
-            print(f"\n\n{line}\n\n")
-            df=pd.DataFrame([line])
-            df.to_clipboard(index=False,header=False)
-            if len(line) < 49000:
-                break
-            Confirm.ask("Next part?")
+    main()
@@ -0,0 +1,173 @@
+import argparse
+import csv
+import sys
+from typing import Dict, Sequence
+
+import numpy
+
+from save_frame import SaveFrame
+from save_layout import QuarkCost, ShopBuys, ShopQuarkCosts, SynergismConfig, SynergismGame, shop_benefit
+from shop_data import ShopData
+
+# Config fields no result reads, sweeping them would only repeat rows.
+UNUSED = ("targetGainPercent",)
+# Config fields a sweep can vary: the plain numbers and every shop item's quark cost terms.
+FIELDS = (
+    *(
+        name
+        for name, field in SynergismConfig.model_fields.items()
+        if field.annotation in (int, float) and name not in UNUSED
+    ),
+    *(f"shopQuarkCost.{item}.{term}" for item in ShopQuarkCosts.model_fields for term in ("base", "inc")),
+)
+# Result columns after the swept fields, in output order.
+RESULTS = (
+    "total_quarks",
+    "spare_quarks",
+    "accel1",
+    "accel2",
+    "accelCost",
+    "wow3",
+    "wowY",
+    "wowCost",
+    "shop_benefit_accel",
+    "shop_benefit_hept",
+    "multiplier",
+    "hept_per_day",
+    "powder_goal",
+)
+# The ones the table has room for, CSV has them all.
+SHOWN = ("total_quarks", "accel1", "accel2", "wow3", "wowY", "shop_benefit_hept", "hept_per_day", "powder_goal")
+
+
+def _is_int(path: str) -> bool:
+    if path.startswith("shopQuarkCost."):
+        return QuarkCost.model_fields[path.rpartition(".")[2]].annotation is int
+    return SynergismConfig.model_fields[path].annotation is int
+
+
+def parse_values(path: str, spec: str) -> numpy.ndarray:
+    """Values of a sweep axis: ``a,b,c``, ``start:stop:count`` (evenly spaced, inclusive) or ``start:stop:count:log``.
+
+    Integer fields are rounded, and repeats dropped.
+    """
+    parts = spec.split(":")
+    if len(parts) == 1:
+        values = numpy.array([float(value) for value in spec.split(",")])
+    elif len(parts) in (3, 4) and parts[3:] in ([], ["log"]):
+        start, stop, count = float(parts[0]), float(parts[1]), int(parts[2])
+        values = (numpy.geomspace if parts[3:] else numpy.linspace)(start, stop, count)
+    else:
+        raise ValueError(f"Bad values for {path}: {spec}, expected a,b,c or start:stop:count[:log]")
+
+    if _is_int(path):
+        return numpy.unique(numpy.round(values).astype(numpy.int64))
+    return values
+
+
+def sweep(game: SynergismGame, sd: ShopData, axes: Dict[str, Sequence[float]]) -> Dict[str, numpy.ndarray]:
+    """Shop buys and stats of ``game`` at every combination of the config values in ``axes``, one array per column.
+
+    ``game`` needs config and shop benefits set. Nothing is re-decoded or
+    re-validated: the combinations are rows of one ``SaveFrame``, the quark
+    totals move by the closed-form cost of the swept shop items and the tiers
+    come from ``ShopBuys.batch``. Columns are the swept fields, in the last
+    one fastest, then ``RESULTS``.
+    """
+    if game.config is None:
+        raise ValueError("Config not set")
+    unknown = set(axes) - set(FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown config fields: {', '.join(sorted(unknown))}")
+
+    grids = numpy.meshgrid(*(numpy.asarray(values) for values in axes.values()), indexing="ij")
+    columns: Dict[str, numpy.ndarray] = {path: grid.ravel() for path, grid in zip(axes, grids)}
+    rows = grids[0].size if grids else 1
+
+    def value(path: str) -> numpy.ndarray:
+        return columns[path] if path in columns else numpy.full(rows, game.get_path(f"config.{path}"))
+
+    # Only the swept items' share of the quarks spent changes, the rest of the total stays.
+    total = numpy.full(rows, game.total_quarks, dtype=numpy.int64)
+    for item in {path.split(".")[1] for path in axes if path.startswith("shopQuarkCost.")}:
+        level = getattr(game.shop, item) - item.endswith("Auto")
+        base = value(f"shopQuarkCost.{item}.base").astype(numpy.int64)
+        inc = value(f"shopQuarkCost.{item}.inc").astype(numpy.int64)
+        total += (base + inc * level) * level // 2 - getattr(game.config.shopQuarkCost, item).quark_cost(level)
+    columns["total_quarks"] = total
+    columns["spare_quarks"] = total - numpy.floor(value("quarkKeep")).astype(numpy.int64)
+
+    buys = ShopBuys.batch(sd, total)
+    columns.update(buys)
+    # Same thresholds as SynergismGame.set_shop_benefits.
+    columns["shop_benefit_accel"] = numpy.where(total > 2000, numpy.round(shop_benefit(buys["accel1"], buys["accel2"]), 3), 0)
+    columns["shop_benefit_hept"] = numpy.where(total > 5000, numpy.round(shop_benefit(buys["wow3"], buys["wowY"]), 3), 0)
+
+    frame = SaveFrame.from_games([game]).replace(
+        hps=value("hps"), addUsesPerDay=value("addUsesPerDay"), shop_benefit_hept=columns["shop_benefit_hept"]
+    )
+    with numpy.errstate(all="ignore"):
+        columns["multiplier"] = numpy.broadcast_to(frame.multiplier, rows)
+        columns["hept_per_day"] = frame.hept_per_day
+        columns["powder_goal"] = frame.powder_goal
+    return columns
+
+
+def main() -> None:
+    from synergisa import load_config, load_game, load_shop_data
+
+    parser = argparse.ArgumentParser(description="Evaluate a save over a grid of config values.")
+    parser.add_argument("file_path", help="path to the base64-encoded file")
+    parser.add_argument(
+        "-s",
+        "--set",
+        action="append",
+        required=True,
+        metavar="FIELD=VALUES",
+        help="config field and its values, as a,b,c or start:stop:count[:log], e.g. hps=4e8:6e8:5; repeatable",
+    )
+    parser.add_argument("--csv", action="store_true", help="print every combination as CSV instead of a table")
+    parser.add_argument("--sort", choices=RESULTS, help="order by this column, largest first")
+    parser.add_argument("--limit", type=int, default=50, help="rows shown in the table")
+    args = parser.parse_args()
+
+    axes: Dict[str, numpy.ndarray] = {}
+    for option in args.set:
+        path, _, spec = option.partition("=")
+        if path not in FIELDS:
+            parser.error(f"unknown field {path}, expected one of {', '.join(FIELDS)}")
+        try:
+            axes[path] = parse_values(path, spec)
+        except ValueError as e:
+            parser.error(str(e))
+
+    conf, sd = load_config(), load_shop_data()
+    game, _ = load_game(args.file_path, conf, sd)
+    columns = sweep(game, sd, axes)
+
+    order = numpy.argsort(-columns[args.sort], kind="stable") if args.sort else numpy.arange(len(columns["total_quarks"]))
+
+    if args.csv:
+        names = list(columns)
+        writer = csv.writer(sys.stdout)
+        writer.writerow(names)
+        writer.writerows(zip(*(columns[name][order].tolist() for name in names)))
+        return
+
+    from rich.console import Console
+    from rich.table import Table
+    from rich import box
+
+    names = [*axes, *SHOWN]
+    table = Table(box=box.MINIMAL_DOUBLE_HEAD, title=f"Sweep of {len(order):,} combinations", title_style="bold")
+    for name in names:
+        table.add_column(name.removeprefix("shopQuarkCost."), justify="right")
+    for i in order[: args.limit]:
+        table.add_row(*(f"{columns[name][i]:,.6g}" for name in names))
+    if len(order) > args.limit:
+        table.caption = f"First {args.limit} rows, --csv prints all of them"
+    Console().print(table)
+
+
+if __name__ == "__main__":
+    main()
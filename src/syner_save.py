@@ -1,12 +1,83 @@
-import base64
+import argparse
+import json
+import os
 import sys
+from typing import Any, BinaryIO, List
+
+from save_decoder import decode_chunks, parse_path, query_save
+
+
+def format_value(value: Any, raw: bool) -> str:
+    if raw and isinstance(value, str):
+        return value
+    return json.dumps(value)
+
+
+def dump(file: BinaryIO, out: BinaryIO) -> None:
+    """Write the decoded save to ``out`` chunk by chunk."""
+    for chunk in decode_chunks(file):
+        out.write(chunk)
+    out.write(b"\n")
+
+
+def get(file: BinaryIO, paths: List[str], raw: bool, label: str) -> bool:
+    """Print the values at ``paths``. False if an exact path is missing."""
+    found = query_save(file, paths)
+    # One exact path prints bare values, anything else prints each value after its path.
+    bare = len(paths) == 1 and "*" not in parse_path(paths[0])
+
+    for path, value in found:
+        line = format_value(value, raw) if bare else f"{'.'.join(path)}\t{format_value(value, raw)}"
+        print(f"{label}{line}")
+
+    seen = {path for path, _ in found}
+    missing = [path for path in paths if "*" not in parse_path(path) and parse_path(path) not in seen]
+    for path in missing:
+        print(f"{label}{path}: not found", file=sys.stderr)
+    return not missing
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Decode a base64-encoded save, or pull values out of it.")
+    parser.add_argument("file_paths", nargs="+", help="paths to base64-encoded saves")
+    parser.add_argument(
+        "-g",
+        "--get",
+        action="append",
+        metavar="PATH",
+        help="dotted path such as 'hepteractCrafts.chronos.BAL', '*' matches any key or index; repeatable",
+    )
+    parser.add_argument("-r", "--raw", action="store_true", help="print strings without quotes")
+    parser.add_argument("-o", "--output", help="write the decoded save here instead of stdout")
+    args = parser.parse_args()
+
+    if args.get and args.output:
+        parser.error("--output only applies when decoding whole saves")
+    if args.output and len(args.file_paths) > 1:
+        parser.error("--output takes a single save")
+
+    ok = True
+    for file_path in args.file_paths:
+        label = f"{file_path}:" if len(args.file_paths) > 1 else ""
+        try:
+            with open(file_path, "rb") as file:
+                if args.get:
+                    ok = get(file, args.get, args.raw, label) and ok
+                elif args.output:
+                    with open(args.output, "wb") as out:
+                        dump(file, out)
+                else:
+                    dump(file, sys.stdout.buffer)
+        except BrokenPipeError:
+            # The reader, ``head`` and the like, went away. Stop quietly.
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            sys.exit(1)
+        except (OSError, ValueError) as e:
+            print(f"{file_path}: {e}", file=sys.stderr)
+            ok = False
+
+    sys.exit(0 if ok else 1)
+
 
 if __name__ == "__main__":
-    argc = len(sys.argv)
-    filename = sys.argv[1]
-
-    with open(filename, "rb") as file:
-        encoded = file.read()
-        decoded = base64.b64decode(encoded)
-        decoded_str = decoded.decode('utf-8')
-        print(decoded_str)
+    main()
@@ -1,35 +1,87 @@
+# Imported first, the import stage is timed from the profiler's origin.
+from profiler import instrument, profiler, stage
+
 import argparse
-import base64
+import csv
 import json
+import os
+import sys
+import time
 from pathlib import Path
-from typing import List, Tuple
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
 from functools import cached_property
-import pandas
-
-
-from rich.console import Console
-from rich.table import Table
-from rich.columns import Columns
-from rich.panel import Panel
-from rich.text import Text
-from rich import box
-from loguru import logger
 
+from hept_planner import OBJECTIVES, CraftPlan, plan_crafts
+from save_cache import DEFAULT_PATH as DEFAULT_CACHE_PATH, SaveCache
 from save_layout import Hepteract, ShopBuys, ShopUpgrades, HepteractCrafts, SynergismConfig, SynergismGame
+import shop_data
+from shop_planner import OBJECTIVES as SHOP_OBJECTIVES, ShopPlan, plan_shop
 
-console = Console()
+# rich, loguru and the watcher are imported where they are used, so the
+# --json/--csv path starts without them (see benchmarks/startup.py).
+if TYPE_CHECKING:
+    from rich.console import Group
+    from rich.table import Table
+
+_IMPORTED = time.perf_counter()
 
 DATA_PATH = Path(__file__).parent.parent / "data"
 
+# One cache for the whole process, so its periodic rescans count every put. SYNERGISA_CACHE moves it
+# out of data/cache, e.g. for benchmarks/startup.py.
+_save_cache = SaveCache(os.environ.get("SYNERGISA_CACHE") or DEFAULT_CACHE_PATH)
+
+
+def load_config() -> SynergismConfig:
+    with open(f"{DATA_PATH}/inputs.json", "r") as file:
+        game_config_json = json.load(file)
+
+    return SynergismConfig(**game_config_json)
+
+
+def load_shop_data() -> shop_data.ShopData:
+    return shop_data.load_shop_data(DATA_PATH)
+
+
+def build_game(
+    parsed_data: Dict[str, Any], conf: SynergismConfig, sd: shop_data.ShopData, trusted: bool = False
+) -> Tuple[SynergismGame, ShopBuys]:
+    """Validate a decoded save (or trust it, see ``SynergismGame.from_trusted``) and wire up config and shop benefits."""
+    with stage("validate"):
+        game = SynergismGame.from_trusted(parsed_data) if trusted else SynergismGame(**parsed_data)
+    return _wire(game, conf, sd)
+
+
+def load_game(
+    file_path: str, conf: SynergismConfig, sd: shop_data.ShopData, trusted: bool = False
+) -> Tuple[SynergismGame, ShopBuys]:
+    """``build_game`` for a save on disk, through the cache of decoded saves (see ``save_cache``)."""
+    game, buys, _ = load_hashed_game(file_path, conf, sd, trusted)
+    return game, buys
+
+
+def load_hashed_game(
+    file_path: str, conf: SynergismConfig, sd: shop_data.ShopData, trusted: bool = False
+) -> Tuple[SynergismGame, ShopBuys, str]:
+    """``load_game`` and the ``content_hash`` of the very bytes that were decoded, even if the file changed since."""
+    game, save_hash = _save_cache.load(file_path, trusted)
+    return (*_wire(game, conf, sd), save_hash)
 
-def load_base64_file(file_path):
-    with open(file_path, "rb") as file:
-        encoded_data = file.read()
-        decoded_data = base64.b64decode(encoded_data)
-        return decoded_data
+
+def _wire(game: SynergismGame, conf: SynergismConfig, sd: shop_data.ShopData) -> Tuple[SynergismGame, ShopBuys]:
+    game.set_config(conf)
+
+    with stage("shop_buys"):
+        buys = ShopBuys(sd, game.total_quarks)
+    game.set_shop_benefits(buys)
+
+    return game, buys
 
 
-def print_balances(game: SynergismGame) -> List[Table]:
+def print_balances(game: SynergismGame) -> List["Table"]:
+    from rich import box
+    from rich.table import Table
+
     misc_stats = Table(box=box.MINIMAL_DOUBLE_HEAD, title="Misc Items", title_style="bold")
     misc_stats.add_column("Stat")
     misc_stats.add_column("Value")
@@ -66,38 +118,59 @@ def print_balances(game: SynergismGame) -> List[Table]:
     return [hepts_table, cubes, misc_stats]
 
 
-def check_ratios(game: SynergismGame) -> Tuple[Table, List[str]]:
+def hept_ratios(game: SynergismGame) -> Dict[str, int]:
+    return {
+        "chronos_accel": int(game.hepts.chronos.cap / game.hepts.accelerator.cap),
+        "chronos_challenge": int(game.hepts.chronos.cap / game.hepts.challenge.cap),
+        "hyper_challenge": int(game.hepts.hyperrealism.cap / game.hepts.challenge.cap),
+        "accel_mult": int(game.hepts.accelerator.cap / game.hepts.multiplier.cap),
+        "boost_mult": int(game.hepts.acceleratorBoost.cap / game.hepts.multiplier.cap),
+    }
+
+
+def ratio_messages(ratios: Dict[str, int]) -> List[str]:
+    """Warnings for the ``hept_ratios`` that are off, plain strings so the --json/--csv report needs no rich."""
+    messages: List[str] = []
+
+    if ratios["chronos_accel"] != 32:
+        messages.append(f"Chronos to Accelerator ratio is {ratios['chronos_accel']:d} instead of 32")
+    if ratios["chronos_challenge"] != 4:
+        messages.append(f"Chronos to Challenge ratio is {ratios['chronos_challenge']:d} instead of 4")
+    if ratios["hyper_challenge"] != 2:
+        messages.append(f"Hyper to Challenge ratio is {ratios['hyper_challenge']:d} instead of 2")
+    if ratios["accel_mult"] != 4:
+        messages.append(f"Accel to Multiplier ratio is {ratios['accel_mult']} instead of 4")
+    if ratios["boost_mult"] != 2:
+        messages.append(f"Boost to Multiplier ratio is {ratios['boost_mult']} instead of 2")
+
+    return messages
+
+
+def game_messages(game: SynergismGame) -> List[str]:
+    """What the dashboard's Messages panel says: the ratio warnings, then whether to level Chronos."""
+    messages = ratio_messages(hept_ratios(game))
+    messages.append("Level Chronos!" if game.orbs_to_powder_goal <= 0 else "Dunno yet!")
+    return messages
+
+
+def check_ratios(game: SynergismGame) -> "Table":
+    from rich import box
+    from rich.table import Table
+
     ratios = Table(box=box.MINIMAL_DOUBLE_HEAD)
     ratios.add_column("Ratio")
     ratios.add_column("Value")
 
-    chronos_accel_ratio = int(game.hepts.chronos.cap / game.hepts.accelerator.cap)
-    chronos_challenge_ratio = int(game.hepts.chronos.cap / game.hepts.challenge.cap)
-    hyper_challenge_ratio = int(game.hepts.hyperrealism.cap / game.hepts.challenge.cap)
-    accel_mult_ratio = int(game.hepts.accelerator.cap / game.hepts.multiplier.cap)
-    boost_mult_ratio = int(game.hepts.acceleratorBoost.cap / game.hepts.multiplier.cap)
-
-    messages: List[str] = []
+    values = hept_ratios(game)
+    chronos_accel_ratio = values["chronos_accel"]
+    chronos_challenge_ratio = values["chronos_challenge"]
+    hyper_challenge_ratio = values["hyper_challenge"]
+    accel_mult_ratio = values["accel_mult"]
+    boost_mult_ratio = values["boost_mult"]
 
-    e_chronos_accel = False
-    e_chronos_challenge_hyper = False
-    e_accel_mult_boost = False
-
-    if chronos_accel_ratio != 32:
-        messages.append(f"Chronos to Accelerator ratio is {chronos_accel_ratio:d} instead of 32")
-        e_chronos_accel = True
-    if chronos_challenge_ratio != 4:
-        messages.append(f"Chronos to Challenge ratio is {chronos_challenge_ratio:d} instead of 4")
-        e_chronos_challenge_hyper = True
-    if hyper_challenge_ratio != 2:
-        messages.append(f"Hyper to Challenge ratio is {hyper_challenge_ratio:d} instead of 2")
-        e_chronos_challenge_hyper = True
-    if accel_mult_ratio != 4:
-        messages.append(f"Accel to Multiplier ratio is {accel_mult_ratio} instead of 4")
-        e_accel_mult_boost = True
-    if boost_mult_ratio != 2:
-        messages.append(f"Boost to Multiplier ratio is {boost_mult_ratio} instead of 2")
-        e_accel_mult_boost = True
+    e_chronos_accel = chronos_accel_ratio != 32
+    e_chronos_challenge_hyper = chronos_challenge_ratio != 4 or hyper_challenge_ratio != 2
+    e_accel_mult_boost = accel_mult_ratio != 4 or boost_mult_ratio != 2
 
     ratios.add_row("Chronos/Accel:", f"{'[bold red]' if e_chronos_accel else ''}{int(chronos_accel_ratio)}/1")
     ratios.add_row(
@@ -108,10 +181,13 @@ def check_ratios(game: SynergismGame) -> Tuple[Table, List[str]]:
         "Accel/Boost/Mult:", f"{'[bold red]' if e_accel_mult_boost else ''}{accel_mult_ratio:d}/{boost_mult_ratio:d}/1"
     )
 
-    return ratios, messages
+    return ratios
+
 
+def calculated_stats(game: SynergismGame) -> "Table":
+    from rich import box
+    from rich.table import Table
 
-def calculated_stats(game: SynergismGame) -> Table:
     stats = Table(title="Calculated Stats", box=box.MINIMAL_DOUBLE_HEAD)
     stats.add_column("Stat")
     stats.add_column("Value")
@@ -133,7 +209,10 @@ def calculated_stats(game: SynergismGame) -> Table:
     return stats
 
 
-def print_buys(buys: ShopBuys, game: SynergismGame) -> Table:
+def print_buys(buys: ShopBuys, game: SynergismGame) -> "Table":
+    from rich import box
+    from rich.table import Table
+
     buys_table = Table(box=box.MINIMAL_DOUBLE_HEAD, show_header=False)
     buys_table.add_column("", style="bold")
     buys_table.add_column("Item 1")
@@ -150,53 +229,335 @@ def print_buys(buys: ShopBuys, game: SynergismGame) -> Table:
     return buys_table
 
 
-@logger.catch
-def main() -> None:
-    logger.opt(colors=True)
+def game_report(game: SynergismGame, buys: ShopBuys) -> Dict[str, Any]:
+    """The dashboard data as plain JSON-serializable values."""
+    hepts = game.hepts_after_ascension
+    quarks = game.total_quarks - game.config.quark_keep
+    ratios = hept_ratios(game)
+
+    return {
+        "balances": {
+            "challenge15Exponent": game.challenge15Exponent,
+            "overfluxOrbs": game.overfluxOrbs,
+            "overfluxPowder": game.overfluxPowder,
+            "singularityCount": game.singularityCount,
+            "wowCubes": game.wowCubes,
+            "wowTesseracts": game.wowTesseracts,
+            "wowHypercubes": game.wowHypercubes,
+            "wowPlatonicCubes": game.wowPlatonicCubes,
+            "wowAbyssals": game.wowAbyssals,
+        },
+        "hepteracts": {
+            hept_type: {
+                "tier": getattr(game.hepts, hept_type).tier,
+                "balance": getattr(game.hepts, hept_type).balance,
+                "buyable": getattr(game.hepts, hept_type).buyable(hepts, quarks),
+            }
+            for hept_type in HepteractCrafts.model_fields.keys()
+        },
+        "stats": {
+            "chronos_percent": game.chronos_percent,
+            "chronos_percent_next": game.chronos_percent_next,
+            "chronos_increase": game.chronos_increase,
+            "chronos_to_level": game.hepts.chronos.to_level,
+            "multiplier": game.multiplier,
+            "current_ascension_timer": game.current_ascension_timer,
+            "total_quarks": game.total_quarks,
+            "hepts_small_inc": game.hepts_small_inc,
+            "hept_per_day": game.hept_per_day,
+            "orb_to_powder": game.orb_to_powder,
+            "cube_from_powder": game.cube_from_powder,
+            "powder_goal": game.powder_goal,
+            "orbs_to_powder_goal": game.orbs_to_powder_goal,
+        },
+        "ratios": ratios,
+        "buys": {
+            "accel1": buys.accel1,
+            "accel2": buys.accel2,
+            "shop_benefit_accel": game.shop_benefit_accel,
+            "wow3": buys.wow3,
+            "wowY": buys.wowY,
+            "shop_benefit_hept": game.shop_benefit_hept,
+        },
+        "messages": game_messages(game),
+    }
+
+
+def print_plan(plan: CraftPlan) -> "Table":
+    from rich import box
+    from rich.table import Table
+
+    plan_table = Table(
+        box=box.MINIMAL_DOUBLE_HEAD,
+        title=f"Craft plan ({plan.objective} {plan.baseline:.3f} -> {plan.value:.3f})",
+        title_style="bold",
+    )
+    plan_table.add_column("Craft")
+    plan_table.add_column("Tier")
+    plan_table.add_column("Hepts")
+    plan_table.add_column("Quarks")
 
-    parser = argparse.ArgumentParser(description="Decode a base64-encoded file.")
-    parser.add_argument("file_path", help="path to the base64-encoded file")
-    args = parser.parse_args()
+    for step in plan.steps:
+        plan_table.add_row(step.craft.title(), f"{step.from_tier} -> {step.to_tier}", f"{step.hepts:.2e}", f"{step.quarks:d}")
 
-    decoded_data = load_base64_file(args.file_path)
+    plan_table.add_row("Left", "", f"{plan.hepts_left:.2e}", f"{plan.quarks_left:d}", style="bold")
 
-    parsed_data = json.loads(decoded_data)
-    # print(json.dumps(parsed_data, indent=4, sort_keys=True))
+    return plan_table
 
-    with open(f"{DATA_PATH}/inputs.json", "r") as file:
-        game_config_json = json.load(file)
 
-    game = SynergismGame(**parsed_data)
-    conf = SynergismConfig(**game_config_json)
+def print_shop_plan(plan: ShopPlan) -> "Table":
+    from rich import box
+    from rich.table import Table
 
-    game.set_config(conf)
+    plan_table = Table(
+        box=box.MINIMAL_DOUBLE_HEAD,
+        title=f"Shop plan ({plan.objective} {plan.baseline:.3e} -> {plan.value:.3e})",
+        title_style="bold",
+    )
+    plan_table.add_column("Upgrade")
+    plan_table.add_column("Level")
+    plan_table.add_column("Quarks")
+    plan_table.add_column("Gain")
 
-    sd = pandas.read_excel(f"{DATA_PATH}/Data.xlsx", sheet_name="Shop", header=[0, 1], engine="openpyxl")
-    buys = ShopBuys(sd, game.total_quarks)
-    game.set_shop_benefits(buys)
+    for step in plan.steps:
+        plan_table.add_row(step.item, f"{step.from_level} -> {step.to_level}", f"{step.quarks:d}", f"{step.gain:+.2%}")
+
+    plan_table.add_row("Left", "", f"{plan.quarks_left:d}", "", style="bold")
+
+    return plan_table
+
+
+def dashboard(game: SynergismGame, buys: ShopBuys) -> "Group":
+    from rich import box
+    from rich.columns import Columns
+    from rich.console import Group
+    from rich.panel import Panel
+    from rich.rule import Rule
+    from rich.text import Text
 
     balances = print_balances(game)
 
     stats = calculated_stats(game)
 
-    console.print(Columns(balances, equal=True))
-    console.rule()
-    console.print(stats)
-
-    console.rule()
-    ratios, messages = check_ratios(game)
+    ratios = check_ratios(game)
     buys_table = print_buys(buys, game)
 
-    console.print(Columns([ratios, buys_table], equal=True))
+    messages_print = Text("\n".join(game_messages(game)))
+
+    return Group(
+        Columns(balances, equal=True),
+        Rule(),
+        stats,
+        Rule(),
+        Columns([ratios, buys_table], equal=True),
+        Panel(messages_print, title="Messages", box=box.DOUBLE, expand=False),
+    )
 
-    if game.orbs_to_powder_goal <= 0:
-        messages.append("Level Chronos!")
+
+def print_profile() -> "Table":
+    from rich import box
+    from rich.table import Table
+
+    profile_table = Table(box=box.MINIMAL_DOUBLE_HEAD, title="Profile", title_style="bold")
+    profile_table.add_column("Stage")
+    profile_table.add_column("Calls", justify="right")
+    profile_table.add_column("Total", justify="right")
+    profile_table.add_column("Per call", justify="right")
+    profile_table.add_column("Allocated", justify="right")
+
+    for stats in profiler.summary():
+        profile_table.add_row(
+            stats.name,
+            f"{stats.calls:d}",
+            f"{stats.seconds * 1000:.3f} ms",
+            f"{stats.seconds / stats.calls * 1000:.3f} ms",
+            f"{stats.allocated / 1024:,.1f} KiB",
+        )
+
+    return profile_table
+
+
+def watch(
+    file_path: str,
+    conf: SynergismConfig,
+    sd: shop_data.ShopData,
+    tick: float = 1.0,
+    on_load: Optional[Callable[[SynergismGame, str], None]] = None,
+    extras: Optional[Callable[[SynergismGame], List["Table"]]] = None,
+) -> None:
+    """Keep the dashboard live, re-decoding the save whenever it changes.
+
+    Between changes the view is re-rendered every ``tick`` seconds so the
+    wall-clock based values (ascension timer, hepts after ascension) move.
+    ``on_load`` is called with every game decoded, the first one included,
+    and the hash of the save it came from. ``extras`` builds the tables shown
+    under the dashboard (the plans), once per game decoded.
+    """
+    from rich.console import Console, Group
+    from rich.live import Live
+    from loguru import logger
+    from watcher import FileWatcher
+
+    def load() -> Tuple[SynergismGame, ShopBuys, List["Table"]]:
+        game, buys, save_hash = load_hashed_game(file_path, conf, sd)
+        if on_load is not None:
+            on_load(game, save_hash)
+        return game, buys, extras(game) if extras is not None else []
+
+    game, buys, tables = load()
+
+    with FileWatcher(file_path) as watcher, Live(Group(dashboard(game, buys), *tables), console=Console(), auto_refresh=False) as live:
+        while True:
+            if watcher.wait(tick):
+                try:
+                    game, buys, tables = load()
+                except Exception as e:  # noqa: BLE001 - keep showing the last good save
+                    logger.warning(f"Could not reload {file_path}: {e}")
+
+            live.update(Group(dashboard(game, buys), *tables), refresh=True)
+
+
+def snapshot_saver(db: Optional[str], player: str) -> Callable[[SynergismGame, str], None]:
+    """Callback storing a snapshot of a game and its save hash in the history database each time it is called."""
+    from history import DEFAULT_PATH, History
+
+    history = History(db or DEFAULT_PATH)
+
+    def remember(game: SynergismGame, save_hash: str) -> None:
+        history.append(game, save_hash, player)
+
+    return remember
+
+
+def flatten(value: Any, prefix: str = "") -> Dict[str, Any]:
+    """Nested dicts and lists as one level of dotted keys, for CSV."""
+    if isinstance(value, dict):
+        items = value.items()
+    elif isinstance(value, list) and not all(isinstance(v, str) for v in value):
+        items = enumerate(value)
     else:
-        messages.append("Dunno yet!")
+        return {prefix: "; ".join(value) if isinstance(value, list) else value}
+
+    flat: Dict[str, Any] = {}
+    for key, item in items:
+        flat.update(flatten(item, f"{prefix}.{key}" if prefix else str(key)))
+    return flat
 
-    messages_print = Text("\n".join(messages))
 
-    console.print(Panel(messages_print, title="Messages", box=box.DOUBLE, expand=False))
+def write_report(report: Dict[str, Any], fmt: str) -> None:
+    if fmt == "json":
+        json.dump(report, sys.stdout)
+        sys.stdout.write("\n")
+    else:
+        row = flatten(report)
+        writer = csv.DictWriter(sys.stdout, fieldnames=list(row))
+        writer.writeheader()
+        writer.writerow(row)
+
+
+def main() -> None:
+    try:
+        run()
+    except Exception:  # noqa: BLE001 - same as logger.catch, without loading loguru up front
+        from loguru import logger
+
+        logger.opt(exception=True).error("An error has been caught in function 'main'")
+
+
+def run() -> None:
+    parser = argparse.ArgumentParser(description="Decode a base64-encoded file.")
+    parser.add_argument("file_path", help="path to the base64-encoded file")
+    parser.add_argument("--watch", action="store_true", help="stay open and refresh whenever the save changes")
+    parser.add_argument("--plan", choices=OBJECTIVES, help="also plan the hepteract cap upgrades maximizing this")
+    parser.add_argument("--shop-plan", choices=SHOP_OBJECTIVES, help="also plan the quark shop upgrades maximizing this")
+    parser.add_argument("--quarks", type=int, help="quarks --shop-plan spends, the ones above quark_keep by default")
+    parser.add_argument("--profile", action="store_true", help="print where the time and memory went")
+    parser.add_argument("--trace", metavar="OUT_JSON", help="write a Chrome trace-event file of the run")
+    parser.add_argument(
+        "--history",
+        nargs="?",
+        const="",
+        metavar="DB",
+        help="also store a snapshot of the save in the history database (data/history.sqlite by default)",
+    )
+    parser.add_argument("--player", default="default", help="whose snapshots --history stores")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--json", dest="fmt", action="store_const", const="json", help="print the report as JSON, no tables")
+    output.add_argument("--csv", dest="fmt", action="store_const", const="csv", help="print the report as one CSV row")
+    args = parser.parse_args()
+    if args.watch and args.fmt:
+        parser.error(f"--watch keeps the dashboard live and cannot print --{args.fmt}")
+
+    if args.profile or args.trace:
+        profiler.enable()
+        profiler.record("imports", profiler.origin, _IMPORTED)
+        instrument(SynergismGame)
+
+    with stage("load_config"):
+        conf = load_config()
+    with stage("load_shop_data"):
+        sd = load_shop_data()
+
+    remember = None
+    if args.history is not None:
+        remember = snapshot_saver(args.history or None, args.player)
+
+    if args.watch:
+        def plans(game: SynergismGame) -> List["Table"]:
+            tables = []
+            if args.plan:
+                tables.append(print_plan(plan_crafts(game, args.plan)))
+            if args.shop_plan:
+                tables.append(print_shop_plan(plan_shop(game, sd, args.shop_plan, args.quarks)))
+            return tables
+
+        try:
+            watch(args.file_path, conf, sd, on_load=remember, extras=plans)
+        except KeyboardInterrupt:
+            pass
+        return
+
+    game, buys, save_hash = load_hashed_game(args.file_path, conf, sd)
+    if remember is not None:
+        with stage("history"):
+            remember(game, save_hash)
+
+    plan = None
+    if args.plan:
+        with stage("plan"):
+            plan = plan_crafts(game, args.plan)
+    shop_plan = None
+    if args.shop_plan:
+        with stage("shop_plan"):
+            shop_plan = plan_shop(game, sd, args.shop_plan, args.quarks)
+
+    if args.fmt:
+        with stage("report"):
+            report = game_report(game, buys)
+            if plan is not None:
+                report["plan"] = plan.model_dump()
+            if shop_plan is not None:
+                report["shop_plan"] = shop_plan.model_dump()
+            write_report(report, args.fmt)
+    else:
+        from rich.console import Console
+
+        console = Console()
+        with stage("render"):
+            console.print(dashboard(game, buys))
+        if plan is not None:
+            console.print(print_plan(plan))
+        if shop_plan is not None:
+            console.print(print_shop_plan(shop_plan))
+
+    if args.profile:
+        from rich.console import Console
+
+        # Keep machine-readable stdout clean.
+        Console(stderr=bool(args.fmt)).print(print_profile())
+    if args.trace:
+        profiler.write_trace(args.trace)
+        print(f"Trace written to {args.trace}", file=sys.stderr)
 
 
 if __name__ == "__main__":
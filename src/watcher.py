@@ -0,0 +1,123 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from loguru import logger
+
+# From <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+
+_EVENT = struct.Struct("iIII")
+
+
+class _Inotify:
+    """Minimal inotify binding watching the directory of one file, so rename-over saves are seen too."""
+
+    def __init__(self, path: Path) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd: int = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        if libc.inotify_add_watch(self.fd, os.fsencode(path.parent), mask) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path.parent}")
+
+        self.name = os.fsencode(path.name)
+
+    def wait(self, timeout: float) -> bool:
+        """True if the file was touched within ``timeout`` seconds."""
+        deadline = time.monotonic() + timeout
+        while True:
+            readable, _, _ = select.select([self.fd], [], [], max(deadline - time.monotonic(), 0))
+            if not readable:
+                return False
+
+            data = os.read(self.fd, 64 * 1024)
+            offset = 0
+            touched = False
+            while offset < len(data):
+                _, _, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                touched = touched or data[offset : offset + length].rstrip(b"\0") == self.name
+                offset += length
+
+            if touched:
+                return True
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class FileWatcher:
+    """Waits for a file to change, through inotify where available and polling otherwise.
+
+    Changes are debounced: a burst of writes is reported once, after the file
+    has been quiet for ``debounce`` seconds.
+    """
+
+    def __init__(self, path: Union[str, Path], debounce: float = 0.5, poll_interval: float = 1.0) -> None:
+        self.path = Path(path).resolve()
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+
+        self._inotify: Optional[_Inotify] = None
+        try:
+            self._inotify = _Inotify(self.path)
+        except (OSError, AttributeError, TypeError) as e:
+            logger.info(f"inotify unavailable ({e}), polling {self.path} every {poll_interval}s")
+
+        self._stamp = self._stat()
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _touched(self, timeout: float) -> bool:
+        if self._inotify is not None:
+            return self._inotify.wait(timeout)
+
+        deadline = time.monotonic() + timeout
+        while True:
+            stamp = self._stat()
+            if stamp != self._stamp:
+                self._stamp = stamp
+                return True
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self.poll_interval, remaining))
+
+    def wait(self, timeout: float) -> bool:
+        """Block up to ``timeout`` seconds, True if the file changed (and settled) meanwhile."""
+        if not self._touched(timeout):
+            return False
+
+        while self._touched(self.debounce):
+            pass
+
+        return self.path.exists()
+
+    def close(self) -> None:
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def __enter__(self) -> "FileWatcher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,66 @@
+import base64
+import json
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+sys.path[:0] = [str(ROOT / "src"), str(ROOT / "benchmarks")]
+
+import save_layout  # noqa: E402
+import synergisa  # noqa: E402
+from save_cache import SaveCache  # noqa: E402
+from save_layout import SynergismConfig, SynergismGame  # noqa: E402
+from shop_data import ShopData  # noqa: E402
+from synthetic import make_saves  # noqa: E402
+
+# Synthetic saves per test run, spread over Chronos tiers and quark balances.
+SAVES = 24
+
+
+@pytest.fixture(scope="session")
+def conf() -> SynergismConfig:
+    return synergisa.load_config()
+
+
+@pytest.fixture(scope="session")
+def sd() -> ShopData:
+    return synergisa.load_shop_data()
+
+
+@pytest.fixture(scope="session")
+def raw_saves() -> List[bytes]:
+    """Base64 saves as the game exports them."""
+    return make_saves(SAVES, seed=1, padding=50)
+
+
+@pytest.fixture(scope="session")
+def saves(raw_saves) -> List[Dict[str, Any]]:
+    """The same saves decoded, as ``json`` sees them."""
+    return [json.loads(base64.b64decode(save)) for save in raw_saves]
+
+
+@pytest.fixture
+def games(saves, conf, sd) -> List[SynergismGame]:
+    """Validated games with config and shop benefits set, fresh for every test."""
+    return [synergisa.build_game(data, conf, sd)[0] for data in saves]
+
+
+@pytest.fixture(autouse=True)
+def save_cache(tmp_path, monkeypatch) -> SaveCache:
+    """Keep ``load_game`` from writing to data/cache."""
+    cache = SaveCache(tmp_path / "cache")
+    monkeypatch.setattr(synergisa, "_save_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def frozen(monkeypatch) -> int:
+    """Stop the clock the games read, so the ascension timer holds still. Returns now in ms."""
+    now = time.time()
+    monkeypatch.setattr(save_layout, "time", SimpleNamespace(time=lambda: now))
+    return int(now * 1000)
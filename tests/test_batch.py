@@ -0,0 +1,101 @@
+import csv
+import io
+import json
+import sys
+
+import pytest
+
+import batch
+from batch import ROW_FIELDS, RowWriter, evaluate_save, evaluate_saves, find_saves
+
+# Row values that do not move with the clock.
+STEADY = ("total_quarks", "multiplier", "hept_per_day", "powder_goal", "orbs_to_powder_goal")
+
+
+@pytest.fixture
+def save_dir(tmp_path, raw_saves):
+    """Ten saves and a broken one, in a directory with a subdirectory and a stray file."""
+    saves = tmp_path / "saves"
+    (saves / "old").mkdir(parents=True)
+    for i, raw in enumerate(raw_saves[:10]):
+        (saves / f"save{i:02d}.txt").write_bytes(raw)
+    (saves / "save10.txt").write_bytes(b"bm90IGEgc2F2ZQ==")
+    (saves / "old" / "save99.txt").write_bytes(raw_saves[10])
+    (saves / "notes.md").write_text("not a save")
+    return saves
+
+
+def test_rows_match_the_games(save_dir, games, frozen):
+    batch._init_worker()
+    conf = batch._worker["config"]
+    paths = [str(save_dir / f"save{i:02d}.txt") for i in range(10)]
+    rows = [evaluate_save(path) for path in paths]
+    for path, game, row in zip(paths, games, rows):
+        assert row == {
+            "save": path,
+            **{name: getattr(game, name) for name in STEADY},
+            **{
+                f"buyable_{name}": getattr(game.hepts, name).buyable(game.hepts_after_ascension, game.total_quarks - conf.quark_keep)
+                for name in game.hepts.model_fields
+            },
+        }
+
+    batch._init_worker(trusted=True)
+    assert [evaluate_save(path) for path in paths] == rows
+
+
+def test_broken_save_is_reported_in_its_row(save_dir, tmp_path):
+    batch._init_worker()
+    row = evaluate_save(str(save_dir / "save10.txt"))
+    assert set(row) == {"save", "error"}
+    assert row["error"].startswith(("ValueError", "UnicodeDecodeError", "JSONDecodeError"))
+    assert "FileNotFoundError" in evaluate_save(str(tmp_path / "missing.txt"))["error"]
+
+
+def test_find_saves(save_dir):
+    top = [str(save_dir / f"save{i:02d}.txt") for i in range(11)]
+    assert find_saves(str(save_dir), "*.txt") == top
+    assert find_saves(str(save_dir)) == sorted([*top, str(save_dir / "notes.md")])
+    assert find_saves(str(save_dir / "**" / "*.txt")) == sorted([*top, str(save_dir / "old" / "save99.txt")])
+    assert find_saves(str(save_dir / "nothing*")) == []
+
+
+def test_pool_keeps_input_order(save_dir):
+    paths = find_saves(str(save_dir), "*.txt")
+    # One worker means a window of four, smaller than the batch.
+    rows = list(evaluate_saves(paths, workers=1))
+    assert [row["save"] for row in rows] == paths
+    assert ["error" in row for row in rows] == [False] * 10 + [True]
+
+    batch._init_worker()
+    for row, path in zip(rows, paths):
+        local = evaluate_save(path)
+        assert {name: row.get(name) for name in (*STEADY, "error")} == {name: local.get(name) for name in (*STEADY, "error")}
+
+
+def test_row_writer():
+    rows = [{"save": "a", "multiplier": 1.5, "extra": 1}, {"save": "b", "error": "ValueError: bad"}]
+
+    out = io.StringIO()
+    writer = RowWriter(out, "csv")
+    for row in rows:
+        writer.write(row)
+    read = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert list(read[0]) == ROW_FIELDS
+    assert (read[0]["multiplier"], read[0]["error"], read[1]["error"]) == ("1.5", "", "ValueError: bad")
+
+    out = io.StringIO()
+    writer = RowWriter(out, "jsonl")
+    for row in rows:
+        writer.write(row)
+    assert [json.loads(line) for line in out.getvalue().splitlines()] == rows
+
+
+def test_main_writes_csv(save_dir, tmp_path, monkeypatch):
+    output = tmp_path / "results.csv"
+    monkeypatch.setattr(sys, "argv", ["batch.py", str(save_dir), "--pattern", "*.txt", "-o", str(output), "-j", "2"])
+    batch.main()
+    with open(output, newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert [row["save"] for row in rows] == find_saves(str(save_dir), "*.txt")
+    assert [bool(row["error"]) for row in rows] == [False] * 10 + [True]
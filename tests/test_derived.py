@@ -0,0 +1,92 @@
+import math
+
+import pytest
+
+from save_layout import SynergismGame, derived
+
+DERIVED = tuple(name for name, attr in vars(SynergismGame).items() if isinstance(attr, derived))
+
+# One change per input of the dependency graph: path -> new value from the old one.
+CHANGES = {
+    "achievements.256": lambda value: 1 - value,
+    "achievements.262": lambda value: 1 - value,
+    "ascensionCount": lambda value: value * 7 + 1,
+    "challenge15Exponent": lambda value: value * 3,
+    "config.addUsesPerDay": lambda value: value + 5,
+    "config.hps": lambda value: value * 1.5,
+    "config.shopQuarkCost.chronometer.inc": lambda value: value + 10,
+    "hepts.chronos.balance": lambda value: value / 3,
+    "hepts.chronos.base_cap": lambda value: value * 2,
+    "hepts.chronos.cap": lambda value: value * 2,
+    "overfluxOrbs": lambda value: value * 2,
+    "overfluxPowder": lambda value: value * 5,
+    "platonicUpgrades.14": lambda value: value + 3,
+    "platonicUpgrades.16": lambda value: value + 3,
+    "platonicUpgrades.19": lambda value: value + 3,
+    "quarksLeft": lambda value: value * 2 + 1e7,
+    **{f"shop.{name}": (lambda value: value + 7) for name in (
+        "antSpeed", "calculator3", "cashGrab", "chronometer", "chronometer2", "chronometer3", "obtainiumAuto",
+        "obtainiumEX", "offeringAuto", "offeringEX", "powderEX", "seasonPass", "seasonPass2", "seasonPass3", "seasonPassY",
+    )},
+    "shop_benefit_hept": lambda value: value + 0.5,
+    "usedCorruptions.3": lambda value: value + 2,
+}
+
+
+def stats(game: SynergismGame) -> dict:
+    values = {name: getattr(game, name) for name in DERIVED}
+    values["powder_solution"] = values["powder_solution"].root
+    return values
+
+
+def rebuilt(game: SynergismGame) -> SynergismGame:
+    """The same game validated from scratch, nothing cached."""
+    fresh = SynergismGame(**game.model_dump(by_alias=True, exclude={"config", "shop_benefit_hept", "shop_benefit_accel"}))
+    fresh.set_config(game.config)
+    fresh.shop_benefit_hept = game.shop_benefit_hept
+    fresh.shop_benefit_accel = game.shop_benefit_accel
+    return fresh
+
+
+def same(a, b) -> bool:
+    return a == b or (isinstance(a, float) and math.isnan(a) and math.isnan(b))
+
+
+def test_changes_cover_the_graph():
+    inputs = set(SynergismGame._dependents)
+    covered = {source for source in inputs for path in CHANGES if path == source or path.startswith(source + ".")}
+    assert covered == inputs
+
+
+def has(game: SynergismGame, path: str) -> bool:
+    try:
+        game.get_path(path)
+    except IndexError:  # a short achievements or platonicUpgrades list
+        return False
+    return True
+
+
+@pytest.mark.parametrize("path", CHANGES)
+def test_update_matches_rebuilt_game(games, path):
+    tested = [game for game in games if has(game, path)][:6]
+    assert tested
+    for game in tested:
+        config = game.config
+        stats(game)  # fill every cache first
+        game.update(path, CHANGES[path](game.get_path(path)))
+
+        expected = stats(rebuilt(game))
+        actual = stats(game)
+        stale = [name for name in DERIVED if not same(actual[name], expected[name])]
+        assert not stale, f"{path} left {stale} stale"
+        # Shared nested models are copied, not mutated.
+        assert path.startswith("config.") == (game.config is not config)
+
+
+def test_what_if_restores(games):
+    game = next(game for game in games if all(has(game, path) for path in CHANGES))
+    before = stats(game)
+    with game.what_if({path: CHANGES[path](game.get_path(path)) for path in CHANGES}):
+        assert stats(game) != before
+    assert stats(game) == before
+    assert stats(rebuilt(game)) == before
@@ -0,0 +1,150 @@
+import itertools
+import math
+import time
+
+import pytest
+
+from hept_planner import FREE_CRAFTS, LINKED_CAPS, OBJECTIVES, plan_crafts
+from save_layout import HepteractCrafts
+
+BUDGETS = (0, 10**4, 10**7, 10**10, 10**13)
+
+
+def set_budget(game, now, hepts):
+    """Leave exactly ``hepts`` to spend: no time since the save, none on the ascension timer."""
+    game.update("saveTime", now)
+    game.update("ascensionCounter", 0)
+    game.update("wowAbyssals", hepts)
+    assert game.hepts_after_ascension == hepts
+
+
+def targets(hept, hepts, quarks):
+    """Every ``(doublings, hepts, quarks)`` of one craft within budget, doubling by doubling."""
+    options = []
+    for doublings in itertools.count():
+        cap = hept.cap * 2**doublings
+        cost, quark_cost = hept.cost_to_cap(cap), hept.quark_cost_to_cap(cap)
+        if cost > hepts or quark_cost > quarks:
+            return options
+        options.append((doublings, cost, quark_cost))
+
+
+def linked_targets(crafts, hepts):
+    """Every affordable Chronos doubling at which all linked crafts land on a doubling of their own cap."""
+    options = []
+    for doublings in range(64):
+        chronos_cap = crafts.chronos.cap * 2**doublings
+        steps = {name: math.log2(chronos_cap * ratio / getattr(crafts, name).cap) for name, ratio in LINKED_CAPS.items()}
+        if any(step < 0 or not step.is_integer() for step in steps.values()):
+            continue
+        cost = sum(getattr(crafts, name).cost_to_cap(chronos_cap * ratio) for name, ratio in LINKED_CAPS.items())
+        if cost > hepts:
+            break
+        options.append((chronos_cap, cost, {name: int(step) for name, step in steps.items()}))
+    return options
+
+
+def brute_force(game, objective):
+    """Best objective over every affordable combination of linked and free doublings."""
+    crafts = game.hepts
+    hepts = game.hepts_after_ascension
+    quarks = max(game.total_quarks - game.config.quark_keep, 0)
+    tiers = sum(getattr(crafts, name).tier for name in HepteractCrafts.model_fields)
+
+    best = tiers if objective == "tiers" else getattr(game, objective)
+    for chronos_cap, cost, doublings in linked_targets(crafts, hepts):
+        if objective != "tiers":
+            with game.what_if({"hepts.chronos.balance": chronos_cap, "hepts.chronos.cap": chronos_cap}):
+                best = max(best, getattr(game, objective))
+            continue
+        best = max(best, tiers + sum(doublings.values()))
+
+    if objective != "tiers":
+        return best
+
+    quark, abyss = (getattr(crafts, name) for name in FREE_CRAFTS)
+    for _, linked_cost, doublings in [(None, 0, {}), *linked_targets(crafts, hepts)]:
+        for quark_doublings, quark_cost, quark_quarks in [(-1, 0, 0), *targets(quark, hepts - linked_cost, quarks)]:
+            left = hepts - linked_cost - quark_cost
+            for abyss_doublings, _, _ in [(-1, 0, 0), *targets(abyss, left, 0)]:
+                # -1 is no craft at all, 0 fills the current cap without a new tier.
+                best = max(best, tiers + sum(doublings.values()) + max(quark_doublings, 0) + max(abyss_doublings, 0))
+    return best
+
+
+def check_plan(game, plan):
+    crafts = game.hepts
+    hepts = game.hepts_after_ascension
+    quarks = max(game.total_quarks - game.config.quark_keep, 0)
+
+    assert plan.hepts_left == hepts - sum(step.hepts for step in plan.steps) >= 0
+    assert plan.quarks_left == quarks - sum(step.quarks for step in plan.steps) >= 0
+    for step in plan.steps:
+        hept = getattr(crafts, step.craft)
+        assert step.from_tier == hept.tier <= step.to_tier
+        cap = hept.cap * 2 ** (step.to_tier - step.from_tier)
+        assert (step.hepts, step.quarks) == (hept.cost_to_cap(cap), hept.quark_cost_to_cap(cap))
+
+    # Linked crafts move together or not at all, and land on their ratio to Chronos.
+    linked = {step.craft: step for step in plan.steps if step.craft in LINKED_CAPS}
+    if linked:
+        chronos_cap = crafts.chronos.cap * 2 ** (linked["chronos"].to_tier - linked["chronos"].from_tier)
+        for name, ratio in LINKED_CAPS.items():
+            hept = getattr(crafts, name)
+            step = linked.get(name)
+            cap = hept.cap * 2 ** (step.to_tier - step.from_tier) if step else hept.cap
+            assert cap == chronos_cap * ratio
+
+
+@pytest.mark.parametrize("objective", OBJECTIVES)
+def test_plan_matches_brute_force(games, frozen, objective):
+    for game in games[:6]:
+        for hepts in (*BUDGETS, int(game.wowAbyssals)):
+            set_budget(game, frozen, hepts)
+            before = game.model_dump()
+            plan = plan_crafts(game, objective)
+            assert game.model_dump() == before
+
+            check_plan(game, plan)
+            assert plan.value == brute_force(game, objective)
+            assert plan.value >= plan.baseline
+
+
+def test_no_spendable_quarks(games, frozen):
+    for game in games[:6]:
+        set_budget(game, frozen, 10**13)
+        game.update("config.quarkKeep", game.total_quarks + 1)
+        plan = plan_crafts(game, "tiers")
+        check_plan(game, plan)
+        assert plan.quarks_left == 0
+        assert all(step.quarks == 0 for step in plan.steps)
+        # The quark craft costs quarks to fill at all, so it stays where it is.
+        assert "quark" not in {step.craft for step in plan.steps}
+        assert plan.value == brute_force(game, "tiers")
+
+
+@pytest.mark.parametrize("objective", OBJECTIVES)
+def test_full_crafts_and_no_hepts(games, frozen, objective):
+    game = games[0]
+    for name in HepteractCrafts.model_fields:
+        game.update(f"hepts.{name}.balance", getattr(game.hepts, name).cap)
+    set_budget(game, frozen, 0)
+
+    plan = plan_crafts(game, objective)
+    assert plan.steps == []
+    assert plan.value == plan.baseline
+    assert plan.hepts_left == 0
+
+
+def test_deep_budgets_plan_quickly(games, frozen):
+    started = time.perf_counter()
+    for game in games:
+        set_budget(game, frozen, 10**18)
+        for objective in OBJECTIVES:
+            plan_crafts(game, objective)
+    assert (time.perf_counter() - started) / (len(games) * len(OBJECTIVES)) < 0.1
+
+
+def test_unknown_objective(games):
+    with pytest.raises(ValueError):
+        plan_crafts(games[0], "powder_goal")
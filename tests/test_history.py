@@ -0,0 +1,56 @@
+import numpy
+import pytest
+
+from history import COLUMNS, STATS, History, add_saves
+
+
+@pytest.fixture
+def history(tmp_path):
+    with History(tmp_path / "history.sqlite") as history:
+        yield history
+
+
+@pytest.fixture
+def save_files(tmp_path, raw_saves):
+    paths = []
+    for i, save in enumerate(raw_saves[:5]):
+        path = tmp_path / f"save{i}.txt"
+        path.write_bytes(save)
+        paths.append(str(path))
+    return paths
+
+
+def test_snapshots_hold_the_stats(history, games):
+    for i, game in enumerate(games):
+        assert history.append(game, f"hash{i}")
+    data = history.query()
+    order = numpy.argsort([game.saveTime for game in games], kind="stable")
+    assert data["save_time"].tolist() == [games[i].saveTime for i in order]
+    for name in STATS:
+        numpy.testing.assert_array_equal(data[name], [getattr(games[i], name) for i in order])
+
+
+def test_duplicates_are_per_player(history, games):
+    game = games[0]
+    assert history.append(game, "a", "alice")
+    assert not history.append(game, "a", "alice")
+    # The same save for someone else is a new snapshot.
+    assert history.append(game, "a", "bob")
+    assert history.players() == ["alice", "bob"]
+
+
+def test_time_range(history, games):
+    for i, game in enumerate(games):
+        history.append(game, f"hash{i}")
+    times = sorted(game.saveTime for game in games)
+    since, until = times[3], times[10]
+    assert history.query(since=since, until=until, columns=["multiplier"])["save_time"].tolist() == times[3:10]
+    assert len(history.query(since=numpy.int64(until))["save_time"]) == len(times) - 10
+
+
+def test_add_saves_stores_each_save_once_per_player(history, save_files):
+    assert add_saves(history, save_files) == len(save_files)
+    assert add_saves(history, save_files) == 0
+    assert add_saves(history, save_files, player="bob") == len(save_files)
+    assert len(history) == 2 * len(save_files)
+
@@ -0,0 +1,63 @@
+import math
+
+import numpy
+import pytest
+
+import powder_solver
+from powder_solver import diminishing_exponent, diminishing_exponent_scalar, solve_fixed_point, solve_fixed_point_scalar
+
+
+@pytest.fixture(scope="module")
+def inputs():
+    rng = numpy.random.default_rng(0)
+    count = 2000
+    inc = 10 ** rng.uniform(-12, 12, count)
+    u44 = rng.integers(0, 20, count).astype(numpy.float64)
+    start = 10 ** rng.uniform(-2, 10, count)
+    # No solution without a positive inc, and starts at or below 1 need the fallback guess.
+    inc[:20] = -1
+    inc[20:30] = 0
+    start[30:60] = 0.5
+    return inc, u44, start
+
+
+def test_scalar_matches_array(inputs):
+    inc, u44, start = inputs
+    array = solve_fixed_point(inc, diminishing_exponent(u44), start)
+    for i in range(len(inc)):
+        scalar = solve_fixed_point_scalar(float(inc[i]), diminishing_exponent_scalar(float(u44[i])), float(start[i]))
+        if math.isnan(array.root[i]):
+            assert math.isnan(scalar.root) and not scalar.converged
+            continue
+        assert scalar.root == pytest.approx(array.root[i], rel=1e-10)
+        assert scalar.converged == array.converged[i]
+
+
+def test_root_is_the_fixed_point(inputs):
+    inc, u44, start = inputs
+    exponent = diminishing_exponent(u44)
+    solution = solve_fixed_point(inc, exponent, start)
+    valid = inc > 0
+    assert solution.converged[valid].all() and not solution.converged[~valid].any()
+    # x = inc / (x ** exponent - 1), in the log form the solver uses.
+    root = solution.root[valid]
+    numpy.testing.assert_allclose(numpy.log(root) + numpy.log(numpy.expm1(exponent[valid] * numpy.log(root))), numpy.log(inc[valid]), atol=1e-9)
+
+
+def test_converging_on_the_last_iteration_counts(monkeypatch):
+    args = (2.36e-06, diminishing_exponent_scalar(0), 965499.42)
+    needed = solve_fixed_point_scalar(*args).iterations
+    assert needed > 1
+
+    monkeypatch.setattr(powder_solver, "MAX_ITERATIONS", needed)
+    assert solve_fixed_point_scalar(*args).converged
+    assert solve_fixed_point(*args).converged
+    monkeypatch.setattr(powder_solver, "MAX_ITERATIONS", needed - 1)
+    assert not solve_fixed_point_scalar(*args).converged
+    assert not solve_fixed_point(*args).converged
+
+
+def test_exponent_without_cancellation():
+    for u44 in (0, 1, 7, 19):
+        assert diminishing_exponent_scalar(u44) == pytest.approx(float(diminishing_exponent(u44)), rel=1e-15)
+        assert diminishing_exponent_scalar(u44) == pytest.approx((1 + 0.0000001 / 2) ** ((1 / 6) + u44 / 750) - 1, rel=1e-6)
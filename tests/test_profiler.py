@@ -0,0 +1,137 @@
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+from functools import cached_property
+
+import pytest
+
+import profiler as profiler_module
+import synergisa
+from profiler import Profiler, instrument, profiled
+
+
+@pytest.fixture
+def enabled(monkeypatch):
+    """The shared profiler switched on with empty stats, without allocation tracing."""
+    shared = profiler_module.profiler
+    monkeypatch.setattr(shared, "enabled", True)
+    monkeypatch.setattr(shared, "stats", {})
+    monkeypatch.setattr(shared, "events", [])
+    return shared
+
+
+def test_disabled_stages_cost_nothing():
+    disabled = Profiler()
+    assert disabled.stage("a") is disabled.stage("b") is profiler_module._NOOP
+    with disabled.stage("a"):
+        pass
+    assert disabled.stats == {} and disabled.events == []
+
+    @profiled()
+    def double(x):
+        return 2 * x
+
+    events = len(profiler_module.profiler.events)
+    assert double(4) == 8
+    assert len(profiler_module.profiler.events) == events
+
+
+def test_nested_stages_are_inclusive():
+    timed = Profiler()
+    timed.enabled = True
+    for _ in range(3):
+        with timed.stage("outer"):
+            time.sleep(0.01)
+            with timed.stage("inner"):
+                time.sleep(0.02)
+
+    outer, inner = timed.stats["outer"], timed.stats["inner"]
+    assert (outer.calls, inner.calls) == (3, 3)
+    assert outer.seconds >= inner.seconds + 0.03 and inner.seconds >= 0.06
+    assert [stats.name for stats in timed.summary()] == ["outer", "inner"]
+    assert len(timed.events) == 6
+
+
+def test_failed_stage_is_still_recorded():
+    timed = Profiler()
+    timed.enabled = True
+    with pytest.raises(KeyError):
+        with timed.stage("broken"):
+            raise KeyError("x")
+    assert timed.stats["broken"].calls == 1
+
+
+def test_allocations_are_traced():
+    was_tracing = tracemalloc.is_tracing()
+    timed = Profiler()
+    timed.enable()
+    try:
+        with timed.stage("allocate"):
+            kept = bytearray(1 << 20)
+        with timed.stage("free"):
+            del kept
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    assert timed.stats["allocate"].allocated >= 1 << 20
+    assert timed.stats["free"].allocated <= -(1 << 20)
+
+
+def test_trace_events(tmp_path):
+    timed = Profiler()
+    timed.enabled = True
+    timed.record("late", timed.origin + 2, timed.origin + 3)
+    with timed.stage("early"):
+        pass
+    timed.write_trace(str(tmp_path / "trace.json"))
+
+    trace = json.loads((tmp_path / "trace.json").read_text())
+    events = trace["traceEvents"]
+    assert [event["name"] for event in events] == ["early", "late"]
+    assert events[1]["ts"] == pytest.approx(2e6) and events[1]["dur"] == pytest.approx(1e6)
+    assert all(event["ph"] == "X" and event["pid"] == os.getpid() for event in events)
+    assert events[0]["dur"] == pytest.approx(timed.stats["early"].seconds * 1e6)
+
+
+def test_profiled_and_instrumented(enabled):
+    class Model:
+        calls = 0
+
+        @property
+        def plain(self):
+            return 1
+
+        @cached_property
+        def cached(self):
+            Model.calls += 1
+            return 2
+
+    instrument(Model)
+    # Instrumenting again must not time everything twice.
+    instrument(Model)
+
+    @profiled("double")
+    def double(x):
+        return 2 * x
+
+    model = Model()
+    assert (model.plain, model.plain, model.cached, model.cached, double(3)) == (1, 1, 2, 2, 6)
+    assert {name: stats.calls for name, stats in enabled.stats.items()} == {"Model.plain": 2, "Model.cached": 1, "double": 1}
+    assert Model.calls == 1
+
+
+def test_profile_and_trace_run(tmp_path, raw_saves):
+    save = tmp_path / "save.txt"
+    save.write_bytes(raw_saves[0])
+    trace = tmp_path / "trace.json"
+    subprocess.run(
+        [sys.executable, str(synergisa.DATA_PATH.parent / "src" / "synergisa.py"), str(save), "--json", "--profile", "--trace", str(trace)],
+        env={**os.environ, "SYNERGISA_CACHE": str(tmp_path / "cache")},
+        capture_output=True,
+        check=True,
+    )
+    names = {event["name"] for event in json.loads(trace.read_text())["traceEvents"]}
+    assert {"imports", "decode", "validate", "SynergismGame.multiplier"} <= names
@@ -0,0 +1,182 @@
+import io
+import os
+
+import pytest
+
+import save_cache
+from profiler import profiler
+from save_cache import SaveCache, dump, from_arrays, parse, to_arrays
+from save_decoder import content_hash
+from save_layout import SCHEMA_VERSION, SynergismGame
+
+
+@pytest.fixture
+def models(saves):
+    """Validated games without config, as the cache stores them."""
+    return [SynergismGame(**data) for data in saves]
+
+
+def entries(cache):
+    return sorted(path for path in cache.path.iterdir() if path.suffix == ".bin")
+
+
+def size_on_disk(cache):
+    return sum(path.stat().st_size for path in entries(cache))
+
+
+def test_arrays_round_trip(models):
+    for game in models:
+        assert from_arrays(to_arrays(game)).model_dump() == game.model_dump()
+        for validated in (True, False):
+            arrays, stored = parse(dump(to_arrays(game), validated))
+            assert stored is validated
+            assert from_arrays(arrays).model_dump() == game.model_dump()
+
+
+def test_parse_rejects_other_files():
+    for blob in (b"", b"not a save", b"SYNSAVE1"):
+        with pytest.raises(ValueError):
+            parse(blob)
+
+
+def test_load_hits_the_cache(tmp_path, raw_saves, models):
+    cache = SaveCache(tmp_path / "cache")
+    path = tmp_path / "save.txt"
+    for raw, expected in zip(raw_saves[:5], models):
+        path.write_bytes(raw)
+        game, save_hash = cache.load(path)
+        assert save_hash == content_hash(io.BytesIO(raw))
+        assert game.model_dump() == expected.model_dump()
+
+        assert cache.get(save_hash).model_dump() == expected.model_dump()
+        hit, hit_hash = cache.load(path)
+        assert hit_hash == save_hash
+        assert hit.model_dump() == expected.model_dump()
+    assert len(entries(cache)) == 5
+
+
+def test_validated_get_skips_trusted_entries(tmp_path, models):
+    cache = SaveCache(tmp_path / "cache")
+    cache.put("trusted", models[0], validated=False)
+    assert cache.get("trusted") is None
+    assert cache.get("trusted", validated=False).model_dump() == models[0].model_dump()
+    cache.put("checked", models[0])
+    assert cache.get("checked", validated=False) is not None
+
+
+def test_size_stays_under_the_cap(tmp_path, models):
+    entry = len(dump(to_arrays(models[0]), True))
+    cache = SaveCache(tmp_path / "cache", max_bytes=entry * 10)
+    for i in range(60):
+        cache.put(f"save{i}", models[i % len(models)])
+        assert size_on_disk(cache) <= cache.max_bytes
+        assert cache._read_size() == size_on_disk(cache)
+    # Least recently used first: the last puts are still there.
+    assert cache.get("save59") is not None
+    assert cache.get("save0") is None
+
+
+def test_gets_keep_entries_alive(tmp_path, models):
+    entry = len(dump(to_arrays(models[0]), True))
+    cache = SaveCache(tmp_path / "cache", max_bytes=entry * 3)
+    for i in range(3):
+        cache.put(f"save{i}", models[0])
+        os.utime(cache._entry(f"save{i}"), ns=(i * 10**9, i * 10**9))
+    assert cache.get("save0") is not None
+    cache.put("save3", models[0])
+    assert cache.get("save0") is not None
+    assert cache.get("save1") is None
+
+
+def test_replacing_an_entry_keeps_the_tally(tmp_path, models):
+    cache = SaveCache(tmp_path / "cache")
+    for game in models[:5]:
+        cache.put("same", game)
+    assert len(entries(cache)) == 1
+    assert cache._read_size() == size_on_disk(cache)
+
+
+def test_rescan_catches_up_with_other_processes(tmp_path, models, monkeypatch):
+    monkeypatch.setattr(save_cache, "EVICT_EVERY", 4)
+    cache = SaveCache(tmp_path / "cache")
+    for i in range(3):
+        cache.put(f"save{i}", models[0])
+    # Another process evicted behind this one's back.
+    cache._entry("save0").unlink()
+    cache.put("save3", models[0])
+    assert cache._read_size() == size_on_disk(cache)
+
+
+def test_other_schema_versions_are_deleted(tmp_path, models):
+    cache = SaveCache(tmp_path / "cache")
+    cache.put("current", models[0])
+    old = cache.path / f"current.v{SCHEMA_VERSION - 1}.bin"
+    old.write_bytes(b"old")
+    unrelated = cache.path / "notes.txt"
+    unrelated.write_text("kept")
+    cache.evict()
+    assert not old.exists()
+    assert unrelated.exists()
+    assert entries(cache) == [cache._entry("current")]
+
+
+def test_unwritable_cache_still_loads(tmp_path, raw_saves, models):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    cache = SaveCache(blocker / "cache")
+    path = tmp_path / "save.txt"
+    path.write_bytes(raw_saves[0])
+    with pytest.raises(OSError):
+        cache.put("save", models[0])
+    game, save_hash = cache.load(path)
+    assert game.model_dump() == models[0].model_dump()
+    assert save_hash == content_hash(io.BytesIO(raw_saves[0]))
+
+
+def test_entries_are_world_readable(tmp_path, models):
+    cache = SaveCache(tmp_path / "cache")
+    cache.put("save", models[0])
+    assert cache._entry("save").stat().st_mode & 0o777 == 0o644
+
+
+def test_load_times_each_step(tmp_path, raw_saves, monkeypatch):
+    monkeypatch.setattr(profiler, "enabled", True)
+    monkeypatch.setattr(profiler, "stats", {})
+    monkeypatch.setattr(profiler, "events", [])
+    cache = SaveCache(tmp_path / "cache")
+    path = tmp_path / "save.txt"
+    path.write_bytes(raw_saves[0])
+
+    cache.load(path)
+    assert {name: stats.calls for name, stats in profiler.stats.items()} == {
+        "cache_lookup": 1,
+        "decode": 1,
+        "validate": 1,
+        "cache_write": 1,
+    }
+    cache.load(path)
+    assert profiler.stats["cache_lookup"].calls == 2
+    assert profiler.stats["decode"].calls == 1
+
+
+def test_save_rewritten_while_loading_is_read_again(tmp_path, raw_saves, models, monkeypatch):
+    cache = SaveCache(tmp_path / "cache")
+    path = tmp_path / "save.txt"
+    path.write_bytes(raw_saves[0])
+    decode_save, decoded = save_cache.decode_save, []
+
+    def rewriting_decode(file):
+        if not decoded:
+            # The game exports again, in place, between the hash and the decode.
+            with open(path, "r+b") as rewrite:
+                rewrite.write(raw_saves[1])
+                rewrite.truncate()
+            file.seek(0)
+        decoded.append(decode_save(file))
+        return decoded[-1]
+
+    monkeypatch.setattr(save_cache, "decode_save", rewriting_decode)
+    game, save_hash = cache.load(path)
+    assert len(decoded) == 2
+    assert save_hash == content_hash(io.BytesIO(raw_saves[1]))
+    assert game.model_dump() == models[1].model_dump()
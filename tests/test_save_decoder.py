@@ -0,0 +1,160 @@
+import base64
+import io
+import json
+import sys
+
+import pytest
+
+import syner_save
+from save_decoder import content_hash, decode_save, model_keys, parse_path, query_save
+from save_layout import SynergismGame
+
+# Chunk sizes small enough to cut numbers, escapes and multi-byte characters at every offset.
+CHUNK_SIZES = (1, 3, 4, 7, 64, 1 << 20)
+
+TRICKY = {
+    "skipped": {"nested": [[], {}, [1, [2, [3]]], {"a": "}]{["}], "empty": ""},
+    "escapes": 'quote \\" backslash \\\\ unicode \\u00e9 slash \\/',
+    "wanted": {"text": "Hepteract ✨ 日本", "numbers": [-0.0, 1e-300, 1.7976931348623157e308, 12345678901234567890]},
+    "skipped_string": "]]]}}}\",{",
+    "float": 3.141592653589793,
+    "int": -42,
+    "literals": [True, False, None],
+    "last_skipped": 1e10,
+}
+
+
+def encode(data, wrap: int = 0) -> bytes:
+    encoded = base64.b64encode(json.dumps(data, ensure_ascii=False).encode())
+    if wrap:
+        # Line-wrapped exports, as some clipboards produce.
+        encoded = b"\r\n".join(encoded[i : i + wrap] for i in range(0, len(encoded), wrap)) + b"\n"
+    return encoded
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+@pytest.mark.parametrize("keys", [set(TRICKY), {"wanted", "float", "int", "literals", "escapes"}, {"int"}, {"missing"}])
+def test_tricky_document(chunk_size, keys):
+    decoded = decode_save(io.BytesIO(encode(TRICKY, wrap=76)), keys, chunk_size)
+    assert decoded == {key: value for key, value in TRICKY.items() if key in keys}
+
+
+@pytest.mark.parametrize("chunk_size", (7, 4096, 1 << 20))
+def test_saves_match_json(raw_saves, saves, chunk_size):
+    keys = model_keys(SynergismGame)
+    for raw, data in zip(raw_saves, saves):
+        assert decode_save(io.BytesIO(raw), chunk_size=chunk_size) == {key: data[key] for key in keys if key in data}
+
+
+def test_truncated_save_raises():
+    encoded = encode(TRICKY)
+    with pytest.raises(ValueError):
+        decode_save(io.BytesIO(encoded[: len(encoded) // 2 // 4 * 4]), chunk_size=16)
+
+
+def test_content_hash_ignores_whitespace():
+    plain = encode(TRICKY)
+    assert content_hash(io.BytesIO(plain)) == content_hash(io.BytesIO(encode(TRICKY, wrap=60)))
+    assert content_hash(io.BytesIO(plain), chunk_size=5) == content_hash(io.BytesIO(plain))
+    assert content_hash(io.BytesIO(plain)) != content_hash(io.BytesIO(encode({**TRICKY, "int": 43})))
+
+
+def walk(value, pattern, prefix=()):
+    """``(path, value)`` pairs at ``pattern`` in a ``json.loads`` result, visiting keys in document order."""
+    if not pattern:
+        return [(prefix, value)]
+    if isinstance(value, dict):
+        items = list(value.items())
+    elif isinstance(value, list):
+        items = [(str(i), item) for i, item in enumerate(value)]
+    else:
+        return []
+    return [found for key, item in items if pattern[0] in ("*", key) for found in walk(item, pattern[1:], prefix + (key,))]
+
+
+def preorder(value, patterns):
+    """Every match of any pattern, parents before children, in document order."""
+    order = {}
+
+    def number(node, path):
+        order[path] = len(order)
+        children = node.items() if isinstance(node, dict) else enumerate(node) if isinstance(node, list) else ()
+        for key, child in children:
+            number(child, path + (str(key),))
+
+    number(value, ())
+    return sorted(walk_all(value, patterns), key=lambda found: order[found[0]])
+
+
+def canonical(found):
+    return sorted((path, json.dumps(value)) for path, value in found)
+
+
+def walk_all(value, paths):
+    return [found for path in paths for found in walk(value, parse_path(path))]
+
+
+# Paths into TRICKY; none of a group's matches sits inside another, so document order is well defined.
+QUERIES = (
+    ["int"],
+    ["wanted.numbers.1"],
+    ["wanted.*"],
+    ["skipped.nested.*.a", "literals.2"],
+    ["skipped.nested.2.1.1.0", "escapes"],
+    ["*.text", "float"],
+    ["*"],
+    [""],
+    ["last_skipped", "skipped_string", "wanted.text"],
+    ["missing", "int.deeper", "wanted.missing", "literals.3"],
+)
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+@pytest.mark.parametrize("paths", QUERIES, ids=lambda paths: ",".join(paths) or "root")
+def test_query_matches_a_walk_over_json(chunk_size, paths):
+    found = query_save(io.BytesIO(encode(TRICKY, wrap=76)), paths, chunk_size)
+    assert found == preorder(json.loads(json.dumps(TRICKY)), paths)
+
+
+@pytest.mark.parametrize("chunk_size", (1, 7, 1 << 20))
+def test_overlapping_queries(chunk_size):
+    paths = ["wanted", "wanted.text", "*.numbers.*", "wanted.numbers.3"]
+    found = query_save(io.BytesIO(encode(TRICKY)), paths, chunk_size)
+    assert canonical(found) == canonical(walk_all(TRICKY, paths))
+
+
+@pytest.mark.parametrize("chunk_size", (7, 4096, 1 << 20))
+def test_query_saves_match_json(raw_saves, saves, chunk_size):
+    paths = ["hepteractCrafts.chronos.BAL", "shopUpgrades.*", "hepteractCrafts.*.CAP", "platonicUpgrades.5", "wowAbyssals"]
+    for raw, data in zip(raw_saves[:6], saves):
+        assert query_save(io.BytesIO(raw), paths, chunk_size) == preorder(data, paths)
+        assert query_save(io.BytesIO(raw), ["*"], chunk_size) == [((key,), value) for key, value in data.items()]
+
+
+def test_exact_query_stops_reading():
+    text = json.dumps(TRICKY, ensure_ascii=False)
+    cut = text.index(', "escapes"')
+    # Everything after the wanted value is garbage, it never gets parsed.
+    broken = base64.b64encode((text[:cut] + ', "escapes": [}').encode())
+    assert query_save(io.BytesIO(broken), ["skipped.empty"], 4) == [(("skipped", "empty"), "")]
+    with pytest.raises(ValueError):
+        query_save(io.BytesIO(broken), ["skipped.empty", "int"], 4)
+
+
+def test_get_cli(tmp_path, monkeypatch, capsys):
+    path = tmp_path / "save.txt"
+    path.write_bytes(encode(TRICKY))
+
+    def run(*args):
+        monkeypatch.setattr(sys, "argv", ["syner_save.py", str(path), *args])
+        with pytest.raises(SystemExit) as exit:
+            syner_save.main()
+        out, err = capsys.readouterr()
+        return exit.value.code, out, err
+
+    assert run("--get", "wanted.text") == (0, json.dumps("Hepteract ✨ 日本") + "\n", "")
+    assert run("--get", "wanted.text", "--raw") == (0, "Hepteract ✨ 日本\n", "")
+    assert run("--get", "literals.*") == (0, "literals.0\ttrue\nliterals.1\tfalse\nliterals.2\tnull\n", "")
+    code, out, err = run("--get", "int", "--get", "missing")
+    assert (code, out) == (1, "int\t-42\n")
+    assert "missing: not found" in err
@@ -0,0 +1,82 @@
+import json
+import math
+import sys
+
+import pytest
+
+import save_diff
+import synergisa
+from save_diff import MS_PER_HOUR, diff_games
+
+
+@pytest.fixture
+def pair(saves, conf, sd):
+    """The same save twice, as separate games to change on one side."""
+    return synergisa.build_game(saves[0], conf, sd)[0], synergisa.build_game(saves[0], conf, sd)[0]
+
+
+def test_same_save_has_no_changes(pair):
+    old, new = pair
+    for game in pair:
+        game.update("overfluxPowder", math.nan)
+    diff = diff_games(old, new)
+    assert diff.fields == [] and diff.stats == []
+    assert diff.hours == 0
+    assert diff.rates == {name: None for name in save_diff.RATES}
+
+    everything = diff_games(old, new, changed_only=False)
+    assert {change.path for change in everything.fields} >= {"wowAbyssals", "shop.chronometer", "hepts.chronos.cap", "achievements.0"}
+    assert {change.path for change in everything.stats} >= {"multiplier", "hept_per_day", "shop_benefit_hept"}
+
+
+def test_fields_and_stats(pair):
+    old, new = pair
+    new.update("shop.chronometer", old.shop.chronometer + 10)
+    new.update("hepts.abyss.balance", old.hepts.abyss.balance + 1)
+    new.update("usedCorruptions", [*old.usedCorruptions, 3])
+    diff = diff_games(old, new)
+
+    assert {change.path: change.delta for change in diff.fields} == {
+        "shop.chronometer": 10,
+        "hepts.abyss.balance": 1,
+        f"usedCorruptions.{len(old.usedCorruptions)}": 3,
+    }
+    stats = {change.path: change.delta for change in diff.stats}
+    assert {"multiplier", "hept_per_day", "total_quarks"} <= set(stats)
+    for name, delta in stats.items():
+        assert delta == getattr(new, name) - getattr(old, name) != 0
+
+
+def test_rates_count_crafting_as_earned(pair):
+    old, new = pair
+    new.update("saveTime", old.saveTime + 2 * MS_PER_HOUR)
+    new.update("wowAbyssals", old.wowAbyssals + 10**6)
+    new.update("quarksLeft", old.quarksLeft + 500)
+    new.update("overfluxOrbs", old.overfluxOrbs + 4)
+    assert diff_games(old, new).rates == pytest.approx({"hepts": 5 * 10**5, "quarks": 250, "orbs": 2, "powder": 0})
+
+    # Crafting moves hepts into a craft, expanding moves the whole balance into the cap.
+    chronos = new.hepts.chronos
+    new.update("wowAbyssals", new.wowAbyssals - (chronos.cap - chronos.balance) * chronos.hepteract_conversion)
+    new.update("hepts.chronos.balance", 0)
+    new.update("hepts.chronos.cap", chronos.cap * 2)
+    quark = new.hepts.quark
+    new.update("quarksLeft", new.quarksLeft - 10 * quark.quarks_per_craft)
+    new.update("wowAbyssals", new.wowAbyssals - 10 * quark.hepteract_conversion)
+    new.update("hepts.quark.balance", quark.balance + 10)
+
+    assert new.wowAbyssals < old.wowAbyssals
+    assert diff_games(old, new).rates == pytest.approx({"hepts": 5 * 10**5, "quarks": 250, "orbs": 2, "powder": 0})
+
+
+def test_json_cli(tmp_path, raw_saves, monkeypatch, capsys):
+    paths = []
+    for i, raw in enumerate(raw_saves[:2]):
+        paths.append(tmp_path / f"save{i}.txt")
+        paths[-1].write_bytes(raw)
+    monkeypatch.setattr(sys, "argv", ["save_diff.py", *map(str, paths), "--json"])
+    save_diff.main()
+    diff = json.loads(capsys.readouterr().out)
+    assert set(diff) == {"hours", "fields", "stats", "rates"}
+    assert set(diff["rates"]) == set(save_diff.RATES)
+    assert {change["path"] for change in diff["fields"]} >= {"wowAbyssals"}
@@ -0,0 +1,68 @@
+import numpy
+import pytest
+
+from save_frame import SaveFrame, powder_goal_surface
+
+# SaveFrame property -> the scalar it mirrors.
+STATS = {
+    "chronos_tier": lambda game: game.hepts.chronos.tier,
+    "chronos_to_level": lambda game: game.hepts.chronos.to_level,
+    **{
+        name: (lambda name: lambda game: getattr(game, name))(name)
+        for name in (
+            "u44",
+            "chronos_percent",
+            "chronos_percent_next",
+            "chronos_increase",
+            "multiplier",
+            "hept_per_day",
+            "orb_to_powder",
+            "hepts_small_inc",
+            "p44_noname",
+            "powder_tomorrow",
+            "cube_from_powder",
+            "powder_goal",
+            "orbs_to_powder_goal",
+        )
+    },
+}
+
+
+@pytest.mark.parametrize("stat", STATS)
+def test_frame_matches_scalar_stats(games, stat):
+    frame = SaveFrame.from_games(games)
+    expected = numpy.array([STATS[stat](game) for game in games], dtype=numpy.float64)
+    numpy.testing.assert_allclose(getattr(frame, stat), expected, rtol=1e-12)
+
+
+def test_both_powder_goal_branches_are_covered(games):
+    # The solved branch is the one that differs most between the two engines.
+    solved = [game.hepts_small_inc / (game.overfluxPowder ** (game.p44_noname - 1) - 1) >= 10000 for game in games]
+    assert 0 < sum(solved) < len(games)
+
+    frame = SaveFrame.from_games(games)
+    for game, is_solved, value in zip(games, solved, frame.powder_goal):
+        if is_solved:
+            expected = game.powder_solution.root / (game.cube_from_powder + 1) * game.cube_from_powder
+            assert game.powder_goal == pytest.approx(expected, rel=1e-12)
+            assert value == pytest.approx(expected, rel=1e-12)
+
+
+def test_time_dependent_stats(games):
+    frame = SaveFrame.from_games(games)
+    now = max(game.saveTime for game in games) + 3_600_000
+    timer = [((now - game.saveTime) / 1000) * game.multiplier + game.ascensionCounter for game in games]
+    numpy.testing.assert_allclose(frame.current_ascension_timer(now), timer, rtol=1e-12)
+
+
+def test_powder_goal_surface_matches_what_if(games):
+    game = games[2]
+    powder = numpy.geomspace(1e3, 1e6, 4)
+    orbs = numpy.geomspace(1e5, 1e9, 3)
+    c15 = numpy.geomspace(1e18, 1e22, 2)
+    surface = powder_goal_surface(game, powder, orbs, c15)
+
+    for (i, j, k), value in numpy.ndenumerate(surface):
+        changes = {"overfluxPowder": powder[i], "overfluxOrbs": orbs[j], "challenge15Exponent": c15[k]}
+        with game.what_if(changes):
+            assert value == pytest.approx(game.powder_goal, rel=1e-12)
@@ -0,0 +1,119 @@
+import math
+
+import pytest
+
+import synergisa
+from save_layout import SynergismConfig
+from scheduler import MS_PER_DAY, PASSES, USES, Resource, Scheduler
+
+QUARKS_PER_DAY = 50_000
+ORBS_PER_DAY = 1e8
+SHOP = tuple(name for names in PASSES.values() for name in names)
+
+
+def rescheduled(scheduler, key):
+    """The event of ``key`` computed from scratch, as (label, cost, spend, time)."""
+    next_purchase = scheduler._cost(key)
+    if next_purchase is None:
+        return None
+    label, cost, spend = next_purchase
+    time = max(scheduler.resources[name].reached(target) for name, target in cost.items())
+    return label, cost, spend, None if math.isinf(time) else math.ceil(time)
+
+
+def test_resource():
+    resource = Resource(10, 0, 5)
+    assert resource.at(MS_PER_DAY) == 15
+    assert resource.reached(5) == 0
+    assert resource.reached(20) == 2 * MS_PER_DAY
+    assert Resource(10, 0, 0).reached(20) == math.inf
+    assert Resource(10, 0, 5).reached(math.nan) == math.inf
+
+
+def test_run_buys_in_order_and_never_goes_back(games, sd):
+    bought = 0
+    for game in games[:8]:
+        before = game.model_dump()
+        scheduler = Scheduler(game, sd, QUARKS_PER_DAY, ORBS_PER_DAY)
+        start = scheduler.now
+        shop = {name: getattr(scheduler.game.shop, name) for name in SHOP}
+        benefit, multiplier = scheduler.game.shop_benefit_hept, scheduler.game.multiplier
+
+        last = start
+        for _ in range(200):
+            event = scheduler.next()
+            if event is None or event.time > start + 60 * MS_PER_DAY:
+                break
+            assert event.time == min(e.time for e in scheduler.events.values() if e.time is not None)
+            scheduler.apply(event.key)
+            bought += 1
+            assert event.time >= last
+            last = event.time
+
+            for name in SHOP:
+                assert getattr(scheduler.game.shop, name) >= shop[name]
+                shop[name] = getattr(scheduler.game.shop, name)
+            assert scheduler.game.shop_benefit_hept >= benefit
+            assert scheduler.game.multiplier >= multiplier
+            benefit, multiplier = scheduler.game.shop_benefit_hept, scheduler.game.multiplier
+
+            # Rescheduling only what the purchase changed ends where rescheduling everything would.
+            for key in USES:
+                event = scheduler.events.get(key)
+                expected = rescheduled(scheduler, key)
+                if expected is None:
+                    assert event is None
+                    continue
+                assert (event.label, event.cost, event.spend) == expected[:3]
+                assert (event.time is None) == (expected[3] is None)
+                if event.time is not None:
+                    assert event.time == pytest.approx(expected[3], abs=1)
+
+        # The scheduler buys on its own copy.
+        assert game.model_dump() == before
+    assert bought > 50
+
+
+def test_run_matches_apply(games, sd):
+    for game in games[:4]:
+        stepped = Scheduler(game, sd, QUARKS_PER_DAY, ORBS_PER_DAY)
+        until = stepped.now + 30 * MS_PER_DAY
+        expected = []
+        while (event := stepped.next()) is not None and event.time <= until:
+            expected.append(stepped.apply(event.key))
+
+        events = Scheduler(game, sd, QUARKS_PER_DAY, ORBS_PER_DAY).run(until)
+        assert [event.model_dump() for event in events] == [event.model_dump() for event in expected]
+        assert all(a.time <= b.time for a, b in zip(events, events[1:]))
+
+
+def test_passes_never_lower_shop_levels(saves, conf, sd):
+    # Past the end of the Accel table in one column and of the WoW table in the other. The two are
+    # made free so the high levels do not add to total_quarks, which would take it past both tables.
+    data = conf.model_dump()
+    for name in ("chronometer", "seasonPassY"):
+        data["shopQuarkCost"][name].update(base=0, inc=0)
+    game, _ = synergisa.build_game(saves[2], SynergismConfig.model_validate(data), sd)
+    game.update("shop.chronometer", 150)
+    game.update("shop.seasonPassY", 150)
+
+    scheduler = Scheduler(game, sd, 10**7)
+    applied = 0
+    for key in PASSES:
+        while key in scheduler.events and scheduler.events[key].time is not None:
+            scheduler.apply(key)
+            applied += 1
+    assert applied > 2
+    assert scheduler.game.shop.chronometer == 150
+    assert scheduler.game.shop.seasonPassY == 150
+    assert scheduler.game.shop.chronometer2 == sd.accel[:, 1].max()
+    assert scheduler.game.shop.seasonPass3 == sd.wow[:, 0].max()
+
+
+def test_never_affordable(games, sd):
+    # Not enough quarks for the next pass tiers and no quark income.
+    scheduler = Scheduler(games[2], sd)
+    for key in PASSES:
+        assert scheduler.events[key].time is None
+        with pytest.raises(ValueError, match="never becomes affordable"):
+            scheduler.apply(key)
@@ -0,0 +1,54 @@
+import math
+
+import pytest
+
+from sensitivity import INPUTS, STATS, sensitivity, top_drivers
+
+
+def elasticities(drivers, stat):
+    return {driver.input: driver.elasticity for driver in drivers if driver.stat == stat}
+
+
+def test_smooth_stats_match_hand_computed_elasticities(games):
+    for game in games[:8]:
+        drivers = sensitivity(game, ["hept_per_day", "multiplier"])
+        hept = elasticities(drivers, "hept_per_day")
+        assert hept["hps"] == pytest.approx(1, rel=1e-9)
+        assert hept["shop_benefit_hept"] == pytest.approx(1 if game.shop_benefit_hept else 0, abs=1e-9)
+        uses = game.config.addUsesPerDay * 60 * game.shop.calculator3
+        assert hept["addUsesPerDay"] == pytest.approx(uses / (86400 + uses), rel=1e-6, abs=1e-12)
+
+        # multiplier is a product of (1 + level / 100) and (1 + 0.5 * level / 100) factors.
+        multiplier = elasticities(drivers, "multiplier")
+        level = game.shop.chronometer
+        assert multiplier["chronometer"] == pytest.approx(level / (100 + level), rel=1e-6, abs=1e-12)
+        level = game.shop.chronometer2
+        assert multiplier["chronometer2"] == pytest.approx(0.5 * level / (100 + 0.5 * level), rel=1e-6, abs=1e-12)
+
+
+def test_tier_boundaries_are_not_drivers(games):
+    # Caps are the base cap doubled per tier, every save sits on a boundary.
+    game = games[0]
+    chronos = game.hepts.chronos
+    assert chronos.cap == chronos.base_cap * 2 ** (chronos.tier - 1)
+
+    drivers = sensitivity(game, STATS)
+    assert [driver.input for driver in top_drivers(drivers, "chronos_percent_next")] == ["u44"]
+    for stat in ("chronos_percent_next", "chronos_increase"):
+        assert all(abs(driver.elasticity) < 10 for driver in top_drivers(drivers, stat))
+    with pytest.raises(ValueError, match="chronosCap"):
+        sensitivity(game, inputs=["chronosCap"])
+
+
+def test_forward_step_at_zero(games):
+    game = next(game for game in games if game.get_plat_upgrade(4, 4) == 0)
+    driver = next(d for d in sensitivity(game, ["chronos_percent"], ["u44"]))
+    assert driver.value == 0
+    assert driver.derivative > 0
+    assert driver.elasticity == 0
+
+
+def test_every_input_and_stat(games):
+    drivers = sensitivity(games[0], STATS)
+    assert len(drivers) == len(STATS) * len(INPUTS)
+    assert all(math.isfinite(driver.derivative) for driver in drivers)
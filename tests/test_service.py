@@ -0,0 +1,123 @@
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import service
+from service import SaveService
+
+
+@pytest.fixture
+def threaded(monkeypatch):
+    """A service evaluating in threads of this process, counting the evaluations."""
+    service._init_worker()
+    calls = []
+    evaluate = service.evaluate
+    release = threading.Event()
+
+    def counting(body):
+        calls.append(body)
+        release.wait(5)
+        return evaluate(body)
+
+    monkeypatch.setattr(service, "evaluate", counting)
+    state = SaveService(cache_entries=2)
+    state.pool.shutdown()
+    state.pool = ThreadPoolExecutor(4)
+    state.calls, state.release = calls, release
+    yield state
+    release.set()
+    state.close()
+
+
+async def request(port, method, path, body=b"", length=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    length = len(body) if length is None else length
+    writer.write(f"{method} {path} HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode() + body)
+    writer.write_eof()
+    # A client socket leaked into a pool worker never reaches EOF.
+    response = await asyncio.wait_for(reader.read(), 10)
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(payload)
+
+
+def served(state, *requests):
+    """Responses to ``requests`` (coroutine functions of the port), sent concurrently to a running server."""
+
+    async def run():
+        server = await state.listen("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return await asyncio.gather(*(send(port) for send in requests))
+
+    return asyncio.run(run())
+
+
+def test_process_pool_end_to_end(raw_saves):
+    state = SaveService(workers=1)
+    try:
+        (status, report), = served(state, lambda port: request(port, "POST", "/evaluate", raw_saves[0]))
+    finally:
+        state.close()
+    assert status == 200
+    assert set(report) >= {"stats", "buys", "messages"}
+
+
+def test_cache_hit_and_miss(threaded, raw_saves):
+    threaded.release.set()
+    first = asyncio.run(threaded.report(raw_saves[0]))
+    # Whitespace from the export does not make it a different save.
+    again = asyncio.run(threaded.report(raw_saves[0][:100] + b"\n" + raw_saves[0][100:] + b"\r\n"))
+    assert again == first
+    assert threaded.metrics.counts == {"requests": 0, "hits": 1, "misses": 1, "errors": 0}
+    assert len(threaded.calls) == 1
+
+    # Two entries at most, the least recently used goes.
+    for save in raw_saves[1:3]:
+        asyncio.run(threaded.report(save))
+    asyncio.run(threaded.report(raw_saves[0]))
+    assert len(threaded.calls) == 4
+
+
+def test_concurrent_identical_saves_share_one_evaluation(threaded, raw_saves):
+    async def run():
+        tasks = [asyncio.ensure_future(threaded.report(raw_saves[0])) for _ in range(5)]
+        while not threaded.calls:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+        threaded.release.set()
+        return await asyncio.gather(*tasks)
+
+    reports = asyncio.run(run())
+    assert len(threaded.calls) == 1
+    assert len(set(reports)) == 1
+    assert threaded.metrics.counts["misses"] == 5
+
+
+def test_body_over_the_limit(threaded, raw_saves, monkeypatch):
+    monkeypatch.setattr(service, "MAX_BODY", 100)
+    (status, payload), = served(threaded, lambda port: request(port, "POST", "/evaluate", b"x" * 10, length=101))
+    assert status == 413
+    assert "100" in payload["error"]
+    assert not threaded.calls
+
+
+def test_malformed_save_and_request(threaded):
+    threaded.release.set()
+    responses = served(
+        threaded,
+        lambda port: request(port, "POST", "/evaluate", b"bm90IGEgc2F2ZQ=="),
+        lambda port: request(port, "POST", "/evaluate", b"short", length=50),
+        lambda port: request(port, "GET", "/evaluate"),
+        lambda port: request(port, "GET", "/nowhere"),
+    )
+    assert [status for status, _ in responses] == [422, 400, 405, 404]
+    assert all("error" in payload for _, payload in responses)
+
+    (status, metrics), = served(threaded, lambda port: request(port, "GET", "/metrics"))
+    assert status == 200
+    assert metrics["errors"] == 1
+    assert metrics["requests"] == 4
@@ -0,0 +1,42 @@
+from pathlib import Path
+
+import numpy
+import pandas
+import pytest
+
+from save_layout import ShopBuys
+
+XLSX = Path(__file__).parent.parent / "data" / "Data.xlsx"
+
+
+@pytest.fixture(scope="module")
+def sheet() -> pandas.DataFrame:
+    return pandas.read_excel(XLSX, sheet_name="Shop", header=[0, 1], engine="openpyxl")
+
+
+def _idxmax_row(table: pandas.DataFrame, quarks: int) -> list:
+    """How ShopBuys picked a tier before the binary search, straight from the sheet."""
+    return [int(x) for x in table.iloc[table[table["Cost"] - quarks < 0].idxmax()["Cost"]].tolist()]
+
+
+def test_shop_buys_match_idxmax(sd, sheet):
+    costs = numpy.concatenate([sd.accel[::4, 2], sd.wow[::4, 2]])
+    # Every cost, one either side of it, and a spread in between.
+    quarks = numpy.unique(numpy.concatenate([costs - 1, costs, costs + 1, numpy.geomspace(2001, 2e8, 200).astype(numpy.int64)]))
+    quarks = quarks[quarks > max(sd.accel[0, 2], sd.wow[0, 2])]
+
+    for q in quarks.tolist():
+        buys = ShopBuys(sd, q)
+        assert [buys.accel1, buys.accel2, buys.accelCost] == _idxmax_row(sheet["Acceleration"], q)
+        assert [buys.wow3, buys.wowY, buys.wowCost] == _idxmax_row(sheet["WoW Passes"], q)
+
+
+def test_batch_matches_scalar(sd):
+    quarks = numpy.array([0, 1, 2000, 2001, 5000, 123456, 8_700_000, 10**9], dtype=numpy.int64)
+    batch = ShopBuys.batch(sd, quarks)
+    for i, q in enumerate(quarks.tolist()):
+        buys = ShopBuys(sd, q)
+        for name, column in batch.items():
+            assert column[i] == getattr(buys, name), (q, name)
+    # Nothing affordable is the all-zero row.
+    assert batch["accelCost"][0] == 0 and batch["wowCost"][1] == 0
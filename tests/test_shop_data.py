@@ -0,0 +1,34 @@
+import os
+import shutil
+from pathlib import Path
+
+import numpy
+
+from shop_data import ShopData, load_shop_data
+
+XLSX = Path(__file__).parent.parent / "data" / "Data.xlsx"
+
+
+def test_cache_matches_workbook(sd):
+    compiled = ShopData.from_xlsx(XLSX)
+    numpy.testing.assert_array_equal(sd.accel, compiled.accel)
+    numpy.testing.assert_array_equal(sd.wow, compiled.wow)
+
+
+def test_cache_is_restamped_or_rebuilt(tmp_path):
+    shutil.copy(XLSX, tmp_path / "Data.xlsx")
+    first = load_shop_data(tmp_path)
+    cache = tmp_path / "Data.shop.npz"
+    built = cache.stat().st_mtime_ns
+
+    # Same content with a new mtime only re-stamps the cache.
+    os.utime(tmp_path / "Data.xlsx", ns=(built + 10**9, built + 10**9))
+    again = load_shop_data(tmp_path)
+    numpy.testing.assert_array_equal(first.accel, again.accel)
+    with numpy.load(cache) as cached:
+        assert int(cached["mtime_ns"]) == built + 10**9
+
+    # An unreadable cache is rebuilt.
+    cache.write_bytes(b"not an npz")
+    rebuilt = load_shop_data(tmp_path)
+    numpy.testing.assert_array_equal(first.wow, rebuilt.wow)
@@ -0,0 +1,59 @@
+import pytest
+
+from shop_planner import OBJECTIVES, evaluate, plan_shop, table_caps
+
+BUDGETS = (0, 1_000, 30_000, 300_000, 3_000_000, 10**12)
+
+
+def planned_levels(game, plan):
+    levels = {}
+    for step in plan.steps:
+        levels.setdefault(step.item, step.from_level)
+        assert step.from_level == levels[step.item] < step.to_level
+        levels[step.item] = step.to_level
+    return levels
+
+
+@pytest.mark.parametrize("objective", OBJECTIVES)
+def test_plan_is_valued_by_the_model_within_budget(games, sd, objective):
+    caps = table_caps(sd)
+    for game in games[:8]:
+        before = game.model_dump()
+        for budget in BUDGETS:
+            plan = plan_shop(game, sd, objective, budget)
+            levels = planned_levels(game, plan)
+
+            assert plan.quarks_left == budget - sum(step.quarks for step in plan.steps) >= 0
+            for name, level in levels.items():
+                cost = getattr(game.config.shopQuarkCost, name)
+                assert level <= (cost.maxLevel if cost.maxLevel is not None else caps[name])
+                assert cost.quark_cost(level) - cost.quark_cost(getattr(game.shop, name)) == sum(
+                    step.quarks for step in plan.steps if step.item == name
+                )
+
+            assert plan.baseline == evaluate(game, objective, {})
+            assert plan.value == evaluate(game, objective, levels)
+            assert plan.value >= plan.baseline
+        # Planning only looks, the caller's game keeps its shop and stats.
+        assert game.model_dump() == before
+
+
+def test_multiplier_plan_is_close_to_brute_force(games, sd):
+    caps = table_caps(sd)
+    for game in games[:6]:
+        first, second = game.config.shopQuarkCost.chronometer, game.config.shopQuarkCost.chronometer2
+        start = game.shop.chronometer, game.shop.chronometer2
+        cap = tuple(cost.maxLevel if cost.maxLevel is not None else caps[name] for name, cost in (("chronometer", first), ("chronometer2", second)))
+        for budget in (1_000, 30_000, 300_000):
+            best = 0.0
+            for a in range(start[0], min(first.levels_for(start[0], budget), cap[0]) + 1):
+                left = budget - (first.quark_cost(a) - first.quark_cost(start[0]))
+                b = min(second.levels_for(start[1], left), cap[1])
+                best = max(best, evaluate(game, "multiplier", {"chronometer": a, "chronometer2": b}))
+            # Greedy by gain per quark, so a knapsack leftover may cost a little.
+            assert plan_shop(game, sd, "multiplier", budget).value == pytest.approx(best, rel=5e-3)
+
+
+def test_unknown_objective(games, sd):
+    with pytest.raises(ValueError):
+        plan_shop(games[0], sd, "powder_goal")
@@ -0,0 +1,87 @@
+import numpy
+import pytest
+
+from hept_planner import LINKED_CAPS, first_linked_doubling, linked_cost
+from simulate import RECORDED, _noise, simulate
+
+
+def scalar_run(game, days, step_hours):
+    """The deterministic run stepped with ``SynergismGame`` itself, buying linked tiers by updating the crafts."""
+    step_days = step_hours / 24
+    banked = float(game.hepts_after_ascension)
+    hepts, tiers, per_day = [], [], []
+    for step in range(int(round(days * 24 / step_hours)) + 1):
+        while True:
+            crafts = game.hepts
+            first = first_linked_doubling(crafts)
+            if first is None:
+                break
+            chronos_cap = crafts.chronos.cap_after(first if crafts.chronos.balance < crafts.chronos.cap else max(first, 1))
+            cost = linked_cost(crafts, chronos_cap)
+            if cost > banked:
+                break
+            banked -= cost
+            for name, ratio in LINKED_CAPS.items():
+                game.update(f"hepts.{name}.cap", chronos_cap * ratio)
+                game.update(f"hepts.{name}.balance", chronos_cap * ratio)
+        hepts.append(banked)
+        tiers.append(game.hepts.chronos.tier)
+        per_day.append(game.hept_per_day)
+        banked += game.hept_per_day * step_days
+    return numpy.array(hepts), numpy.array(tiers), numpy.array(per_day)
+
+
+def slow_start(game, now):
+    """Nothing banked and income slowed to about a linked tier every few days, so every ladder rung gets used."""
+    game.update("saveTime", now)
+    game.update("ascensionCounter", 0)
+    game.update("wowAbyssals", 0)
+    next_tier = linked_cost(game.hepts, game.hepts.chronos.cap_after(first_linked_doubling(game.hepts) + 1))
+    game.update("config.hps", game.config.hps * next_tier / (3 * game.hept_per_day))
+
+
+@pytest.mark.parametrize("slow", [False, True])
+def test_ladder_matches_scalar_updates(games, sd, frozen, slow):
+    for game in games[:6]:
+        if slow:
+            slow_start(game, frozen)
+        sim = simulate(game, sd, days=30, step_hours=6, record_hours=6)
+        hepts, tiers, per_day = scalar_run(game, days=30, step_hours=6)
+
+        assert list(sim.hours) == [6 * step for step in range(len(tiers))]
+        assert list(sim.percentiles["chronos_tier"][1]) == list(tiers)
+        assert tiers[-1] > tiers[0]
+        assert sim.percentiles["hepts"][1] == pytest.approx(hepts, rel=1e-9)
+        assert sim.percentiles["hept_per_day"][1] == pytest.approx(per_day, rel=1e-9)
+        assert sim.percentiles["multiplier"][1, -1] == pytest.approx(game.multiplier, rel=1e-9)
+
+
+def test_monte_carlo_runs(games, sd, frozen):
+    game = games[0]
+    kwargs = dict(days=20, step_hours=4, hps_cv=0.3, uses_cv=0.5, quarks_per_day=1000, seed=7)
+    sim = simulate(game, sd, runs=200, **kwargs)
+
+    assert all(len(sim.final[name]) == 200 for name in RECORDED)
+    for name in RECORDED:
+        low, mid, high = sim.percentiles[name]
+        assert (low <= mid).all() and (mid <= high).all()
+        assert sim.percentiles[name][:, -1] == pytest.approx(numpy.percentile(sim.final[name], (5, 50, 95)))
+    assert sim.percentiles["hepts"][2, -1] > sim.percentiles["hepts"][0, -1]
+    assert sim.final["total_quarks"] == pytest.approx(game.total_quarks + 20 * 1000)
+
+    again = simulate(game, sd, runs=200, **kwargs)
+    assert (again.final["hepts"] == sim.final["hepts"]).all()
+
+    # Without noise every run is the single deterministic one.
+    flat = simulate(game, sd, runs=5, days=20, step_hours=4, seed=7)
+    single = simulate(game, sd, days=20, step_hours=4)
+    assert flat.final["hepts"] == pytest.approx(numpy.full(5, single.final["hepts"][0]), rel=1e-12)
+
+
+def test_noise_is_mean_one_with_the_given_spread():
+    rng = numpy.random.default_rng(0)
+    assert (_noise(rng, 0, 10) == 1).all()
+    for cv in (0.1, 0.5):
+        factors = _noise(rng, cv, 200_000)
+        assert factors.mean() == pytest.approx(1, abs=0.01)
+        assert factors.std() / factors.mean() == pytest.approx(cv, rel=0.05)
@@ -0,0 +1,108 @@
+import zipfile
+
+import pytest
+
+from snipper import ArchiveSink, FilesSink, Sink, StdoutSink, chunks, part_name, snip
+
+
+class ListSink(Sink):
+    def __init__(self) -> None:
+        self.parts = []
+        self.closed = 0
+
+    def write(self, index, total, chunk):
+        self.parts.append((index, total, bytes(chunk)))
+
+    def close(self):
+        self.closed += 1
+
+
+@pytest.fixture
+def save(tmp_path, raw_saves):
+    path = tmp_path / "save.txt"
+    path.write_bytes(raw_saves[0])
+    return path
+
+
+@pytest.mark.parametrize("size", [1, 3, 4096, 49000])
+def test_chunks_round_trip(save, size):
+    data = save.read_bytes()
+    sink = ListSink()
+    count = snip(str(save), sink, size)
+    assert count == len(sink.parts) == -(-len(data) // size)
+    assert b"".join(part for _, _, part in sink.parts) == data
+    assert [index for index, _, _ in sink.parts] == list(range(count))
+    assert {total for _, total, _ in sink.parts} == {count}
+    assert all(len(part) == size for _, _, part in sink.parts[:-1])
+    assert sink.closed == 1
+
+
+def test_exact_multiple_has_no_empty_tail(tmp_path):
+    path = tmp_path / "save.txt"
+    path.write_bytes(b"abcdef")
+    sink = ListSink()
+    assert snip(str(path), sink, 3) == 2
+    assert [part for _, _, part in sink.parts] == [b"abc", b"def"]
+    assert [bytes(view) for view in chunks(b"abcdefg", 3)] == [b"abc", b"def", b"g"]
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b"")
+    sink = ListSink()
+    assert snip(str(path), sink) == 0
+    assert sink.parts == []
+    assert sink.closed == 1
+
+
+def test_failing_sink_is_closed_and_unmaps(save):
+    class Failing(ListSink):
+        def write(self, index, total, chunk):
+            if index == 2:
+                raise OSError("disk full")
+            super().write(index, total, chunk)
+
+    sink = Failing()
+    with pytest.raises(OSError, match="disk full"):
+        snip(str(save), sink, 100)
+    # Exported views are released, or closing the mmap would raise BufferError instead.
+    assert len(sink.parts) == 2
+    assert sink.closed == 1
+
+
+def test_sink_without_write_fails_up_front():
+    class Forgetful(Sink):
+        pass
+
+    with pytest.raises(TypeError):
+        Forgetful()
+
+
+def test_files_and_archive_sinks(tmp_path, save):
+    data = save.read_bytes()
+    size = len(data) // 11 + 1
+    total = snip(str(save), FilesSink(tmp_path / "parts", "save"), size)
+    files = sorted((tmp_path / "parts").iterdir())
+    assert [path.name for path in files] == [part_name("save", i, total) for i in range(total)]
+    assert b"".join(path.read_bytes() for path in files) == data
+
+    for compress in (False, True):
+        archive = tmp_path / f"save{compress}.zip"
+        assert snip(str(save), ArchiveSink(archive, "save", compress), size) == total
+        with zipfile.ZipFile(archive) as zipped:
+            assert zipped.namelist() == [part_name("save", i, total) for i in range(total)]
+            assert b"".join(zipped.read(name) for name in zipped.namelist()) == data
+
+
+def test_stdout_sink(tmp_path, capfdbinary):
+    path = tmp_path / "save.txt"
+    path.write_bytes(b"abcdefg")
+    snip(str(path), StdoutSink(), 3)
+    assert capfdbinary.readouterr().out == b"abc\ndef\ng\n"
+
+
+def test_part_names_sort():
+    assert part_name("save", 0, 5) == "save.part01.txt"
+    assert part_name("save", 99, 150) == "save.part100.txt"
+    names = [part_name("save", i, 150) for i in range(150)]
+    assert sorted(names) == names
@@ -0,0 +1,99 @@
+import numpy
+import pytest
+
+import synergisa
+from save_layout import SynergismConfig
+from sweep import FIELDS, RESULTS, parse_values, sweep
+
+AXES = {
+    "hps": [1e8, 5e8, 3e9],
+    "addUsesPerDay": [0, 25],
+    "quarkKeep": [0, 2.5e6],
+    "shopQuarkCost.chronometer.base": [0, 500, 40000],
+    "shopQuarkCost.seasonPass3.inc": [100, 2500],
+}
+# The scalar stat each result column is checked against.
+STATS = {
+    "total_quarks": lambda game, buys: game.total_quarks,
+    "spare_quarks": lambda game, buys: game.total_quarks - game.config.quark_keep,
+    **{
+        name: (lambda name: lambda game, buys: getattr(buys, name))(name)
+        for name in ("accel1", "accel2", "accelCost", "wow3", "wowY", "wowCost")
+    },
+    **{
+        name: (lambda name: lambda game, buys: getattr(game, name))(name)
+        for name in ("shop_benefit_accel", "shop_benefit_hept", "multiplier", "hept_per_day", "powder_goal")
+    },
+}
+
+
+def with_config(conf: SynergismConfig, values) -> SynergismConfig:
+    data = conf.model_dump()
+    for path, value in values.items():
+        *parents, name = path.split(".")
+        node = data
+        for parent in parents:
+            node = node[parent]
+        node[name] = value
+    return SynergismConfig.model_validate(data)
+
+
+def test_results_cover_every_stat():
+    assert set(STATS) == set(RESULTS)
+
+
+def test_grid_matches_rebuilt_games(saves, games, conf, sd):
+    rng = numpy.random.default_rng(0)
+    for data, game in zip(saves[:6], games):
+        columns = sweep(game, sd, AXES)
+        rows = len(columns["total_quarks"])
+        assert rows == numpy.prod([len(values) for values in AXES.values()])
+
+        for row in rng.choice(rows, 8, replace=False):
+            values = {path: columns[path][row].item() for path in AXES}
+            expected, buys = synergisa.build_game(data, with_config(conf, values), sd)
+            for name, stat in STATS.items():
+                numpy.testing.assert_allclose(columns[name][row], stat(expected, buys), rtol=1e-12, err_msg=f"{name} at {values}")
+
+
+def test_last_axis_varies_fastest(games, sd):
+    columns = sweep(games[0], sd, {"hps": [1e8, 2e8], "addUsesPerDay": [0, 10, 20]})
+    assert columns["hps"].tolist() == [1e8] * 3 + [2e8] * 3
+    assert columns["addUsesPerDay"].tolist() == [0, 10, 20] * 2
+
+
+def test_no_axes_is_the_save_itself(games, sd):
+    game = games[0]
+    columns = sweep(game, sd, {})
+    assert columns["total_quarks"].tolist() == [game.total_quarks]
+    assert columns["hept_per_day"].tolist() == pytest.approx([game.hept_per_day], rel=1e-12)
+
+
+def test_unknown_field(games, sd):
+    with pytest.raises(ValueError, match="Unknown config fields"):
+        sweep(games[0], sd, {"shop.chronometer": [1, 2]})
+    # No result reads it, every value would give the same row.
+    with pytest.raises(ValueError, match="targetGainPercent"):
+        sweep(games[0], sd, {"targetGainPercent": [100, 200]})
+
+
+def test_every_field_moves_a_result(games, sd):
+    game = games[0]
+    for path in FIELDS:
+        current = game.config
+        for part in path.split("."):
+            current = getattr(current, part)
+        columns = sweep(game, sd, {path: [current, current * 3 + 1000]})
+        assert any(len(set(columns[name].tolist())) > 1 for name in RESULTS), path
+
+
+def test_parse_values():
+    assert parse_values("hps", "1,2.5,3").tolist() == [1, 2.5, 3]
+    assert parse_values("hps", "1:3:5").tolist() == [1, 1.5, 2, 2.5, 3]
+    numpy.testing.assert_allclose(parse_values("hps", "1e8:1e10:3:log"), [1e8, 1e9, 1e10])
+    # Integer fields are rounded and deduplicated.
+    assert parse_values("addUsesPerDay", "0:2:5").tolist() == [0, 1, 2]
+    assert parse_values("shopQuarkCost.chronometer.base", "1.4,0.6").tolist() == [1]
+    for spec in ("1:2", "1:2:3:lin", "1:2:3:log:4"):
+        with pytest.raises(ValueError, match="Bad values"):
+            parse_values("hps", spec)
@@ -0,0 +1,38 @@
+import io
+import json
+import os
+import subprocess
+import sys
+
+import synergisa
+
+
+def test_report_and_dashboard_say_the_same(games, sd):
+    from rich.console import Console
+
+    for game in games[:6]:
+        buys = synergisa.ShopBuys(sd, game.total_quarks)
+        messages = synergisa.game_report(game, buys)["messages"]
+        assert messages == synergisa.game_messages(game)
+        assert messages[-1] == ("Level Chronos!" if game.orbs_to_powder_goal <= 0 else "Dunno yet!")
+
+        console = Console(width=200, record=True, file=io.StringIO())
+        console.print(synergisa.dashboard(game, buys))
+        text = console.export_text()
+        assert all(message in text for message in messages)
+
+
+def test_json_run_uses_the_given_cache(tmp_path, raw_saves):
+    save = tmp_path / "save.txt"
+    save.write_bytes(raw_saves[0])
+    env = {**os.environ, "SYNERGISA_CACHE": str(tmp_path / "cache")}
+    result = subprocess.run(
+        [sys.executable, str(synergisa.DATA_PATH.parent / "src" / "synergisa.py"), str(save), "--json"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    report = json.loads(result.stdout)
+    assert report["messages"][-1] in ("Level Chronos!", "Dunno yet!")
+    assert len(list((tmp_path / "cache").glob("*.bin"))) == 1
@@ -0,0 +1,20 @@
+import pytest
+
+import synergisa
+from save_layout import SynergismGame
+
+
+def test_trusted_matches_validated(saves, conf, sd):
+    for data in saves:
+        validated, _ = synergisa.build_game(data, conf, sd)
+        trusted, _ = synergisa.build_game(data, conf, sd, trusted=True)
+        assert trusted.model_dump() == validated.model_dump()
+        for name in ("total_quarks", "multiplier", "hept_per_day", "powder_goal", "orbs_to_powder_goal"):
+            assert getattr(trusted, name) == getattr(validated, name)
+
+
+def test_trusted_still_needs_every_key(saves):
+    data = dict(saves[0])
+    del data["overfluxOrbs"]
+    with pytest.raises(KeyError):
+        SynergismGame.from_trusted(data)
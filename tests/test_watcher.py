@@ -0,0 +1,86 @@
+import os
+import threading
+import time
+
+import pytest
+
+import watcher
+from watcher import FileWatcher
+
+DEBOUNCE = 0.1
+
+
+@pytest.fixture(params=["inotify", "poll"])
+def watched(request, tmp_path, monkeypatch):
+    """A save file and a watcher on it, through inotify or by polling."""
+    if request.param == "poll":
+
+        def unavailable(path):
+            raise OSError("no inotify here")
+
+        monkeypatch.setattr(watcher, "_Inotify", unavailable)
+
+    path = tmp_path / "save.txt"
+    path.write_bytes(b"first")
+    with FileWatcher(path, debounce=DEBOUNCE, poll_interval=0.01) as file_watcher:
+        assert (file_watcher._inotify is not None) == (request.param == "inotify")
+        yield path, file_watcher
+
+
+def later(seconds, action):
+    timer = threading.Timer(seconds, action)
+    timer.start()
+    return timer
+
+
+def test_quiet_file_times_out(watched):
+    path, file_watcher = watched
+    # A neighbour changing is not the save changing.
+    later(0.05, lambda: (path.parent / "other.txt").write_bytes(b"other"))
+    started = time.monotonic()
+    assert not file_watcher.wait(0.3)
+    assert time.monotonic() - started >= 0.29
+
+
+@pytest.mark.parametrize("how", ["write", "replace"])
+def test_change_is_seen(watched, how):
+    path, file_watcher = watched
+
+    def change():
+        if how == "write":
+            path.write_bytes(b"second save")
+        else:
+            # How editors and some exporters save: a new file renamed over the old one.
+            (path.parent / "save.tmp").write_bytes(b"second save")
+            os.replace(path.parent / "save.tmp", path)
+
+    later(0.05, change)
+    started = time.monotonic()
+    assert file_watcher.wait(5)
+    assert time.monotonic() - started < 2
+    assert path.read_bytes() == b"second save"
+
+
+def test_burst_is_reported_once_it_settles(watched):
+    path, file_watcher = watched
+
+    def burst():
+        for i in range(10):
+            path.write_bytes(b"part" * (i + 1))
+            time.sleep(DEBOUNCE / 4)
+
+    writer = threading.Thread(target=burst)
+    started = time.monotonic()
+    writer.start()
+    assert file_watcher.wait(5)
+    # Not before the last write plus a quiet debounce.
+    assert time.monotonic() - started >= 10 * DEBOUNCE / 4
+    writer.join()
+    assert path.read_bytes() == b"part" * 10
+    assert not file_watcher.wait(0.2)
+
+
+def test_deleted_file_is_not_a_change(watched):
+    path, file_watcher = watched
+    later(0.05, path.unlink)
+    assert not file_watcher.wait(0.5)